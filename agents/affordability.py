@@ -1,42 +1,63 @@
-import math
-from orchestrator import ApplicationData, AgentResponse
+from annuity import growth_factor, growth_factors, monthly_payment, monthly_payments
+from models import ApplicationData, AgentResponse, LazyAgentResponse
+
+AFFORDABILITY_FLAGS = ("Comfortable", "Stretched", "Not affordable")
 
 class AffordabilityAgent:
+    stage_name = "affordability"
+    requires = ()
+    entry_point = "evaluate"
+    reads = (
+        "monthly_income",
+        "existing_emi",
+        "employment_type",
+        "residence_type",
+        "loan_amount",
+        "loan_tenure_months",
+    )
+
+    def __init__(
+        self,
+        assessment_rate: float = 0.14,
+        salaried_max_foir: float = 0.5,
+        self_employed_max_foir: float = 0.45,
+        rented_foir_reduction: float = 0.03,
+        min_foir: float = 0.35,
+        max_foir_cap: float = 0.55
+    ):
+        self.assessment_rate = assessment_rate
+        self.salaried_max_foir = salaried_max_foir
+        self.self_employed_max_foir = self_employed_max_foir
+        self.rented_foir_reduction = rented_foir_reduction
+        self.min_foir = min_foir
+        self.max_foir_cap = max_foir_cap
+
     def evaluate(self, app: ApplicationData) -> AgentResponse:
         if app.monthly_income <= 0:
             foi_ratio = 1.0
         else:
             foi_ratio = app.existing_emi / app.monthly_income
 
-        max_foir = 0.5
+        max_foir = self.salaried_max_foir
         if app.employment_type == "Self-employed":
-            max_foir = 0.45
+            max_foir = self.self_employed_max_foir
         if app.residence_type == "Rented":
-            max_foir -= 0.03
-        max_foir = max(0.35, min(0.55, max_foir))
+            max_foir -= self.rented_foir_reduction
+        max_foir = max(self.min_foir, min(self.max_foir_cap, max_foir))
 
         max_allowed_emi = max(0.0, (max_foir * app.monthly_income) - app.existing_emi)
 
-        annual_rate = 0.14
+        annual_rate = self.assessment_rate
         r = annual_rate / 12.0
         n = max(app.loan_tenure_months, 1)
         if r > 0:
-            emi_factor = (r * math.pow(1 + r, n)) / (math.pow(1 + r, n) - 1)
+            growth = growth_factor(annual_rate, n)
+            emi_factor = (r * growth) / (growth - 1)
             max_eligible_loan = max_allowed_emi / emi_factor if emi_factor > 0 else 0.0
         else:
             max_eligible_loan = max_allowed_emi * n
 
-        if app.loan_tenure_months > 0:
-            if r > 0:
-                denom = (math.pow(1 + r, app.loan_tenure_months) - 1)
-                if denom > 0:
-                    req_emi = app.loan_amount * r * math.pow(1 + r, app.loan_tenure_months) / denom
-                else:
-                    req_emi = 0.0
-            else:
-                req_emi = app.loan_amount / app.loan_tenure_months
-        else:
-            req_emi = 0.0
+        req_emi = monthly_payment(app.loan_amount, annual_rate, app.loan_tenure_months)
 
         if max_allowed_emi <= 0:
             affordability_flag = "Not affordable"
@@ -47,11 +68,9 @@ class AffordabilityAgent:
         else:
             affordability_flag = "Not affordable"
 
-        msg = f"Affordability classified as {affordability_flag}. Maximum estimated EMI comfort is around ₹{max_allowed_emi:,.0f}."
-
-        return AgentResponse(
+        return LazyAgentResponse(
             status="ok",
-            message=msg,
+            render=self.describe,
             data={
                 "max_foir": float(max_foir),
                 "current_foir": float(foi_ratio),
@@ -61,3 +80,56 @@ class AffordabilityAgent:
                 "affordability_flag": affordability_flag,
             },
         )
+
+    def describe(self, data: dict) -> str:
+        return (
+            f"Affordability classified as {data['affordability_flag']}. "
+            f"Maximum estimated EMI comfort is around ₹{data['max_allowed_emi']:,.0f}."
+        )
+
+    def evaluate_batch(self, cols) -> dict:
+        import numpy as np
+
+        income = np.asarray(cols["monthly_income"], dtype=np.float64)
+        existing_emi = np.asarray(cols["existing_emi"], dtype=np.float64)
+        loan_amount = np.asarray(cols["loan_amount"], dtype=np.float64)
+        tenure = np.asarray(cols["loan_tenure_months"], dtype=np.int64)
+
+        foi_ratio = np.divide(existing_emi, income, out=np.ones_like(income), where=income > 0)
+
+        max_foir = np.where(
+            cols["employment_type"] == "Self-employed", self.self_employed_max_foir, self.salaried_max_foir
+        )
+        max_foir = np.where(cols["residence_type"] == "Rented", max_foir - self.rented_foir_reduction, max_foir)
+        max_foir = np.clip(max_foir, self.min_foir, self.max_foir_cap)
+
+        max_allowed_emi = np.maximum(0.0, (max_foir * income) - existing_emi)
+
+        annual_rate = self.assessment_rate
+        r = annual_rate / 12.0
+        n = np.maximum(tenure, 1)
+        if r > 0:
+            growth = growth_factors(annual_rate, n)
+            emi_factor = (r * growth) / (growth - 1)
+            max_eligible_loan = np.divide(
+                max_allowed_emi, emi_factor, out=np.zeros_like(max_allowed_emi), where=emi_factor > 0
+            )
+        else:
+            max_eligible_loan = max_allowed_emi * n
+
+        req_emi = monthly_payments(loan_amount, annual_rate, tenure)
+
+        affordability_flag = np.select(
+            [max_allowed_emi <= 0, req_emi <= max_allowed_emi, req_emi <= max_allowed_emi * 1.2],
+            ["Not affordable", "Comfortable", "Stretched"],
+            "Not affordable",
+        )
+
+        return {
+            "max_foir": max_foir,
+            "current_foir": foi_ratio,
+            "max_allowed_emi": max_allowed_emi,
+            "max_eligible_loan": max_eligible_loan,
+            "requested_emi": req_emi,
+            "affordability_flag": affordability_flag,
+        }
@@ -1,6 +1,71 @@
-from orchestrator import ApplicationData, AgentResponse
+from dataclasses import fields
+from typing import Iterable, Optional
+
+from models import ApplicationData, AgentResponse
+from agents.compliance_rules import COMPLIANCE_RULES, CompiledRules, ComplianceRule
+from agents.rule_tables import CompiledAgent
+
+DERIVED_FACTS = frozenset((
+    "credit_score",
+    "risk_level",
+    "documents_missing",
+    "document_quality_score",
+    "affordability_flag",
+))
+APPLICATION_FIELDS = frozenset(f.name for f in fields(ApplicationData)) - DERIVED_FACTS
+DEFAULT_RULES = CompiledRules(COMPLIANCE_RULES)
+COMPLIANCE_REASONS = DEFAULT_RULES.reasons
+
+def decode_compliance_reasons(mask) -> list:
+    return DEFAULT_RULES.decode(mask)
+
+class ComplianceAgent(CompiledAgent):
+    stage_name = "compliance"
+    requires = ("credit", "risk", "document", "affordability")
+    entry_point = "check"
+    rule_fields = ("rules",)
+
+    def __init__(self, rules: Iterable[ComplianceRule] = COMPLIANCE_RULES):
+        self.rules = tuple(rules)
+        self.compile()
+
+    def build_tables(self) -> CompiledRules:
+        return DEFAULT_RULES if self.rules == COMPLIANCE_RULES else CompiledRules(self.rules)
+
+    def compile(self) -> None:
+        super().compile()
+        self.reads = tuple(fact.name for fact in self._tables.facts if fact.name in APPLICATION_FIELDS)
+
+    def _respond(self, fired: int, **extra) -> AgentResponse:
+        final_decision, _, message = self._tables.outcome(fired)
+        return AgentResponse(
+            status="ok",
+            message=message,
+            data={
+                "final_decision": final_decision,
+                "compliance_reasons_mask": fired,
+                **extra,
+            },
+        )
+
+    def describe(self, data: dict) -> str:
+        return self._tables.outcome(data["compliance_reasons_mask"])[2]
+
+    def decode(self, mask) -> list:
+        return self._tables.decode(mask)
+
+    def encode(self, reasons: Iterable[str]) -> int:
+        return self._tables.encode(reasons)
+
+    def expand(self, data: dict) -> dict:
+        expanded = {
+            "final_decision": data["final_decision"],
+            "compliance_reasons": list(self._tables.outcome(data["compliance_reasons_mask"])[1]),
+        }
+        if "knockout" in data:
+            expanded["knockout"] = data["knockout"]
+        return expanded
 
-class ComplianceAgent:
     def check(
         self,
         app: ApplicationData,
@@ -9,55 +74,46 @@ class ComplianceAgent:
         doc_data: dict,
         affordability_data: dict
     ) -> AgentResponse:
-        reasons = []
-        final_decision = "approve"
-
-        if app.age < 21:
-            final_decision = "reject"
-            reasons.append("Applicant age is below minimum threshold of 21.")
-        if app.age > 65:
-            final_decision = "reject"
-            reasons.append("Applicant age is above maximum threshold of 65.")
-
-        score = credit_data.get("credit_score", 0)
-        if score < 650 and final_decision != "reject":
-            final_decision = "review"
-            reasons.append("Credit score is below preferred threshold of 650.")
-
-        risk_level = risk_data.get("risk_level", "Medium")
-        if risk_level == "High":
-            if final_decision == "approve":
-                final_decision = "review"
-            reasons.append("Overall risk level is high based on internal risk assessment.")
-
-        missing_docs = doc_data.get("missing_documents", [])
-        doc_quality = doc_data.get("document_quality_score", 0.0)
-        if missing_docs:
-            if final_decision == "approve":
-                final_decision = "review"
-            reasons.append("Mandatory documents are missing.")
-        elif doc_quality < 0.7:
-            reasons.append("Document quality appears suboptimal and may require manual verification.")
-
-        affordability_flag = affordability_data.get("affordability_flag", "Stretched")
-        if affordability_flag == "Not affordable":
-            if final_decision != "reject":
-                final_decision = "reject"
-            reasons.append("Requested EMI is not affordable within FOIR limits.")
-        elif affordability_flag == "Stretched" and final_decision == "approve":
-            final_decision = "approve_with_caution"
-            reasons.append("EMI is near the upper comfort limit; case should be monitored post-disbursal.")
-
-        if not reasons and final_decision.startswith("approve"):
-            reasons.append("Application meets credit, risk, document, and affordability criteria.")
-
-        msg = f"Final decision: {final_decision.upper()}. " + " ".join(reasons)
+        facts = {
+            "credit_score": credit_data.get("credit_score", 0),
+            "risk_level": risk_data.get("risk_level", "Medium"),
+            "documents_missing": bool(doc_data.get("missing_documents_mask", 0)),
+            "document_quality_score": doc_data.get("document_quality_score", 0.0),
+            "affordability_flag": affordability_data.get("affordability_flag", "Stretched"),
+        }
+        for name in self.reads:
+            facts[name] = getattr(app, name)
+        return self._respond(self._tables.evaluate(facts))
 
-        return AgentResponse(
-            status="ok",
-            message=msg,
-            data={
-                "final_decision": final_decision,
-                "compliance_reasons": reasons,
-            },
-        )
+    def knockout(self, app: ApplicationData, affordability_data: Optional[dict] = None) -> Optional[AgentResponse]:
+        facts = {name: getattr(app, name) for name in self.reads}
+        if affordability_data is not None and "affordability_flag" in affordability_data:
+            facts["affordability_flag"] = affordability_data["affordability_flag"]
+        fired = self._tables.knockout(facts)
+        if not fired:
+            return None
+        return self._respond(fired, knockout=True)
+
+    def check_batch(
+        self,
+        cols,
+        credit_data: dict,
+        risk_data: dict,
+        doc_data: dict,
+        affordability_data: dict
+    ) -> dict:
+        facts = {
+            "credit_score": credit_data["credit_score"],
+            "risk_level": risk_data["risk_level"],
+            "documents_missing": doc_data["missing_documents_mask"] > 0,
+            "document_quality_score": doc_data["document_quality_score"],
+            "affordability_flag": affordability_data["affordability_flag"],
+        }
+        for name in self.reads:
+            facts[name] = cols[name]
+
+        fired, final_decision = self._tables.evaluate_batch(facts, len(facts["credit_score"]))
+        return {
+            "final_decision": final_decision,
+            "compliance_reasons_mask": fired[:, 0] if fired.shape[1] == 1 else fired,
+        }
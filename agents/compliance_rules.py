@@ -0,0 +1,310 @@
+import operator
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+SEVERITIES = ("approve", "approve_with_caution", "review", "reject")
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+WORD_BITS = 64
+
+Clause = Tuple[str, str, Any]
+
+@dataclass(frozen=True)
+class ComplianceRule:
+    name: str
+    when: Tuple[Clause, ...]
+    severity: str
+    reason: str
+    precedence: int
+    unless: Tuple[str, ...] = ()
+    fallback: bool = False
+
+COMPLIANCE_RULES = (
+    ComplianceRule(
+        "age_below_minimum",
+        (("age", "<", 21),),
+        "reject",
+        "Applicant age is below minimum threshold of 21.",
+        precedence=10,
+    ),
+    ComplianceRule(
+        "age_above_maximum",
+        (("age", ">", 65),),
+        "reject",
+        "Applicant age is above maximum threshold of 65.",
+        precedence=20,
+    ),
+    ComplianceRule(
+        "credit_score_below_threshold",
+        (("credit_score", "<", 650),),
+        "review",
+        "Credit score is below preferred threshold of 650.",
+        precedence=30,
+        unless=("age_below_minimum", "age_above_maximum"),
+    ),
+    ComplianceRule(
+        "high_risk",
+        (("risk_level", "==", "High"),),
+        "review",
+        "Overall risk level is high based on internal risk assessment.",
+        precedence=40,
+    ),
+    ComplianceRule(
+        "documents_missing",
+        (("documents_missing", "==", True),),
+        "review",
+        "Mandatory documents are missing.",
+        precedence=50,
+    ),
+    ComplianceRule(
+        "document_quality_low",
+        (("documents_missing", "==", False), ("document_quality_score", "<", 0.7)),
+        "approve",
+        "Document quality appears suboptimal and may require manual verification.",
+        precedence=60,
+    ),
+    ComplianceRule(
+        "emi_not_affordable",
+        (("affordability_flag", "==", "Not affordable"),),
+        "reject",
+        "Requested EMI is not affordable within FOIR limits.",
+        precedence=70,
+    ),
+    ComplianceRule(
+        "emi_stretched",
+        (("affordability_flag", "==", "Stretched"),),
+        "approve_with_caution",
+        "EMI is near the upper comfort limit; case should be monitored post-disbursal.",
+        precedence=80,
+        unless=(
+            "age_below_minimum",
+            "age_above_maximum",
+            "credit_score_below_threshold",
+            "high_risk",
+            "documents_missing",
+        ),
+    ),
+    ComplianceRule(
+        "meets_all_criteria",
+        (),
+        "approve",
+        "Application meets credit, risk, document, and affordability criteria.",
+        precedence=90,
+        fallback=True,
+    ),
+)
+
+class _Fact:
+    def __init__(self, name: str, clauses: List[Tuple[int, str, Any]], all_bits: int):
+        self.name = name
+        values = [value for _, _, value in clauses]
+        self.numeric = all(isinstance(value, (int, float)) for value in values)
+
+        if self.numeric:
+            self.thresholds = sorted(set(float(value) for value in values))
+            representatives = []
+            previous = self.thresholds[0] - 1.0
+            for threshold in self.thresholds:
+                representatives.append((previous + threshold) / 2.0)
+                representatives.append(threshold)
+                previous = threshold
+            representatives.append(self.thresholds[-1] + 1.0)
+        else:
+            self.categories = list(dict.fromkeys(values))
+            self.index = {value: code for code, value in enumerate(self.categories)}
+            representatives = self.categories + [_Other()]
+            self.bucket = self._category
+
+        self.table: List[int] = []
+        for representative in representatives:
+            bits = all_bits
+            for bit, op, value in clauses:
+                if not OPERATORS[op](representative, value):
+                    bits &= ~(1 << bit)
+            self.table.append(bits)
+
+    def bucket(self, value: Any) -> int:
+        return bisect_left(self.thresholds, value) + bisect_right(self.thresholds, value)
+
+    def _category(self, value: Any) -> int:
+        return self.index.get(value, len(self.categories))
+
+    def buckets(self, values):
+        import numpy as np
+
+        if self.numeric:
+            values = np.asarray(values, dtype=np.float64)
+            return np.searchsorted(self.thresholds, values, "left") + np.searchsorted(self.thresholds, values, "right")
+        return np.select(
+            [values == category for category in self.categories],
+            list(range(len(self.categories))),
+            len(self.categories),
+        )
+
+class _Other:
+    def __eq__(self, other):
+        return False
+
+    def __ne__(self, other):
+        return True
+
+    __hash__ = None
+
+class CompiledRules:
+    def __init__(self, rules: Iterable[ComplianceRule] = COMPLIANCE_RULES):
+        self.rules: Tuple[ComplianceRule, ...] = tuple(sorted(rules, key=lambda rule: rule.precedence))
+        self.reasons = tuple(rule.reason for rule in self.rules)
+        self.reason_masks: Dict[str, int] = {}
+        for bit, reason in enumerate(self.reasons):
+            self.reason_masks[reason] = self.reason_masks.get(reason, 0) | 1 << bit
+        self.words = max(1, -(-len(self.rules) // WORD_BITS))
+        position = {rule.name: bit for bit, rule in enumerate(self.rules)}
+        self.all_bits = (1 << len(self.rules)) - 1
+
+        clauses: Dict[str, List[Tuple[int, str, Any]]] = {}
+        self.fact_rules: Dict[str, int] = {}
+        self.suppressions: List[Tuple[int, int]] = []
+        self.fallback_bits = 0
+        self.severity_bits = [0] * len(SEVERITIES)
+
+        for bit, rule in enumerate(self.rules):
+            if rule.severity not in SEVERITIES:
+                raise ValueError(f"Rule '{rule.name}' has unknown severity '{rule.severity}'.")
+            self.severity_bits[SEVERITIES.index(rule.severity)] |= 1 << bit
+            for fact, op, value in rule.when:
+                if op not in OPERATORS:
+                    raise ValueError(f"Rule '{rule.name}' uses unknown operator '{op}'.")
+                clauses.setdefault(fact, []).append((bit, op, value))
+                self.fact_rules[fact] = self.fact_rules.get(fact, 0) | 1 << bit
+            if rule.fallback:
+                self.fallback_bits |= 1 << bit
+            if rule.unless:
+                unless = 0
+                for name in rule.unless:
+                    if position.get(name, len(self.rules)) >= bit:
+                        raise ValueError(f"Rule '{rule.name}' can only be suppressed by earlier rules, not '{name}'.")
+                    unless |= 1 << position[name]
+                self.suppressions.append((bit, unless))
+
+        self.facts = [_Fact(name, fact_clauses, self.all_bits) for name, fact_clauses in clauses.items()]
+        self._lookups = [(fact.name, fact.table, fact.bucket) for fact in self.facts]
+        self._outcomes: Dict[int, Tuple[str, Tuple[str, ...], str]] = {}
+        self._words = None
+        self.knockout_bits = 0
+        for bit, rule in enumerate(self.rules):
+            if rule.severity == "reject" and not rule.unless and not rule.fallback:
+                self.knockout_bits |= 1 << bit
+
+    def _finish(self, fired: int) -> int:
+        for bit, unless in self.suppressions:
+            if fired & unless:
+                fired &= ~(1 << bit)
+        if fired & ~self.fallback_bits:
+            fired &= ~self.fallback_bits
+        return fired
+
+    def decision(self, fired: int) -> str:
+        for code in range(len(SEVERITIES) - 1, 0, -1):
+            if fired & self.severity_bits[code]:
+                return SEVERITIES[code]
+        return SEVERITIES[0]
+
+    def decode(self, fired) -> List[str]:
+        try:
+            fired = int(fired)
+        except TypeError:
+            fired = sum(int(word) << (WORD_BITS * i) for i, word in enumerate(fired))
+        return [reason for bit, reason in enumerate(self.reasons) if fired >> bit & 1]
+
+    def encode(self, reasons: Iterable[str]) -> int:
+        fired = 0
+        for reason in reasons:
+            mask = self.reason_masks.get(reason)
+            if mask is None:
+                raise ValueError(f"Unknown compliance reason: {reason!r}.")
+            fired |= mask
+        return fired
+
+    def evaluate(self, facts: Dict[str, Any]) -> int:
+        fired = self.all_bits
+        for name, table, bucket in self._lookups:
+            fired &= table[bucket(facts[name])]
+        return self._finish(fired)
+
+    def outcome(self, fired: int) -> Tuple[str, Tuple[str, ...], str]:
+        outcome = self._outcomes.get(fired)
+        if outcome is None:
+            decision = self.decision(fired)
+            reasons = tuple(self.decode(fired))
+            message = f"Final decision: {decision.upper()}. " + " ".join(reasons)
+            outcome = self._outcomes[fired] = (decision, reasons, message)
+        return outcome
+
+    def knockout(self, facts: Dict[str, Any]) -> int:
+        fired = self.knockout_bits
+        for fact in self.facts:
+            if fact.name in facts:
+                fired &= fact.table[fact.bucket(facts[fact.name])]
+            else:
+                fired &= ~self.fact_rules[fact.name]
+        return fired
+
+    def _word_array(self, bits: int):
+        import numpy as np
+
+        return np.array([(bits >> (WORD_BITS * word)) & ((1 << WORD_BITS) - 1) for word in range(self.words)], dtype=np.uint64)
+
+    def _word_tables(self):
+        if self._words is None:
+            import numpy as np
+
+            self._words = {
+                "all": self._word_array(self.all_bits),
+                "facts": [np.stack([self._word_array(bits) for bits in fact.table]) for fact in self.facts],
+                "suppressions": self._suppression_levels(),
+                "non_fallback": self._word_array(self.all_bits & ~self.fallback_bits),
+                "severities": [self._word_array(bits) for bits in self.severity_bits],
+            }
+        return self._words
+
+    def _suppression_levels(self):
+        import numpy as np
+
+        depth: Dict[int, int] = {}
+        for bit, unless in self.suppressions:
+            depth[bit] = 1 + max((depth.get(source, 0) for source in range(bit) if unless >> source & 1), default=0)
+        levels = []
+        for level in sorted(set(depth.values())):
+            group = [(bit, unless) for bit, unless in self.suppressions if depth[bit] == level]
+            sources = sorted({source for _, unless in group for source in range(len(self.rules)) if unless >> source & 1})
+            matrix = np.array([[unless >> source & 1 for _, unless in group] for source in sources], dtype=np.float32)
+            levels.append((np.array(sources), matrix, np.array([bit for bit, _ in group])))
+        return levels
+
+    def evaluate_batch(self, facts: Dict[str, Any], size: int):
+        import numpy as np
+
+        words = self._word_tables()
+        fired = np.broadcast_to(words["all"], (size, self.words)).copy()
+        for fact, tables in zip(self.facts, words["facts"]):
+            fired &= tables[fact.buckets(facts[fact.name])]
+
+        if words["suppressions"]:
+            bits = np.unpackbits(fired.astype("<u8").view(np.uint8), axis=1, bitorder="little").view(bool)
+            for sources, matrix, targets in words["suppressions"]:
+                bits[:, targets] &= bits[:, sources].astype(np.float32) @ matrix == 0
+            fired = np.packbits(bits, axis=1, bitorder="little").view("<u8").astype(np.uint64)
+        others = (fired & words["non_fallback"]).any(axis=1)
+        fired[others] &= words["non_fallback"]
+
+        codes = np.zeros(size, dtype=np.int8)
+        for code in range(1, len(SEVERITIES)):
+            codes[(fired & words["severities"][code]).any(axis=1)] = code
+        return fired, np.array(SEVERITIES)[codes]
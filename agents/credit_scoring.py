@@ -1,56 +1,166 @@
-from orchestrator import ApplicationData, AgentResponse
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from models import ApplicationData, AgentResponse
+from agents.rule_tables import CompiledAgent
+
+EMPLOYMENT_ADJUSTMENTS = (("Salaried", 10), ("Self-employed", -5))
+CREDIT_BANDS = (
+    ("Excellent", "approve"),
+    ("Good", "approve_with_caution"),
+    ("Fair", "review"),
+    ("Weak", "review"),
+)
+
+def credit_message(score: int, band: str, decision: str) -> str:
+    return f"Credit score evaluated as {score} ({band}) with decision inclination: {decision}."
+
+@dataclass
+class CreditTables:
+    dti_scores: Tuple[int, ...]
+    employment_codes: Dict[str, int]
+    adjustments: Tuple[int, ...]
+    tenure_buckets: int
+    outcomes: Tuple[Tuple[int, str, str, str], ...]
+    band_codes: Tuple[int, ...]
+
+class CreditScoringAgent(CompiledAgent):
+    stage_name = "credit"
+    requires = ()
+    entry_point = "evaluate"
+    reads = (
+        "credit_score",
+        "monthly_income",
+        "existing_emi",
+        "employment_type",
+        "years_in_current_job",
+        "has_previous_default",
+    )
+    rule_fields = (
+        "dti_cutoffs",
+        "dti_scores",
+        "employment_adjustments",
+        "other_employment_adjustment",
+        "tenure_cutoffs",
+        "tenure_adjustments",
+        "default_penalty",
+        "min_score",
+        "max_score",
+        "band_cutoffs",
+    )
+
+    def __init__(
+        self,
+        dti_cutoffs: Tuple[float, ...] = (0.2, 0.4, 0.6),
+        dti_scores: Tuple[int, ...] = (780, 730, 690, 650),
+        employment_adjustments: Tuple[Tuple[str, int], ...] = EMPLOYMENT_ADJUSTMENTS,
+        other_employment_adjustment: int = -10,
+        tenure_cutoffs: Tuple[float, ...] = (1, 3),
+        tenure_adjustments: Tuple[int, ...] = (-10, 0, 10),
+        default_penalty: int = 40,
+        min_score: int = 300,
+        max_score: int = 900,
+        band_cutoffs: Tuple[int, ...] = (780, 730, 680)
+    ):
+        if len(dti_scores) != len(dti_cutoffs) + 1 or len(tenure_adjustments) != len(tenure_cutoffs) + 1:
+            raise ValueError("Each set of cutoffs needs exactly one more score or adjustment than cutoffs.")
+        if len(band_cutoffs) != len(CREDIT_BANDS) - 1:
+            raise ValueError(f"Credit bands need {len(CREDIT_BANDS) - 1} cutoffs.")
+        self.dti_cutoffs = tuple(dti_cutoffs)
+        self.dti_scores = tuple(dti_scores)
+        self.employment_adjustments = tuple(employment_adjustments)
+        self.other_employment_adjustment = other_employment_adjustment
+        self.tenure_cutoffs = tuple(tenure_cutoffs)
+        self.tenure_adjustments = tuple(tenure_adjustments)
+        self.default_penalty = default_penalty
+        self.min_score = min_score
+        self.max_score = max_score
+        self.band_cutoffs = tuple(band_cutoffs)
+        self.compile()
+
+    def build_tables(self) -> CreditTables:
+        employment = [adjustment for _, adjustment in self.employment_adjustments]
+        employment.append(self.other_employment_adjustment)
+        adjustments = tuple(
+            employment_adjustment + tenure_adjustment - (self.default_penalty if default else 0)
+            for employment_adjustment in employment
+            for tenure_adjustment in self.tenure_adjustments
+            for default in (False, True)
+        )
+
+        outcomes = []
+        band_codes = []
+        for score in range(self.min_score, self.max_score + 1):
+            code = next((i for i, cutoff in enumerate(self.band_cutoffs) if score >= cutoff), len(self.band_cutoffs))
+            band, decision = CREDIT_BANDS[code]
+            outcomes.append((score, decision, band, credit_message(score, band, decision)))
+            band_codes.append(code)
+
+        return CreditTables(
+            dti_scores=self.dti_scores,
+            employment_codes={name: code for code, (name, _) in enumerate(self.employment_adjustments)},
+            adjustments=adjustments,
+            tenure_buckets=len(self.tenure_adjustments),
+            outcomes=tuple(outcomes),
+            band_codes=tuple(band_codes),
+        )
 
-class CreditScoringAgent:
     def evaluate(self, app: ApplicationData) -> AgentResponse:
+        tables = self._tables
         if app.credit_score > 0:
             base_score = app.credit_score
         else:
-            if app.monthly_income <= 0:
-                dti = 1.0
-            else:
-                dti = app.existing_emi / app.monthly_income
-
-            if dti < 0.2:
-                base_score = 780
-            elif dti < 0.4:
-                base_score = 730
-            elif dti < 0.6:
-                base_score = 690
-            else:
-                base_score = 650
-
-        if app.employment_type == "Salaried":
-            base_score += 10
-        elif app.employment_type == "Self-employed":
-            base_score -= 5
-        else:
-            base_score -= 10
-
-        if app.years_in_current_job >= 3:
-            base_score += 10
-        elif app.years_in_current_job < 1:
-            base_score -= 10
-
-        if app.has_previous_default:
-            base_score -= 40
-
-        score = max(300, min(900, base_score))
-
-        if score >= 780:
-            decision = "approve"
-            band = "Excellent"
-        elif score >= 730:
-            decision = "approve_with_caution"
-            band = "Good"
-        elif score >= 680:
-            decision = "review"
-            band = "Fair"
-        else:
-            decision = "review"
-            band = "Weak"
+            dti = app.existing_emi / app.monthly_income if app.monthly_income > 0 else 1.0
+            base_score = tables.dti_scores[bisect_right(self.dti_cutoffs, dti)]
+
+        employment = tables.employment_codes.get(app.employment_type, len(tables.employment_codes))
+        tenure = bisect_right(self.tenure_cutoffs, app.years_in_current_job)
+        index = (employment * tables.tenure_buckets + tenure) * 2 + bool(app.has_previous_default)
+        score = max(self.min_score, min(self.max_score, base_score + tables.adjustments[index]))
+        score, decision, band, message = tables.outcomes[int(score) - self.min_score]
 
         return AgentResponse(
             status="ok",
-            message=f"Credit score evaluated as {int(score)} ({band}) with decision inclination: {decision}.",
-            data={"credit_score": int(score), "credit_decision": decision, "credit_band": band},
+            message=message,
+            data={"credit_score": score, "credit_decision": decision, "credit_band": band},
         )
+
+    def describe(self, data: dict) -> str:
+        return credit_message(data["credit_score"], data["credit_band"], data["credit_decision"])
+
+    def _employment_codes(self, employment):
+        import numpy as np
+
+        codes = self._tables.employment_codes
+        other = len(codes)
+        if hasattr(employment, "categories"):
+            remap = np.array([codes.get(category, other) for category in employment.categories] or [other])
+            return remap[employment.codes]
+        return np.select([employment == name for name in codes], list(codes.values()), other)
+
+    def evaluate_batch(self, cols) -> dict:
+        import numpy as np
+
+        tables = self._tables
+        income = np.asarray(cols["monthly_income"], dtype=np.float64)
+        existing_emi = np.asarray(cols["existing_emi"], dtype=np.float64)
+        known_score = np.asarray(cols["credit_score"], dtype=np.int64)
+
+        dti = np.divide(existing_emi, income, out=np.ones_like(income), where=income > 0)
+        derived_score = np.asarray(tables.dti_scores, dtype=np.int64)[np.searchsorted(self.dti_cutoffs, dti, "right")]
+        base_score = np.where(known_score > 0, known_score, derived_score)
+
+        years = np.asarray(cols["years_in_current_job"], dtype=np.float64)
+        tenure = np.searchsorted(self.tenure_cutoffs, years, "right")
+        default = np.asarray(cols["has_previous_default"], dtype=bool)
+        index = (self._employment_codes(cols["employment_type"]) * tables.tenure_buckets + tenure) * 2 + default
+
+        score = np.clip(base_score + np.asarray(tables.adjustments, dtype=np.int64)[index], self.min_score, self.max_score)
+        band_code = np.asarray(tables.band_codes, dtype=np.intp)[score - self.min_score]
+
+        return {
+            "credit_score": score,
+            "credit_decision": np.array([decision for _, decision in CREDIT_BANDS])[band_code],
+            "credit_band": np.array([band for band, _ in CREDIT_BANDS])[band_code],
+        }
@@ -1,29 +1,61 @@
-from orchestrator import ApplicationData, AgentResponse
+from models import ApplicationData, AgentResponse
+
+MISSING_DOCUMENTS = ("KYC document", "Bank statements")
+DOCUMENTS_READY_MESSAGE = "KYC and bank statements are marked as uploaded and ready for back-office verification."
+
+def decode_missing_documents(mask: int) -> list:
+    return [document for bit, document in enumerate(MISSING_DOCUMENTS) if mask & (1 << bit)]
+
+def _outcome(mask: int):
+    missing = decode_missing_documents(mask)
+    if missing:
+        return "warning", "Missing documents: " + ", ".join(missing) + ".", 0.4
+    return "ok", DOCUMENTS_READY_MESSAGE, 0.9
+
+OUTCOMES = tuple(_outcome(mask) for mask in range(1 << len(MISSING_DOCUMENTS)))
 
 class DocumentVerificationAgent:
+    stage_name = "document"
+    requires = ()
+    entry_point = "verify"
+    reads = ("kyc_uploaded", "bank_statement_uploaded")
+
     def verify(self, app: ApplicationData) -> AgentResponse:
-        missing = []
-        if not app.kyc_uploaded:
-            missing.append("KYC document")
-        if not app.bank_statement_uploaded:
-            missing.append("Bank statements")
-
-        if missing:
-            status = "warning"
-            msg = "Missing documents: " + ", ".join(missing) + "."
-            quality_score = 0.4
-        else:
-            status = "ok"
-            msg = "KYC and bank statements are marked as uploaded and ready for back-office verification."
-            quality_score = 0.9
+        mask = (not app.kyc_uploaded) | (not app.bank_statement_uploaded) << 1
+        status, message, quality_score = OUTCOMES[mask]
 
         return AgentResponse(
             status=status,
-            message=msg,
+            message=message,
             data={
                 "kyc_uploaded": app.kyc_uploaded,
                 "bank_statement_uploaded": app.bank_statement_uploaded,
                 "document_quality_score": quality_score,
-                "missing_documents": missing,
+                "missing_documents_mask": mask,
             },
         )
+
+    def describe(self, data: dict) -> str:
+        return OUTCOMES[data["missing_documents_mask"]][1]
+
+    def expand(self, data: dict) -> dict:
+        return {
+            "kyc_uploaded": data["kyc_uploaded"],
+            "bank_statement_uploaded": data["bank_statement_uploaded"],
+            "document_quality_score": data["document_quality_score"],
+            "missing_documents": decode_missing_documents(data["missing_documents_mask"]),
+        }
+
+    def verify_batch(self, cols) -> dict:
+        import numpy as np
+
+        kyc = np.asarray(cols["kyc_uploaded"], dtype=bool)
+        bank = np.asarray(cols["bank_statement_uploaded"], dtype=bool)
+        missing_mask = (~kyc).astype(np.uint8) | ((~bank).astype(np.uint8) << 1)
+
+        return {
+            "kyc_uploaded": kyc,
+            "bank_statement_uploaded": bank,
+            "document_quality_score": np.where(missing_mask > 0, 0.4, 0.9),
+            "missing_documents_mask": missing_mask,
+        }
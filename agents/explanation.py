@@ -0,0 +1,251 @@
+import asyncio
+import math
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.compliance import DEFAULT_RULES, ComplianceAgent
+from agents.risk_assessment import RISK_FLAGS, decode_risk_flags
+
+AMOUNT_STEPS = (1.0, 1.5, 2.0, 3.0, 5.0, 7.0)
+SCORE_STEP = 50
+PLACEHOLDERS = ("credit_score_from", "credit_score_to", "requested_emi", "offer_amount")
+RISK_FLAG_BITS = {flag: bit for bit, flag in enumerate(RISK_FLAGS)}
+
+def bucket_amount(value: Optional[float]) -> Optional[float]:
+    if value is None:
+        return None
+    if value <= 0:
+        return 0.0
+    scale = 10.0 ** math.floor(math.log10(value))
+    return scale * AMOUNT_STEPS[max(bisect_right(AMOUNT_STEPS, value / scale), 1) - 1]
+
+def _mask(labels: List[str], bits: Dict[str, int]) -> int:
+    return sum(1 << bits[label] for label in labels)
+
+def _label(value: Any) -> Optional[str]:
+    return getattr(value, "label", value)
+
+@dataclass(frozen=True)
+class ExplanationCodes:
+    decision: str
+    compliance_reasons: Tuple[str, ...]
+    risk_flag_mask: Optional[int] = None
+    credit_band: Optional[str] = None
+    risk_level: Optional[str] = None
+    affordability_flag: Optional[str] = None
+    has_offer: bool = False
+
+    @property
+    def risk_flags(self) -> List[str]:
+        return decode_risk_flags(self.risk_flag_mask or 0)
+
+@dataclass(frozen=True)
+class ExplanationRequest:
+    codes: ExplanationCodes
+    credit_score_from: Optional[int] = None
+    credit_score_to: Optional[int] = None
+    requested_emi: Optional[float] = None
+    offer_amount: Optional[float] = None
+
+    @classmethod
+    def build(
+        cls,
+        codes: ExplanationCodes,
+        credit_score: Optional[int],
+        requested_emi: Optional[float],
+        offer_amount: Optional[float],
+        score_step: int = SCORE_STEP
+    ) -> "ExplanationRequest":
+        score_from = score_to = None
+        if credit_score is not None:
+            score_from = int(credit_score) // score_step * score_step
+            score_to = score_from + score_step - 1
+        return cls(codes, score_from, score_to, bucket_amount(requested_emi), bucket_amount(offer_amount))
+
+    @classmethod
+    def from_result(
+        cls,
+        result: Any,
+        score_step: int = SCORE_STEP,
+        compliance: Optional[ComplianceAgent] = None
+    ) -> "ExplanationRequest":
+        compliance = compliance or DEFAULT_RULES
+        credit, risk, affordability, offer = result.credit, result.risk, result.affordability, result.offer
+        codes = ExplanationCodes(
+            decision=result.final_decision.label,
+            compliance_reasons=tuple(compliance.decode(result.compliance.compliance_reasons_mask)),
+            risk_flag_mask=risk.risk_flag_mask if risk is not None else None,
+            credit_band=credit.credit_band.label if credit is not None else None,
+            risk_level=risk.risk_level.label if risk is not None else None,
+            affordability_flag=affordability.affordability_flag.label if affordability is not None else None,
+            has_offer=offer is not None,
+        )
+        return cls.build(
+            codes,
+            credit.credit_score if credit is not None else None,
+            affordability.requested_emi if affordability is not None else None,
+            offer.recommended_loan_amount if offer is not None else None,
+            score_step,
+        )
+
+    @classmethod
+    def from_record(
+        cls,
+        record: Dict[str, Any],
+        score_step: int = SCORE_STEP,
+        compliance: Optional[ComplianceAgent] = None
+    ) -> "ExplanationRequest":
+        compliance = compliance or DEFAULT_RULES
+        offer = record.get("offer")
+        risk_flags = record.get("risk_flags")
+        codes = ExplanationCodes(
+            decision=_label(record["final_decision"]),
+            compliance_reasons=tuple(compliance.decode(compliance.encode(record["compliance_reasons"]))),
+            risk_flag_mask=_mask(risk_flags, RISK_FLAG_BITS) if risk_flags is not None else None,
+            credit_band=_label(record.get("credit_band")),
+            risk_level=_label(record.get("risk_level")),
+            affordability_flag=_label(record.get("affordability_flag")),
+            has_offer=bool(offer),
+        )
+        return cls.build(
+            codes,
+            record.get("credit_score"),
+            record.get("requested_emi"),
+            offer["recommended_loan_amount"] if offer else None,
+            score_step,
+        )
+
+    def values(self) -> Dict[str, str]:
+        values = {}
+        for name in PLACEHOLDERS:
+            value = getattr(self, name)
+            values[name] = "" if value is None else f"{value:,.0f}"
+        return values
+
+class TemplateBackend:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def template(self, codes: ExplanationCodes) -> str:
+        self.calls += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        parts = [f"Your application outcome is: {codes.decision.replace('_', ' ')}."]
+        if codes.credit_band is not None:
+            parts.append(f"Your credit score falls in the $credit_score_from-$credit_score_to range ({codes.credit_band} band).")
+        if codes.affordability_flag is not None:
+            parts.append(
+                f"The requested EMI of roughly ₹$requested_emi or more was assessed as "
+                f"{codes.affordability_flag.lower()} against your income."
+            )
+        if codes.risk_level is not None:
+            flags = codes.risk_flags
+            parts.append(
+                f"Overall risk is {codes.risk_level.lower()}"
+                + (" because of: " + "; ".join(flag.lower() for flag in flags) + "." if flags else ".")
+            )
+        parts.extend(codes.compliance_reasons)
+        if codes.has_offer:
+            parts.append("We can offer a loan of about ₹$offer_amount or more.")
+        return " ".join(parts)
+
+class ExplanationAgent:
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        max_entries: int = 4096,
+        score_step: int = SCORE_STEP,
+        compliance: Optional[ComplianceAgent] = None
+    ):
+        self.backend = backend or TemplateBackend()
+        self.compliance = compliance
+        self.max_entries = max_entries
+        self.score_step = score_step
+        self._templates: "OrderedDict[ExplanationCodes, Template]" = OrderedDict()
+        self._results: "OrderedDict[ExplanationRequest, str]" = OrderedDict()
+        self._pending: Dict[ExplanationCodes, asyncio.Task] = {}
+        self.hits = 0
+        self.template_hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.evictions = 0
+        self.failures = 0
+
+    def request(self, result: Any) -> ExplanationRequest:
+        if isinstance(result, ExplanationRequest):
+            return result
+        if isinstance(result, dict):
+            return ExplanationRequest.from_record(result, self.score_step, self.compliance)
+        return ExplanationRequest.from_result(result, self.score_step, self.compliance)
+
+    async def explain(self, result: Any) -> str:
+        request = self.request(result)
+        text = self._results.get(request)
+        if text is not None:
+            self._results.move_to_end(request)
+            self.hits += 1
+            return text
+
+        template = self._templates.get(request.codes)
+        if template is not None:
+            self._templates.move_to_end(request.codes)
+            self.template_hits += 1
+        else:
+            task = self._pending.get(request.codes)
+            if task is None:
+                self.misses += 1
+                task = self._pending[request.codes] = asyncio.ensure_future(self._fetch(request.codes))
+            else:
+                self.deduplicated += 1
+            template = await asyncio.shield(task)
+
+        text = template.safe_substitute(request.values())
+        self._remember(self._results, request, text)
+        return text
+
+    def submit(self, result: Any) -> "asyncio.Future[str]":
+        return asyncio.ensure_future(self.explain(result))
+
+    async def explain_many(self, results: List[Any]) -> List[str]:
+        return list(await asyncio.gather(*(self.explain(result) for result in results)))
+
+    async def _fetch(self, codes: ExplanationCodes) -> Template:
+        try:
+            template = Template(await self.backend.template(codes))
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._pending.pop(codes, None)
+        self._remember(self._templates, codes, template)
+        return template
+
+    def _remember(self, entries: OrderedDict, key: Any, value: Any) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._templates.clear()
+        self._results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.template_hits + self.misses + self.deduplicated
+        return {
+            "hits": self.hits,
+            "template_hits": self.template_hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "failures": self.failures,
+            "templates": len(self._templates),
+            "results": len(self._results),
+            "pending": len(self._pending),
+        }
@@ -1,30 +1,25 @@
-import math
-from orchestrator import ApplicationData
+from annuity import monthly_payment, monthly_payments
+from models import ApplicationData
+
+WITHIN_LIMITS_NOTE = "Requested loan amount is within affordability limits."
+ADJUSTED_NOTE = "Loan amount and EMI have been aligned to internal affordability constraints."
 
 class OfferGenerationAgent:
+    stage_name = "offer"
+    requires = ("credit", "risk", "affordability", "compliance")
+    entry_point = "propose_offer"
+    reads = ("loan_amount", "loan_tenure_months")
+
+    def __init__(self, base_rate: float = 0.16, min_rate: float = 0.11, max_rate: float = 0.22):
+        self.base_rate = base_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+
     def _calculate_emi(self, principal: float, annual_rate: float, tenure_months: int) -> float:
-        if tenure_months <= 0:
-            return 0.0
-        r = annual_rate / 12.0
-        n = tenure_months
-        if r <= 0:
-            return principal / n
-        denom = (math.pow(1 + r, n) - 1)
-        if denom <= 0:
-            return 0.0
-        return principal * r * math.pow(1 + r, n) / denom
+        return monthly_payment(principal, annual_rate, tenure_months)
 
-    def propose_offer(
-        self,
-        app: ApplicationData,
-        credit_data: dict,
-        risk_data: dict,
-        affordability_data: dict,
-        compliance_data: dict
-    ) -> dict:
-        base_rate = 0.16
-        credit_score = credit_data.get("credit_score", 700)
-        risk_level = risk_data.get("risk_level", "Medium")
+    def price(self, credit_score: int, risk_level: str) -> float:
+        base_rate = self.base_rate
 
         if credit_score >= 780:
             base_rate -= 0.03
@@ -38,7 +33,34 @@ class OfferGenerationAgent:
         elif risk_level == "High":
             base_rate += 0.015
 
-        base_rate = max(0.11, min(0.22, base_rate))
+        return max(self.min_rate, min(self.max_rate, base_rate))
+
+    def price_batch(self, credit_score, risk_level):
+        import numpy as np
+
+        base_rate = np.select(
+            [credit_score >= 780, credit_score >= 730, credit_score < 680],
+            [self.base_rate - 0.03, self.base_rate - 0.015, self.base_rate + 0.02],
+            self.base_rate,
+        )
+        base_rate = np.select(
+            [risk_level == "Low", risk_level == "High"],
+            [base_rate - 0.005, base_rate + 0.015],
+            base_rate,
+        )
+        return np.clip(base_rate, self.min_rate, self.max_rate)
+
+    def propose_offer(
+        self,
+        app: ApplicationData,
+        credit_data: dict,
+        risk_data: dict,
+        affordability_data: dict,
+        compliance_data: dict
+    ) -> dict:
+        credit_score = credit_data.get("credit_score", 700)
+        risk_level = risk_data.get("risk_level", "Medium")
+        base_rate = self.price(credit_score, risk_level)
 
         requested_emi = affordability_data.get("requested_emi", 0.0)
         max_allowed_emi = affordability_data.get("max_allowed_emi", 0.0)
@@ -47,11 +69,11 @@ class OfferGenerationAgent:
         if requested_emi <= max_allowed_emi and app.loan_amount <= max_eligible_loan:
             recommended_loan = app.loan_amount
             recommended_emi = requested_emi
-            adjustment_note = "Requested loan amount is within affordability limits."
+            adjustment_note = WITHIN_LIMITS_NOTE
         else:
             recommended_loan = min(app.loan_amount, max_eligible_loan)
             recommended_emi = self._calculate_emi(recommended_loan, base_rate, app.loan_tenure_months)
-            adjustment_note = "Loan amount and EMI have been aligned to internal affordability constraints."
+            adjustment_note = ADJUSTED_NOTE
 
         final_decision = compliance_data.get("final_decision", "review")
 
@@ -64,3 +86,39 @@ class OfferGenerationAgent:
             "decision_from_compliance": final_decision,
             "adjustment_note": adjustment_note,
         }
+
+    def propose_offer_batch(
+        self,
+        cols,
+        credit_data: dict,
+        risk_data: dict,
+        affordability_data: dict,
+        compliance_data: dict
+    ) -> dict:
+        import numpy as np
+
+        base_rate = self.price_batch(credit_data["credit_score"], risk_data["risk_level"])
+
+        loan_amount = np.asarray(cols["loan_amount"], dtype=np.float64)
+        requested_emi = affordability_data["requested_emi"]
+        max_allowed_emi = affordability_data["max_allowed_emi"]
+        max_eligible_loan = affordability_data["max_eligible_loan"]
+
+        within_limits = (requested_emi <= max_allowed_emi) & (loan_amount <= max_eligible_loan)
+        capped_loan = np.minimum(loan_amount, max_eligible_loan)
+        recommended_loan = np.where(within_limits, loan_amount, capped_loan)
+        recommended_emi = np.where(
+            within_limits,
+            requested_emi,
+            monthly_payments(capped_loan, base_rate, cols["loan_tenure_months"]),
+        )
+
+        return {
+            "suggested_interest_rate_percent": np.round(base_rate * 100, 2),
+            "recommended_loan_amount": recommended_loan,
+            "recommended_emi": recommended_emi,
+            "max_eligible_loan_amount": max_eligible_loan,
+            "max_affordable_emi": max_allowed_emi,
+            "decision_from_compliance": compliance_data["final_decision"],
+            "within_affordability_limits": within_limits,
+        }
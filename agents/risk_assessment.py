@@ -1,50 +1,125 @@
-from orchestrator import ApplicationData, AgentResponse
+from dataclasses import dataclass
+from itertools import product
+from typing import Tuple
+
+from models import ApplicationData, AgentResponse
+from agents.rule_tables import CompiledAgent
+
+RISK_FLAGS = (
+    "High loan-to-income ratio",
+    "Age below 21",
+    "Age above 60",
+    "History of previous default or settlement",
+    "Higher geographic risk (Tier 3/Other)",
+    "Borderline credit profile from credit scoring agent",
+    "Moderate credit risk",
+)
+RISK_LEVELS = ("Low", "Medium", "High")
+CREDIT_DECISION_CODES = {"review": 1, "approve_with_caution": 2}
+
+def decode_risk_flags(mask: int) -> list:
+    return [flag for bit, flag in enumerate(RISK_FLAGS) if mask & (1 << bit)]
+
+def risk_message(risk_score: float, risk_level: str, flags) -> str:
+    message = f"Overall risk assessed as {risk_level} with score {int(risk_score)}."
+    if flags:
+        message += " Key factors: " + ", ".join(flags) + "."
+    return message
+
+@dataclass
+class RiskTables:
+    outcomes: Tuple[Tuple[float, str, int, str], ...]
+    scores: Tuple[float, ...]
+    level_codes: Tuple[int, ...]
+    masks: Tuple[int, ...]
+
+class RiskAssessmentAgent(CompiledAgent):
+    stage_name = "risk"
+    requires = ("credit",)
+    entry_point = "assess"
+    reads = ("loan_amount", "monthly_income", "age", "has_previous_default", "city_tier")
+    rule_fields = ("weights", "loan_to_income_limit", "level_cutoffs")
+
+    def __init__(
+        self,
+        weights: Tuple[float, ...] = (25, 30, 20, 40, 10, 15, 5),
+        loan_to_income_limit: float = 40,
+        level_cutoffs: Tuple[float, ...] = (20, 45)
+    ):
+        if len(weights) != len(RISK_FLAGS):
+            raise ValueError(f"Risk assessment needs one weight per flag ({len(RISK_FLAGS)}).")
+        if len(level_cutoffs) != len(RISK_LEVELS) - 1:
+            raise ValueError(f"Risk levels need {len(RISK_LEVELS) - 1} cutoffs.")
+        self.weights = tuple(weights)
+        self.loan_to_income_limit = loan_to_income_limit
+        self.level_cutoffs = tuple(level_cutoffs)
+        self.compile()
+
+    def build_tables(self) -> RiskTables:
+        outcomes = []
+        level_codes = []
+        masks = []
+        for high_lti, age, default, tier, credit in product((0, 1), (0, 1, 2), (0, 1), (0, 1), (0, 1, 2)):
+            bits = [high_lti, age == 1, age == 2, default, tier, credit == 1, credit == 2]
+            risk_score = 0.0
+            for bit, weight in zip(bits, self.weights):
+                if bit:
+                    risk_score += weight
+            code = next((i for i, cutoff in enumerate(self.level_cutoffs) if risk_score <= cutoff), len(self.level_cutoffs))
+            mask = sum(1 << i for i, bit in enumerate(bits) if bit)
+            message = risk_message(risk_score, RISK_LEVELS[code], decode_risk_flags(mask))
+            outcomes.append((risk_score, RISK_LEVELS[code], mask, message))
+            level_codes.append(code)
+            masks.append(mask)
+
+        return RiskTables(
+            outcomes=tuple(outcomes),
+            scores=tuple(outcome[0] for outcome in outcomes),
+            level_codes=tuple(level_codes),
+            masks=tuple(masks),
+        )
 
-class RiskAssessmentAgent:
     def assess(self, app: ApplicationData, credit_data: dict) -> AgentResponse:
-        risk_score = 0.0
-        flags = []
-
-        if app.loan_amount > app.monthly_income * 40:
-            risk_score += 25
-            flags.append("High loan-to-income ratio")
-
-        if app.age < 21:
-            risk_score += 30
-            flags.append("Age below 21")
-        elif app.age > 60:
-            risk_score += 20
-            flags.append("Age above 60")
-
-        if app.has_previous_default:
-            risk_score += 40
-            flags.append("History of previous default or settlement")
-
-        if app.city_tier == "Tier 3/Other":
-            risk_score += 10
-            flags.append("Higher geographic risk (Tier 3/Other)")
-
-        credit_decision = credit_data.get("credit_decision")
-        if credit_decision == "review":
-            risk_score += 15
-            flags.append("Borderline credit profile from credit scoring agent")
-        elif credit_decision == "approve_with_caution":
-            risk_score += 5
-            flags.append("Moderate credit risk")
-
-        if risk_score <= 20:
-            risk_level = "Low"
-        elif risk_score <= 45:
-            risk_level = "Medium"
-        else:
-            risk_level = "High"
-
-        msg = f"Overall risk assessed as {risk_level} with score {int(risk_score)}."
-        if flags:
-            msg += " Key factors: " + ", ".join(flags) + "."
+        age = 1 if app.age < 21 else 2 if app.age > 60 else 0
+        index = (
+            (
+                (app.loan_amount > app.monthly_income * self.loan_to_income_limit) * 3 + age
+            ) * 2 + bool(app.has_previous_default)
+        ) * 2 + (app.city_tier == "Tier 3/Other")
+        credit = CREDIT_DECISION_CODES.get(credit_data.get("credit_decision"), 0)
+        risk_score, risk_level, mask, message = self._tables.outcomes[index * 3 + credit]
 
         return AgentResponse(
             status="ok",
-            message=msg,
-            data={"risk_score": float(risk_score), "risk_level": risk_level, "risk_flags": flags},
+            message=message,
+            data={"risk_score": risk_score, "risk_level": risk_level, "risk_flag_mask": mask},
         )
+
+    def describe(self, data: dict) -> str:
+        return risk_message(data["risk_score"], data["risk_level"], decode_risk_flags(data["risk_flag_mask"]))
+
+    def expand(self, data: dict) -> dict:
+        return {
+            "risk_score": data["risk_score"],
+            "risk_level": data["risk_level"],
+            "risk_flags": decode_risk_flags(data["risk_flag_mask"]),
+        }
+
+    def assess_batch(self, cols, credit_data: dict) -> dict:
+        import numpy as np
+
+        tables = self._tables
+        age = np.asarray(cols["age"])
+        credit_decision = credit_data["credit_decision"]
+        high_lti = np.asarray(cols["loan_amount"]) > np.asarray(cols["monthly_income"]) * self.loan_to_income_limit
+        age_code = np.where(age < 21, 1, np.where(age > 60, 2, 0))
+        default = np.asarray(cols["has_previous_default"], dtype=bool)
+        tier = cols["city_tier"] == "Tier 3/Other"
+        credit = np.select([credit_decision == name for name in CREDIT_DECISION_CODES], list(CREDIT_DECISION_CODES.values()), 0)
+        index = ((((high_lti * 3 + age_code) * 2 + default) * 2 + tier) * 3 + credit).astype(np.intp)
+
+        return {
+            "risk_score": np.asarray(tables.scores, dtype=np.float64)[index],
+            "risk_level": np.array(RISK_LEVELS)[np.asarray(tables.level_codes, dtype=np.intp)[index]],
+            "risk_flag_mask": np.asarray(tables.masks, dtype=np.uint8)[index],
+        }
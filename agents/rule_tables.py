@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import Any, Tuple
+
+class CompiledAgent(ABC):
+    rule_fields: Tuple[str, ...] = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in self.rule_fields and "_tables" in self.__dict__:
+            self.compile()
+
+    def compile(self) -> None:
+        object.__setattr__(self, "_tables", self.build_tables())
+
+    @abstractmethod
+    def build_tables(self) -> Any:
+        pass
@@ -0,0 +1,151 @@
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from annuity import growth_factors, monthly_payments
+
+SCHEDULE_DTYPE = np.dtype([
+    ("offer", np.int64),
+    ("month", np.int16),
+    ("payment", np.float64),
+    ("interest", np.float64),
+    ("principal", np.float64),
+    ("balance", np.float64),
+])
+
+@dataclass
+class AmortizationSchedule:
+    tenure_months: np.ndarray
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+
+    @property
+    def active(self) -> np.ndarray:
+        return np.arange(1, self.payment.shape[1] + 1) <= self.tenure_months[:, None]
+
+    def records(self, offset: int = 0) -> np.ndarray:
+        offers, months = np.nonzero(self.active)
+        records = np.empty(len(offers), dtype=SCHEDULE_DTYPE)
+        records["offer"] = offers + offset
+        records["month"] = months + 1
+        records["payment"] = self.payment[offers, months]
+        records["interest"] = self.interest[offers, months]
+        records["principal"] = self.principal[offers, months]
+        records["balance"] = self.balance[offers, months]
+        return records
+
+def _inputs(principal, annual_rate, tenure_months, emi):
+    principal = np.atleast_1d(np.asarray(principal, dtype=np.float64))
+    tenure = np.atleast_1d(np.asarray(tenure_months, dtype=np.int64))
+    rate = np.broadcast_to(np.asarray(annual_rate, dtype=np.float64), principal.shape)
+    if emi is None:
+        emi = monthly_payments(principal, rate, tenure)
+    emi = np.broadcast_to(np.asarray(emi, dtype=np.float64), principal.shape)
+    return principal, rate, np.maximum(tenure, 0), emi
+
+def _balances(principal, rate, emi, months):
+    r = rate[:, None] / 12.0
+    growth = growth_factors(rate[:, None], months[None, :])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        accrued = np.where(r > 0, (growth - 1) / r, months[None, :])
+    return principal[:, None] * growth - emi[:, None] * accrued
+
+def amortization_schedules(
+    principal,
+    annual_rate,
+    tenure_months,
+    emi=None
+) -> AmortizationSchedule:
+    principal, rate, tenure, emi = _inputs(principal, annual_rate, tenure_months, emi)
+    width = int(tenure.max(initial=0))
+    months = np.arange(width + 1)
+    balances = _balances(principal, rate, emi, months)
+
+    opening = balances[:, :-1]
+    interest = opening * (rate[:, None] / 12.0)
+    payment = np.broadcast_to(emi[:, None], opening.shape).copy()
+    active = months[None, 1:] <= tenure[:, None]
+    last = months[None, 1:] == tenure[:, None]
+
+    payment = np.where(last, opening + interest, payment)
+    principal_paid = payment - interest
+    balance = np.where(last, 0.0, balances[:, 1:])
+
+    return AmortizationSchedule(
+        tenure_months=tenure,
+        payment=np.where(active, payment, 0.0),
+        interest=np.where(active, interest, 0.0),
+        principal=np.where(active, principal_paid, 0.0),
+        balance=np.where(active, balance, 0.0),
+    )
+
+def offer_schedules(offer: Dict[str, np.ndarray], tenure_months) -> AmortizationSchedule:
+    return amortization_schedules(
+        offer["recommended_loan_amount"],
+        offer["suggested_interest_rate_percent"] / 100.0,
+        tenure_months,
+    )
+
+def write_schedules(
+    path: str,
+    principal,
+    annual_rate,
+    tenure_months,
+    emi=None,
+    chunk_size: int = 10000
+) -> int:
+    principal, rate, tenure, emi = _inputs(principal, annual_rate, tenure_months, emi)
+    text = path.endswith(".csv")
+    written = 0
+    with open(path, "w" if text else "wb") as sink:
+        if text:
+            sink.write(",".join(SCHEDULE_DTYPE.names) + "\n")
+        for start in range(0, len(principal), chunk_size):
+            stop = start + chunk_size
+            schedule = amortization_schedules(principal[start:stop], rate[start:stop], tenure[start:stop], emi[start:stop])
+            records = schedule.records(offset=start)
+            if text:
+                np.savetxt(sink, records, fmt=["%d", "%d", "%.2f", "%.2f", "%.2f", "%.2f"], delimiter=",")
+            else:
+                records.tofile(sink)
+            written += len(records)
+    return written
+
+def read_schedules(path: str) -> np.ndarray:
+    return np.memmap(path, dtype=SCHEDULE_DTYPE, mode="r")
+
+def schedule_summary(
+    principal,
+    annual_rate,
+    tenure_months,
+    emi=None,
+    upfront_fees=0.0,
+    iterations: int = 50
+) -> Dict[str, np.ndarray]:
+    principal, rate, tenure, emi = _inputs(principal, annual_rate, tenure_months, emi)
+    n = np.maximum(tenure, 1).astype(np.float64)
+    total_payment = emi * n
+    net_disbursed = principal - np.asarray(upfront_fees, dtype=np.float64)
+
+    irr = np.maximum(rate / 12.0, 1e-6)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(iterations):
+            discount = np.power(1 + irr, -n)
+            value = emi * (1 - discount) / irr - net_disbursed
+            slope = emi * (n * discount / (1 + irr) * irr - (1 - discount)) / (irr * irr)
+            step = np.where(slope != 0, value / slope, 0.0)
+            irr = np.clip(irr - step, 1e-9, 10.0)
+            if np.all(np.abs(step) < 1e-12):
+                break
+
+    valid = (tenure > 0) & (total_payment > net_disbursed)
+    return {
+        "emi": emi,
+        "total_payment": np.where(tenure > 0, total_payment, 0.0),
+        "total_interest": np.where(tenure > 0, total_payment - principal, 0.0),
+        "monthly_irr": np.where(valid, irr, 0.0),
+        "annual_irr": np.where(valid, irr * 12.0, 0.0),
+    }
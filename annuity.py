@@ -0,0 +1,80 @@
+import math
+from typing import Dict, List
+
+MAX_TABULATED_TENURE = 120
+MAX_CACHED_RATES = 1024
+
+_rows: Dict[float, List[float]] = {}
+_array_rows: Dict[float, object] = {}
+
+def _growth_row(annual_rate: float) -> List[float]:
+    row = _rows.get(annual_rate)
+    if row is None:
+        base = 1 + annual_rate / 12.0
+        row = [math.pow(base, n) for n in range(MAX_TABULATED_TENURE + 1)]
+        if len(_rows) < MAX_CACHED_RATES:
+            _rows[annual_rate] = row
+    return row
+
+def growth_factor(annual_rate: float, n: int) -> float:
+    if 0 <= n <= MAX_TABULATED_TENURE:
+        return _growth_row(annual_rate)[n]
+    return math.pow(1 + annual_rate / 12.0, n)
+
+def monthly_payment(principal: float, annual_rate: float, tenure_months: int) -> float:
+    if tenure_months <= 0:
+        return 0.0
+    r = annual_rate / 12.0
+    if r <= 0:
+        return principal / tenure_months
+    growth = growth_factor(annual_rate, tenure_months)
+    denom = growth - 1
+    if denom <= 0:
+        return 0.0
+    return principal * r * growth / denom
+
+def _growth_array(annual_rate: float):
+    import numpy as np
+
+    row = _array_rows.get(annual_rate)
+    if row is None:
+        row = np.array(_growth_row(annual_rate))
+        if len(_array_rows) < MAX_CACHED_RATES:
+            _array_rows[annual_rate] = row
+    return row
+
+def growth_factors(annual_rate, n):
+    import numpy as np
+
+    n = np.asarray(n, dtype=np.int64)
+    rates = np.asarray(annual_rate, dtype=np.float64)
+    unique_rates, positions = np.unique(rates, return_inverse=True)
+    positions, n = np.broadcast_arrays(positions.reshape(rates.shape), n)
+    on_grid = (n >= 0) & (n <= MAX_TABULATED_TENURE)
+    columns = np.where(on_grid, n, 0)
+
+    table = np.stack([_growth_array(rate) for rate in unique_rates.tolist()]) if len(unique_rates) else np.zeros((0, 1))
+    growth = table[positions, columns] if n.size else np.zeros(n.shape)
+
+    if not on_grid.all():
+        off_grid = ~on_grid
+        growth[off_grid] = [
+            math.pow(1 + rate / 12.0, count)
+            for rate, count in zip(unique_rates[positions[off_grid]].tolist(), n[off_grid].tolist())
+        ]
+    return growth
+
+def monthly_payments(principal, annual_rate, tenure_months):
+    import numpy as np
+
+    principal = np.asarray(principal, dtype=np.float64)
+    tenure = np.asarray(tenure_months, dtype=np.int64)
+    r = np.asarray(annual_rate, dtype=np.float64) / 12.0
+    growth = growth_factors(annual_rate, np.maximum(tenure, 1))
+    denom = growth - 1
+    payment = np.divide(principal * r * growth, denom, out=np.zeros(np.broadcast(principal, denom).shape), where=denom > 0)
+    if (r <= 0).any():
+        payment = np.where(r <= 0, principal / np.maximum(tenure, 1), payment)
+    if (tenure <= 0).any():
+        payment = np.where(tenure > 0, payment, 0.0)
+    return payment
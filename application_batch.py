@@ -0,0 +1,186 @@
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from orchestrator import ApplicationData
+
+KNOWN_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "employment_type": ("Salaried", "Self-employed", "Student", "Retired", "Other"),
+    "residence_type": ("Owned", "Rented", "Company Provided", "Other"),
+    "city_tier": ("Tier 1", "Tier 2", "Tier 3/Other"),
+}
+
+MONEY_FIELDS = ("monthly_income", "existing_emi", "loan_amount")
+INT_FIELDS = ("age", "loan_tenure_months", "credit_score")
+FLAG_FIELDS = ("kyc_uploaded", "bank_statement_uploaded", "has_previous_default")
+TEXT_FIELDS = ("full_name", "purpose")
+INT_DTYPE = np.int16
+
+class ColumnRangeError(ValueError):
+    def __init__(self, name: str, rows: List[int], low: int, high: int):
+        shown = ", ".join(str(row) for row in rows[:10]) + (", ..." if len(rows) > 10 else "")
+        super().__init__(f"{name} must be between {low} and {high} for columnar scoring; row(s) {shown} are out of range.")
+        self.name = name
+        self.rows = rows
+
+def _int_column(name: str, values: List[Any], dtype=INT_DTYPE) -> np.ndarray:
+    info = np.iinfo(dtype)
+    try:
+        column = np.array(values, dtype=np.int64)
+    except OverflowError:
+        column = None
+    if column is None or (len(column) and (column.min() < info.min or column.max() > info.max)):
+        rows = [row for row, value in enumerate(values) if not info.min <= value <= info.max]
+        raise ColumnRangeError(name, rows, int(info.min), int(info.max))
+    return column.astype(dtype)
+
+class CategoricalColumn:
+    __slots__ = ("codes", "categories")
+
+    def __init__(self, codes: np.ndarray, categories: Tuple[str, ...]):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def encode(cls, values: Iterable[str], known: Sequence[str] = ()) -> "CategoricalColumn":
+        index = {value: code for code, value in enumerate(known)}
+        codes = [index.setdefault(value, len(index)) for value in values]
+        dtype = np.uint8 if len(index) <= 256 else np.uint16
+        return cls(np.array(codes, dtype=dtype), tuple(index))
+
+    def code_of(self, value: str) -> int:
+        try:
+            return self.categories.index(value)
+        except ValueError:
+            return -1
+
+    def __eq__(self, value):
+        code = self.code_of(value)
+        if code < 0:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == code
+
+    def __ne__(self, value):
+        return ~(self == value)
+
+    __hash__ = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.categories[self.codes[index]]
+        return CategoricalColumn(self.codes[index], self.categories)
+
+    def decode(self) -> np.ndarray:
+        return np.array(self.categories, dtype=object)[self.codes]
+
+    def tolist(self) -> List[str]:
+        categories = self.categories
+        return [categories[code] for code in self.codes.tolist()]
+
+class ApplicationBatch:
+    __slots__ = ("columns", "flags", "text")
+
+    def __init__(
+        self,
+        columns: Dict[str, object],
+        flags: np.ndarray,
+        text: Optional[Dict[str, np.ndarray]] = None
+    ):
+        self.columns = columns
+        self.flags = flags
+        self.text = text
+
+    @classmethod
+    def from_applications(
+        cls,
+        apps: Sequence[ApplicationData],
+        money_dtype=np.float64,
+        include_text: bool = False,
+        int_dtype=INT_DTYPE
+    ) -> "ApplicationBatch":
+        columns: Dict[str, object] = {}
+        for name in MONEY_FIELDS:
+            columns[name] = np.array([getattr(app, name) for app in apps], dtype=money_dtype)
+        for name in INT_FIELDS:
+            columns[name] = _int_column(name, [getattr(app, name) for app in apps], int_dtype)
+        columns["years_in_current_job"] = np.array([app.years_in_current_job for app in apps], dtype=np.float64)
+        for name, known in KNOWN_CATEGORIES.items():
+            columns[name] = CategoricalColumn.encode((getattr(app, name) for app in apps), known)
+
+        flags = np.zeros(len(apps), dtype=np.uint8)
+        for bit, name in enumerate(FLAG_FIELDS):
+            flags |= np.array([getattr(app, name) for app in apps], dtype=np.uint8) << bit
+
+        text = None
+        if include_text:
+            text = {name: np.array([getattr(app, name) for app in apps], dtype=object) for name in TEXT_FIELDS}
+        return cls(columns, flags, text)
+
+    @classmethod
+    def from_columns(cls, cols: Dict[str, Any]) -> "ApplicationBatch":
+        columns: Dict[str, object] = {}
+        for name in MONEY_FIELDS + ("years_in_current_job",):
+            columns[name] = np.asarray(cols[name], dtype=np.float64)
+        for name in INT_FIELDS:
+            columns[name] = _int_column(name, np.asarray(cols[name]))
+        for name, known in KNOWN_CATEGORIES.items():
+            values = cols[name]
+            columns[name] = values if isinstance(values, CategoricalColumn) else CategoricalColumn.encode(np.asarray(values).tolist(), known)
+
+        flags = np.zeros(len(columns["loan_amount"]), dtype=np.uint8)
+        for bit, name in enumerate(FLAG_FIELDS):
+            flags |= np.asarray(cols[name], dtype=np.uint8) << bit
+
+        text = None
+        if all(name in cols for name in TEXT_FIELDS):
+            text = {name: np.asarray(cols[name], dtype=object) for name in TEXT_FIELDS}
+        return cls(columns, flags, text)
+
+    def to_applications(self) -> List[ApplicationData]:
+        names = [f.name for f in fields(ApplicationData)]
+        values = []
+        for name in names:
+            if name in self.columns:
+                values.append(self.columns[name].tolist())
+            elif name in FLAG_FIELDS:
+                values.append(self[name].tolist())
+            elif self.text is not None:
+                values.append(self.text[name].tolist())
+            else:
+                values.append([""] * len(self))
+        return [ApplicationData(**dict(zip(names, row))) for row in zip(*values)]
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key in FLAG_FIELDS:
+                return (self.flags >> FLAG_FIELDS.index(key)) & 1 == 1
+            if key in TEXT_FIELDS and self.text is not None:
+                return self.text[key]
+            return self.columns[key]
+        if isinstance(key, (int, np.integer)):
+            return self[key:key + 1 or None].to_applications()[0]
+        text = None
+        if self.text is not None:
+            text = {name: values[key] for name, values in self.text.items()}
+        return ApplicationBatch(
+            {name: column[key] for name, column in self.columns.items()},
+            self.flags[key],
+            text,
+        )
+
+    def __iter__(self):
+        return iter(self.to_applications())
+
+    @property
+    def nbytes(self) -> int:
+        total = self.flags.nbytes
+        for column in self.columns.values():
+            total += column.codes.nbytes if isinstance(column, CategoricalColumn) else column.nbytes
+        return total
@@ -0,0 +1,3 @@
+from benchmarks.compare import compare_results
+from benchmarks.generator import synthetic_applications, synthetic_batch, synthetic_columns
+from benchmarks.suite import run_benchmarks
@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.compare import compare_results
+from benchmarks.suite import BATCH_SIZES, run_benchmarks
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark suite and write JSON results.")
+    run.add_argument("--size", type=int, default=2000, help="Synthetic applications per benchmark.")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--batch-sizes", default=",".join(map(str, BATCH_SIZES)))
+    run.add_argument("--repeat", type=int, default=3, help="Repeat each timing and keep the best run.")
+    run.add_argument("--output", default="-", help="Output file, or - for stdout.")
+
+    compare = commands.add_parser("compare", help="Fail when a metric regresses against a baseline.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression (0.10 = 10%%).")
+    compare.add_argument(
+        "--metric-threshold",
+        action="append",
+        default=[],
+        metavar="PATTERN=VALUE",
+        help="Override the threshold for metrics matching a glob, e.g. 'agent.*.p99_us=0.3'. Repeatable.",
+    )
+    compare.epilog = "Metrics that carry an absolute budget also fail when they exceed it."
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command == "run":
+        results = run_benchmarks(
+            size=args.size,
+            seed=args.seed,
+            batch_sizes=[int(size) for size in args.batch_sizes.split(",")],
+            repeat=args.repeat,
+        )
+        text = json.dumps(results, indent=2)
+        if args.output == "-":
+            print(text)
+        else:
+            with open(args.output, "w", encoding="utf-8") as sink:
+                sink.write(text + "\n")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as source:
+        baseline = json.load(source)
+    with open(args.current, encoding="utf-8") as source:
+        current = json.load(source)
+    overrides = {}
+    for item in args.metric_threshold:
+        pattern, _, value = item.rpartition("=")
+        overrides[pattern] = float(value)
+    rows = compare_results(baseline, current, args.threshold, overrides)
+    print(f"{'metric':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        marker = "  REGRESSED" if row["regressed"] else ""
+        if row["budget"] is not None:
+            marker += f"  (budget {row['budget']:,.3f})"
+        baseline_value = f"{row['baseline']:>12,.3f}" if row["baseline"] is not None else f"{'-':>12}"
+        print(
+            f"{row['metric']:<36} {baseline_value} {row['current']:>12,.3f} "
+            f"{row['change']:>+7.1%}{marker}"
+        )
+    regressions = sum(row["regressed"] for row in rows)
+    if regressions:
+        print(f"{regressions} metric(s) regressed beyond their threshold.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+from fnmatch import fnmatch
+from typing import Any, Dict, List, Optional
+
+def metric_threshold(name: str, threshold: float, overrides: Optional[Dict[str, float]] = None) -> float:
+    for pattern, value in (overrides or {}).items():
+        if fnmatch(name, pattern):
+            return value
+    return threshold
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.10,
+    overrides: Optional[Dict[str, float]] = None
+) -> List[Dict[str, Any]]:
+    rows = []
+    for name, metric in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        budget = metric.get("budget")
+        if base is None and budget is None:
+            continue
+        after = metric["value"]
+        before = base["value"] if base is not None else None
+        change = (after - before) / before if before else 0.0
+        allowed = metric_threshold(name, threshold, overrides)
+        worse = False
+        if base is not None:
+            worse = change > allowed if base["better"] == "lower" else change < -allowed
+        if budget is not None and after > budget:
+            worse = True
+        rows.append({
+            "metric": name,
+            "baseline": before,
+            "current": after,
+            "unit": metric["unit"],
+            "change": change,
+            "threshold": allowed,
+            "budget": budget,
+            "regressed": worse,
+        })
+    return rows
@@ -0,0 +1,62 @@
+from typing import Dict, List
+
+import numpy as np
+
+from application_batch import ApplicationBatch
+from orchestrator import ApplicationData
+
+EMPLOYMENT_MIX = (("Salaried", 0.62), ("Self-employed", 0.24), ("Student", 0.04), ("Retired", 0.05), ("Other", 0.05))
+RESIDENCE_MIX = (("Owned", 0.38), ("Rented", 0.45), ("Company Provided", 0.07), ("Other", 0.10))
+CITY_MIX = (("Tier 1", 0.45), ("Tier 2", 0.35), ("Tier 3/Other", 0.20))
+TENURE_MIX = ((12, 0.08), (24, 0.15), (36, 0.22), (48, 0.15), (60, 0.20), (84, 0.10), (120, 0.10))
+PURPOSES = ("Home renovation", "Education", "Medical", "Wedding", "Debt consolidation", "Vehicle", "Business")
+LOW_INCOME_EMPLOYMENT = ("Student", "Retired")
+
+def _choice(rng: np.random.Generator, mix, count: int) -> np.ndarray:
+    values, weights = zip(*mix)
+    return rng.choice(np.array(values), size=count, p=np.array(weights) / sum(weights))
+
+def synthetic_columns(count: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    employment = _choice(rng, EMPLOYMENT_MIX, count)
+    low_income = np.isin(employment, LOW_INCOME_EMPLOYMENT)
+
+    income = rng.lognormal(np.log(55000), 0.6, count) * np.where(low_income, 0.4, 1.0)
+    income = np.round(income, -2)
+    existing_emi = np.where(rng.random(count) < 0.35, 0.0, income * rng.beta(1.5, 6.0, count))
+    tenure = _choice(rng, TENURE_MIX, count).astype(np.int64)
+    emi_share = rng.lognormal(np.log(0.22), 0.5, count)
+    monthly_rate = 0.14 / 12
+    loan_amount = np.round(income * emi_share * (1 - (1 + monthly_rate) ** -tenure) / monthly_rate, -3)
+    credit_score = np.where(
+        rng.random(count) < 0.45,
+        0,
+        np.clip(rng.normal(720, 60, count), 300, 900).astype(np.int64),
+    )
+    years = np.round(rng.exponential(4.0, count) * 2) / 2
+    years = np.where(employment == "Student", 0.0, years)
+
+    return {
+        "full_name": np.array([f"Applicant {i}" for i in range(count)], dtype=object),
+        "age": np.clip(np.round(rng.normal(36, 9, count)), 18, 75).astype(np.int64),
+        "employment_type": employment,
+        "monthly_income": income,
+        "existing_emi": np.round(existing_emi, -2),
+        "loan_amount": loan_amount,
+        "loan_tenure_months": tenure,
+        "credit_score": credit_score,
+        "purpose": _choice(rng, [(purpose, 1.0) for purpose in PURPOSES], count),
+        "kyc_uploaded": rng.random(count) < 0.95,
+        "bank_statement_uploaded": rng.random(count) < 0.90,
+        "residence_type": _choice(rng, RESIDENCE_MIX, count),
+        "city_tier": _choice(rng, CITY_MIX, count),
+        "years_in_current_job": years,
+        "has_previous_default": rng.random(count) < 0.08,
+    }
+
+def synthetic_applications(count: int, seed: int = 0) -> List[ApplicationData]:
+    columns = {name: values.tolist() for name, values in synthetic_columns(count, seed).items()}
+    return [ApplicationData(**dict(zip(columns, row))) for row in zip(*columns.values())]
+
+def synthetic_batch(count: int, seed: int = 0) -> ApplicationBatch:
+    return ApplicationBatch.from_applications(synthetic_applications(count, seed))
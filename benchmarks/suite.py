@@ -0,0 +1,294 @@
+import gc
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from benchmarks.generator import synthetic_applications
+from orchestrator import EXPLAIN_LEVELS, Orchestrator, default_orchestrator
+
+BATCH_SIZES = (1, 16, 256, 4096)
+RULE_COUNTS = (0, 100, 300)
+SAMPLE_APPLICATION = {
+    "age": 32,
+    "employment_type": "Salaried",
+    "monthly_income": 85000,
+    "existing_emi": 5000,
+    "loan_amount": 600000,
+    "loan_tenure_months": 36,
+    "credit_score": 742,
+    "kyc_uploaded": True,
+    "bank_statement_uploaded": True,
+    "residence_type": "Owned",
+    "city_tier": "Tier 1",
+    "years_in_current_job": 4,
+}
+IMPORT_TARGETS = {
+    "orchestrator": "import orchestrator",
+    "pipeline": "import orchestrator; orchestrator.default_orchestrator()",
+    "batch": "import orchestrator, application_batch",
+    "headless": "import headless",
+    "first_decision": f"import headless; headless.score({SAMPLE_APPLICATION!r}, 'none')",
+}
+IMPORT_BUDGETS_MS = {"first_decision": 100.0}
+VALIDATION_BUDGET = 0.10
+SHADOW_BUDGETS = {50: 1.10, 99: 1.20}
+UNEXPECTED_MODULES = ("numpy", "streamlit", "pydantic", "concurrent.futures")
+
+def _metric(value: float, unit: str, better: str = "lower", budget: Optional[float] = None) -> Dict[str, Any]:
+    metric = {"value": round(float(value), 3), "unit": unit, "better": better}
+    if budget is not None:
+        metric["budget"] = budget
+    return metric
+
+def _latency_metrics(prefix: str, samples_ns: Sequence[int]) -> Dict[str, Dict[str, Any]]:
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000.0
+    return {
+        f"{prefix}.mean_us": _metric(samples.mean(), "us"),
+        f"{prefix}.p50_us": _metric(np.percentile(samples, 50), "us"),
+        f"{prefix}.p99_us": _metric(np.percentile(samples, 99), "us"),
+    }
+
+def _time_calls(call: Callable[[Any], Any], items: Sequence[Any], repeat: int) -> List[int]:
+    clock = time.perf_counter_ns
+    for item in items:
+        call(item)
+    best: Optional[List[int]] = None
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            samples = []
+            for item in items:
+                started = clock()
+                call(item)
+                samples.append(clock() - started)
+            if best is None or sum(samples) < sum(best):
+                best = samples
+    finally:
+        gc.enable()
+    return best or []
+
+def agent_latency(orchestrator: Orchestrator, apps: Sequence[Any], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    outputs = [orchestrator.run_stages(app) for app in apps]
+    metrics = {}
+    for stage in orchestrator.graph.order:
+        pairs = list(zip(apps, outputs))
+        samples = _time_calls(lambda pair, stage=stage: stage.run(pair[0], pair[1]), pairs, repeat)
+        metrics.update(_latency_metrics(f"agent.{stage.name}", samples))
+    return metrics
+
+def pipeline_latency(orchestrator: Orchestrator, apps: Sequence[Any], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    samples = _time_calls(orchestrator.run_full_pipeline, apps, repeat)
+    metrics = _latency_metrics("pipeline.scalar", samples)
+    metrics["pipeline.scalar.rows_per_sec"] = _metric(len(samples) / (sum(samples) / 1e9), "rows/s", "higher")
+    return metrics
+
+def batch_throughput(
+    orchestrator: Orchestrator,
+    apps: Sequence[Any],
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    repeat: int = 3
+) -> Dict[str, Dict[str, Any]]:
+    from application_batch import ApplicationBatch
+
+    batch = ApplicationBatch.from_applications(apps)
+    metrics = {}
+    for size in batch_sizes:
+        chunks = [batch[start:start + size] for start in range(0, len(batch), size)]
+        orchestrator.run_batch(chunks[0])
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for chunk in chunks:
+                orchestrator.run_batch(chunk)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        metrics[f"batch.{size}.rows_per_sec"] = _metric(len(batch) / best, "rows/s", "higher")
+    return metrics
+
+def peak_memory(orchestrator: Orchestrator, apps: Sequence[Any]) -> Dict[str, Dict[str, Any]]:
+    from application_batch import ApplicationBatch
+
+    metrics = {}
+    runs = {
+        "scalar": lambda: [orchestrator.run_full_pipeline(app) for app in apps],
+        "batch": lambda: orchestrator.run_batch(ApplicationBatch.from_applications(apps)),
+    }
+    for name, run in runs.items():
+        gc.collect()
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metrics[f"memory.{name}_peak_mb"] = _metric(peak / 2 ** 20, "MB")
+    return metrics
+
+def explain_levels(orchestrator: Orchestrator, apps: Sequence[Any], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    metrics = {}
+    level = orchestrator.explain_level
+    try:
+        for name in EXPLAIN_LEVELS:
+            orchestrator.explain_level = name
+            samples = _time_calls(orchestrator.run_full_pipeline, apps, repeat)
+            metrics[f"explain.{name}.mean_us"] = _metric(np.mean(samples) / 1000.0, "us")
+            gc.collect()
+            tracemalloc.start()
+            responses = [orchestrator.run_full_pipeline(app) for app in apps]
+            retained, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del responses
+            metrics[f"explain.{name}.bytes_per_app"] = _metric(retained / max(len(apps), 1), "B")
+    finally:
+        orchestrator.explain_level = level
+    return metrics
+
+def validation_cost(orchestrator: Orchestrator, apps: Sequence[Any], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    from application_batch import ApplicationBatch
+    from validation import validate_application, validate_batch
+
+    samples = _time_calls(validate_application, apps, repeat)
+    metrics = {"validation.row.mean_us": _metric(np.mean(samples) / 1000.0, "us")}
+    batch = ApplicationBatch.from_applications(apps)
+    timings = {}
+    for name, run in (("validate", validate_batch), ("score", orchestrator.run_batch)):
+        run(batch)
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run(batch)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+    metrics["validation.batch.rows_per_sec"] = _metric(len(batch) / timings["validate"], "rows/s", "higher")
+    metrics["validation.batch.share_of_scoring"] = _metric(
+        timings["validate"] / timings["score"], "ratio", budget=VALIDATION_BUDGET
+    )
+    return metrics
+
+def shadow_overhead(orchestrator: Orchestrator, apps: Sequence[Any], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    from shadow import ShadowScorer
+
+    challenger = default_orchestrator(orchestrator.explain_level)
+    challenger.affordability_agent.salaried_max_foir -= 0.02
+    before = _time_calls(orchestrator.run_full_pipeline, apps, repeat)
+    shadow = ShadowScorer(challenger)
+    orchestrator.set_shadow(shadow)
+    try:
+        samples = _time_calls(orchestrator.run_full_pipeline, apps, repeat)
+        started = time.perf_counter()
+        shadow.flush()
+        drain = time.perf_counter() - started
+        stats = shadow.stats()
+    finally:
+        orchestrator.set_shadow(None)
+        shadow.close()
+    after = _time_calls(orchestrator.run_full_pipeline, apps, repeat)
+    baseline = before + after
+    offered = shadow.submitted + stats["dropped"]
+
+    metrics = _latency_metrics("shadow.scalar", samples)
+    for percentile in SHADOW_BUDGETS:
+        metrics[f"shadow.scalar.p{percentile}_ratio"] = _metric(
+            np.percentile(samples, percentile) / np.percentile(baseline, percentile),
+            "ratio",
+            budget=SHADOW_BUDGETS[percentile],
+        )
+    metrics["shadow.scalar.compared_share"] = _metric(stats["compared"] / offered if offered else 1.0, "ratio", "higher")
+    metrics["shadow.scalar.drain_ms"] = _metric(drain * 1000, "ms")
+    return metrics
+
+def compliance_rule_scaling(
+    orchestrator: Orchestrator,
+    apps: Sequence[Any],
+    rule_counts: Sequence[int] = RULE_COUNTS,
+    repeat: int = 3
+) -> Dict[str, Dict[str, Any]]:
+    from agents.compliance import ComplianceAgent
+    from agents.compliance_rules import COMPLIANCE_RULES, ComplianceRule
+    from application_batch import ApplicationBatch
+
+    batch = ApplicationBatch.from_applications(apps)
+    result = orchestrator.run_batch(batch)
+    doc_res, credit_res, risk_res, afford_res, _ = result["agent_data"]
+    metrics = {}
+    for count in rule_counts:
+        extra = tuple(
+            ComplianceRule(
+                f"extra_{i}",
+                (("credit_score", "<", 600 + i % 200),),
+                "review",
+                f"Extra rule {i}.",
+                precedence=100 + i,
+                unless=("age_below_minimum", "high_risk") if i % 2 else (),
+            )
+            for i in range(count)
+        )
+        agent = ComplianceAgent(COMPLIANCE_RULES + extra)
+        run = lambda: agent.check_batch(batch, credit_res, risk_res, doc_res, afford_res)
+        run()
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        metrics[f"compliance.rules_{count}.batch_ms"] = _metric(best * 1000, "ms")
+    return metrics
+
+def import_time(repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    metrics = {}
+    for name, statement in IMPORT_TARGETS.items():
+        code = (
+            "import time; started = time.perf_counter(); "
+            f"{statement}; "
+            "print(time.perf_counter() - started)"
+        )
+        seconds = min(
+            float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+            for _ in range(repeat)
+        )
+        metrics[f"import.{name}_ms"] = _metric(seconds * 1000, "ms", budget=IMPORT_BUDGETS_MS.get(name))
+
+    code = (
+        f"import sys; {IMPORT_TARGETS['first_decision']}; "
+        f"print(sum(name in sys.modules for name in {UNEXPECTED_MODULES!r}))"
+    )
+    loaded = int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+    metrics["import.headless_heavy_modules"] = _metric(loaded, "modules", budget=0)
+    return metrics
+
+def run_benchmarks(
+    size: int = 2000,
+    seed: int = 0,
+    batch_sizes: Sequence[int] = BATCH_SIZES,
+    repeat: int = 3,
+    orchestrator: Optional[Orchestrator] = None
+) -> Dict[str, Any]:
+    orchestrator = orchestrator or default_orchestrator()
+    apps = synthetic_applications(size, seed)
+    metrics = {}
+    metrics.update(agent_latency(orchestrator, apps, repeat))
+    metrics.update(pipeline_latency(orchestrator, apps, repeat))
+    metrics.update(batch_throughput(orchestrator, apps, batch_sizes, repeat))
+    metrics.update(peak_memory(orchestrator, apps))
+    metrics.update(explain_levels(orchestrator, apps, repeat))
+    metrics.update(validation_cost(orchestrator, apps, repeat))
+    metrics.update(shadow_overhead(orchestrator, apps, repeat))
+    metrics.update(compliance_rule_scaling(orchestrator, apps, repeat=repeat))
+    metrics.update(import_time())
+    return {
+        "meta": {
+            "size": size,
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "metrics": metrics,
+    }
@@ -0,0 +1,237 @@
+import copy
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from agents.compliance_rules import SEVERITIES
+from application_batch import ApplicationBatch
+from orchestrator import Orchestrator, default_orchestrator
+from pipeline_result import Decision
+
+FOIR_FIELDS = ("salaried_max_foir", "self_employed_max_foir", "max_foir_cap")
+APPROVED = ("approve", "approve_with_caution")
+
+@dataclass
+class CutoffCurve:
+    name: str
+    current: float
+    grid: np.ndarray
+    counts: np.ndarray
+    side: str = "right"
+    on_grid: bool = False
+
+    def _index(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if self.on_grid:
+            nearest = np.clip(np.searchsorted(self.grid, values), 1, len(self.grid) - 1)
+            nearest -= values - self.grid[nearest - 1] < self.grid[nearest] - values
+            off = ~np.isclose(self.grid[nearest], values, rtol=0.0, atol=1e-9)
+            if off.any():
+                value = float(values.reshape(-1)[np.flatnonzero(off)[0]])
+                raise ValueError(
+                    f"Cutoff '{self.name}' is only counted on its grid "
+                    f"({self.grid[0]:g} to {self.grid[-1]:g} step {self.grid[1] - self.grid[0]:g}), got {value}."
+                )
+            values = self.grid[nearest]
+        return np.searchsorted(self.grid, values, self.side)
+
+    def decision_counts(self, value: float) -> Dict[str, int]:
+        return dict(zip(SEVERITIES, self.counts[self._index(value)].tolist()))
+
+    def sweep(self, values) -> np.ndarray:
+        return self.counts[self._index(values)]
+
+    def approval_rates(self, values) -> np.ndarray:
+        counts = self.sweep(values)
+        approved = counts[:, [SEVERITIES.index(name) for name in APPROVED]].sum(axis=1)
+        return approved / max(int(self.counts[0].sum()), 1)
+
+class _Accumulator:
+    def __init__(self, name: str, current: float, grid: np.ndarray, side: str, on_grid: bool = False):
+        self.name = name
+        self.current = current
+        self.grid = grid
+        self.side = side
+        self.on_grid = on_grid
+        self.start = np.zeros(len(SEVERITIES), dtype=np.int64)
+        self.delta = np.zeros((len(grid) + 1) * len(SEVERITIES), dtype=np.int64)
+
+    def begin(self, codes: np.ndarray) -> None:
+        self.start += np.bincount(codes, minlength=len(SEVERITIES))
+
+    def switch(self, points: np.ndarray, before: np.ndarray, after: np.ndarray) -> None:
+        changed = before != after
+        bins = np.searchsorted(self.grid, points[changed], "left") * len(SEVERITIES)
+        size = len(self.delta)
+        self.delta += np.bincount(bins + after[changed], minlength=size)
+        self.delta -= np.bincount(bins + before[changed], minlength=size)
+
+    def curve(self) -> CutoffCurve:
+        steps = self.delta.reshape(-1, len(SEVERITIES))[:-1].cumsum(axis=0)
+        counts = np.vstack([self.start, self.start + steps])
+        return CutoffCurve(self.name, self.current, self.grid, counts, self.side, self.on_grid)
+
+def _variant(agent, **changes):
+    variant = copy.copy(agent)
+    for name, value in changes.items():
+        setattr(variant, name, value)
+    return variant
+
+def _replaced(values: Tuple[Any, ...], index: int, value: Any) -> Tuple[Any, ...]:
+    return values[:index] + (value,) + values[index + 1:]
+
+class CutoffAnalysis:
+    def __init__(self, curves: Dict[str, CutoffCurve], baseline: Dict[str, int]):
+        self.curves = curves
+        self.baseline = baseline
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.curves)
+
+    def decision_counts(self, name: str, value: float) -> Dict[str, int]:
+        return self.curves[name].decision_counts(value)
+
+    def sweep(self, name: str, values) -> np.ndarray:
+        return self.curves[name].sweep(values)
+
+    @classmethod
+    def from_population(
+        cls,
+        population: ApplicationBatch,
+        orchestrator: Optional[Orchestrator] = None,
+        chunk_size: int = 100000,
+        foir_step: float = 0.001
+    ) -> "CutoffAnalysis":
+        chunks = (population[start:start + chunk_size] for start in range(0, len(population), chunk_size))
+        return cls.build(chunks, orchestrator, foir_step)
+
+    @classmethod
+    def build(
+        cls,
+        chunks: Iterable[ApplicationBatch],
+        orchestrator: Optional[Orchestrator] = None,
+        foir_step: float = 0.001
+    ) -> "CutoffAnalysis":
+        orchestrator = orchestrator or default_orchestrator()
+        credit = orchestrator.credit_agent
+        risk = orchestrator.risk_agent
+        affordability = orchestrator.affordability_agent
+        compliance = orchestrator.compliance_agent
+
+        score_grid = np.arange(credit.min_score, credit.max_score + 2, dtype=np.float64)
+        risk_grid = np.unique(np.asarray(risk.build_tables().scores, dtype=np.float64))
+        foir_grid = np.round(np.arange(0.0, 1.0 + foir_step / 2, foir_step), 9)
+        low_score, high_score = credit.min_score - 1, credit.max_score + 2
+        low_risk, high_risk = float(risk_grid[0]) - 1.0, float(risk_grid[-1]) + 1.0
+
+        compliance_sliders = []
+        for index, rule in enumerate(compliance.rules):
+            for position, (fact, op, value) in enumerate(rule.when):
+                if fact != "credit_score" or not isinstance(value, (int, float)):
+                    continue
+                variants = []
+                for bound in (low_score, high_score):
+                    when = _replaced(rule.when, position, (fact, op, bound))
+                    variants.append(_variant(compliance, rules=_replaced(compliance.rules, index, replace(rule, when=when))))
+                side = "left" if op in ("<", ">=") else "right"
+                accumulator = _Accumulator(f"compliance.{rule.name}", float(value), score_grid, side)
+                compliance_sliders.append((accumulator, variants))
+
+        band_sliders = []
+        for i, cutoff in enumerate(credit.band_cutoffs):
+            variants = [_variant(credit, band_cutoffs=_replaced(credit.band_cutoffs, i, bound)) for bound in (low_score, high_score)]
+            band_sliders.append((_Accumulator(f"credit.band_cutoffs.{i}", float(cutoff), score_grid, "left"), variants))
+
+        risk_sliders = []
+        for i, cutoff in enumerate(risk.level_cutoffs):
+            variants = [_variant(risk, level_cutoffs=_replaced(risk.level_cutoffs, i, bound)) for bound in (low_risk, high_risk)]
+            risk_sliders.append((_Accumulator(f"risk.level_cutoffs.{i}", float(cutoff), risk_grid, "right"), variants))
+
+        foir_sliders = [
+            _Accumulator(f"affordability.{name}", float(getattr(affordability, name)), foir_grid, "right", on_grid=True)
+            for name in FOIR_FIELDS
+        ]
+        baseline = np.zeros(len(SEVERITIES), dtype=np.int64)
+
+        for cols in chunks:
+            doc_res = orchestrator.document_agent.verify_batch(cols)
+            credit_res = credit.evaluate_batch(cols)
+            risk_res = risk.assess_batch(cols, credit_res)
+            afford_res = affordability.evaluate_batch(cols)
+
+            def decide(agent=compliance, credit_data=credit_res, risk_data=risk_res, afford_data=afford_res):
+                result = agent.check_batch(cols, credit_data, risk_data, doc_res, afford_data)
+                return Decision.encode(result["final_decision"])
+
+            baseline += np.bincount(decide(), minlength=len(SEVERITIES))
+            score = np.asarray(credit_res["credit_score"], dtype=np.float64)
+
+            for accumulator, (before, after) in compliance_sliders:
+                start = decide(before)
+                accumulator.begin(start)
+                accumulator.switch(score, start, decide(after))
+
+            for accumulator, variants in band_sliders:
+                start, end = (decide(risk_data=risk.assess_batch(cols, variant.evaluate_batch(cols))) for variant in variants)
+                accumulator.begin(start)
+                accumulator.switch(score, start, end)
+
+            risk_score = np.asarray(risk_res["risk_score"], dtype=np.float64)
+            for accumulator, variants in risk_sliders:
+                start, end = (decide(risk_data=variant.assess_batch(cols, credit_res)) for variant in variants)
+                accumulator.begin(start)
+                accumulator.switch(risk_score, start, end)
+
+            if foir_sliders:
+                cls._add_foir(foir_sliders, affordability, cols, afford_res, decide)
+
+        curves = {}
+        for accumulator in (
+            [slider for slider, _ in compliance_sliders]
+            + [slider for slider, _ in band_sliders]
+            + [slider for slider, _ in risk_sliders]
+            + foir_sliders
+        ):
+            curves[accumulator.name] = accumulator.curve()
+        return cls(curves, dict(zip(SEVERITIES, baseline.tolist())))
+
+    @staticmethod
+    def _add_foir(sliders: List[_Accumulator], agent, cols, afford_res: Dict[str, Any], decide) -> None:
+        income = np.asarray(cols["monthly_income"], dtype=np.float64)
+        existing_emi = np.asarray(cols["existing_emi"], dtype=np.float64)
+        requested_emi = np.asarray(afford_res["requested_emi"], dtype=np.float64)
+        positive = income > 0
+        comfortable = np.divide(requested_emi + existing_emi, income, out=np.full_like(income, np.inf), where=positive)
+        stretched = np.divide(requested_emi / 1.2 + existing_emi, income, out=np.full_like(income, np.inf), where=positive)
+
+        flags = {}
+        for flag in ("Not affordable", "Stretched", "Comfortable"):
+            forced = dict(afford_res, affordability_flag=np.full(len(income), flag))
+            flags[flag] = decide(afford_data=forced)
+
+        self_employed = np.asarray(cols["employment_type"] == "Self-employed", dtype=bool)
+        reduction = np.where(np.asarray(cols["residence_type"] == "Rented", dtype=bool), agent.rented_foir_reduction, 0.0)
+        base = np.where(self_employed, agent.self_employed_max_foir, agent.salaried_max_foir) - reduction
+        floor, cap = agent.min_foir, agent.max_foir_cap
+        current = decide()
+
+        for slider in sliders:
+            field = slider.name.split(".", 1)[1]
+            if field == "max_foir_cap":
+                uncapped = np.maximum(floor, base)
+                affected = np.ones(len(income), dtype=bool)
+
+                def point(needed):
+                    return np.where(uncapped >= needed, needed, np.inf)
+            else:
+                affected = self_employed if field == "self_employed_max_foir" else ~self_employed
+
+                def point(needed):
+                    return np.where(needed <= floor, -np.inf, np.where(needed > cap, np.inf, needed + reduction))
+
+            slider.begin(np.where(affected, flags["Not affordable"], current))
+            never = np.full(len(income), np.inf)
+            slider.switch(np.where(affected, point(stretched), never), flags["Not affordable"], flags["Stretched"])
+            slider.switch(np.where(affected, point(comfortable), never), flags["Stretched"], flags["Comfortable"])
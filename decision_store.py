@@ -0,0 +1,355 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from pipeline_result import (
+    BATCH_STAGES,
+    STAGE_RECORDS,
+    Decision,
+    OfferResult,
+    PipelineResult,
+    PipelineResultBatch,
+)
+
+FORMAT_VERSION = 1
+KEY_BYTES = 32
+KEY_DTYPE = np.dtype(f"S{KEY_BYTES}")
+SEGMENT_BYTES = 64 << 20
+FLUSH_ROWS = 8192
+META_FILE = "store.json"
+COMPACT_DIR = "compact"
+COMMIT_FILE = "commit.json"
+
+STAGE_COLUMNS = (
+    ("document", (
+        ("kyc_uploaded", "?"),
+        ("bank_statement_uploaded", "?"),
+        ("document_quality_score", "<f8"),
+        ("missing_documents_mask", "u1"),
+    )),
+    ("credit", (
+        ("credit_score", "<i4"),
+        ("credit_decision", "i1"),
+        ("credit_band", "i1"),
+    )),
+    ("risk", (
+        ("risk_score", "<f8"),
+        ("risk_level", "i1"),
+        ("risk_flag_mask", "u1"),
+    )),
+    ("affordability", (
+        ("max_foir", "<f8"),
+        ("current_foir", "<f8"),
+        ("max_allowed_emi", "<f8"),
+        ("max_eligible_loan", "<f8"),
+        ("requested_emi", "<f8"),
+        ("affordability_flag", "i1"),
+    )),
+    ("compliance", (
+        ("compliance_reasons_mask", "<u8"),
+        ("knockout", "?"),
+    )),
+    ("offer", (
+        ("suggested_interest_rate_percent", "<f8"),
+        ("recommended_loan_amount", "<f8"),
+        ("recommended_emi", "<f8"),
+        ("max_eligible_loan_amount", "<f8"),
+        ("max_affordable_emi", "<f8"),
+        ("within_affordability_limits", "?"),
+    )),
+)
+RECORD_DTYPE = np.dtype(
+    [
+        ("key", KEY_DTYPE),
+        ("timestamp", "<f8"),
+        ("policy", KEY_DTYPE),
+        ("final_decision", "i1"),
+        ("short_circuit", "?"),
+        ("skipped_mask", "u1"),
+        ("has_offer", "?"),
+    ]
+    + [column for _, columns in STAGE_COLUMNS for column in columns]
+)
+STAGE_BITS = {name: 1 << bit for bit, name in enumerate(BATCH_STAGES)}
+RECORDS = dict(STAGE_RECORDS, offer=OfferResult)
+STAGE_GETTERS = tuple(
+    (attrgetter(stage), attrgetter(*(name for name, _ in columns)), (0,) * len(columns))
+    for stage, columns in STAGE_COLUMNS
+)
+
+def encode_key(key: Any) -> bytes:
+    raw = str(key).encode("utf-8")
+    if len(raw) > KEY_BYTES:
+        raw = hashlib.blake2b(raw, digest_size=KEY_BYTES // 2).hexdigest().encode("ascii")
+    return raw
+
+def encode_keys(keys: Sequence[Any]) -> np.ndarray:
+    keys = list(map(str, keys))
+    if not keys or max(map(len, keys)) <= KEY_BYTES:
+        try:
+            return np.array(keys, dtype=KEY_DTYPE)
+        except UnicodeEncodeError:
+            pass
+    return np.array([encode_key(key) for key in keys], dtype=KEY_DTYPE)
+
+def _row(result: PipelineResult, key: bytes, timestamp: float, policy: bytes) -> tuple:
+    skipped = result.skipped
+    skipped_mask = 0
+    for name in skipped or ():
+        skipped_mask |= STAGE_BITS[name]
+    values = (key, timestamp, policy, result.final_decision, skipped is not None, skipped_mask, result.offer is not None)
+    for stage, columns, empty in STAGE_GETTERS:
+        record = stage(result)
+        values += columns(record) if record is not None else empty
+    return values
+
+def to_result(row) -> PipelineResult:
+    skipped_mask = int(row["skipped_mask"])
+    final_decision = Decision(row["final_decision"])
+    records: Dict[str, Any] = {}
+    for stage, columns in STAGE_COLUMNS:
+        if skipped_mask & STAGE_BITS[stage] or (stage == "offer" and not row["has_offer"]):
+            continue
+        record = RECORDS[stage]
+        values = {}
+        for name, _ in columns:
+            value = row[name].item()
+            values[name] = record.ENUMS[name](value) if name in record.ENUMS else value
+        if stage == "compliance":
+            values["final_decision"] = final_decision
+        elif stage == "offer":
+            values["decision_from_compliance"] = final_decision
+        records[stage] = record(**values)
+    skipped = None
+    if row["short_circuit"]:
+        skipped = tuple(name for name in BATCH_STAGES if skipped_mask & STAGE_BITS[name])
+    return PipelineResult(final_decision=final_decision, skipped=skipped, **records)
+
+class DecisionStore:
+    def __init__(
+        self,
+        path: str,
+        segment_bytes: int = SEGMENT_BYTES,
+        flush_rows: int = FLUSH_ROWS,
+        policy: str = ""
+    ):
+        self.path = path
+        self.segment_rows = max(1, segment_bytes // RECORD_DTYPE.itemsize)
+        self.flush_rows = flush_rows
+        self.policy = policy.encode("ascii")
+        self._pending: List[tuple] = []
+        self._blocks: List[np.ndarray] = []
+        self._pending_rows = 0
+        self._maps: Dict[int, np.ndarray] = {}
+        os.makedirs(path, exist_ok=True)
+        self._check_meta()
+        self._load()
+
+    def _check_meta(self) -> None:
+        meta_path = os.path.join(self.path, META_FILE)
+        meta = json.loads(json.dumps({"version": FORMAT_VERSION, "dtype": RECORD_DTYPE.descr}))
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as source:
+                if json.load(source) != meta:
+                    raise ValueError(f"Decision store at {self.path} uses an incompatible record layout.")
+        else:
+            with open(meta_path, "w", encoding="utf-8") as sink:
+                json.dump(meta, sink)
+
+    def _segment_path(self, number: int, directory: Optional[str] = None) -> str:
+        return os.path.join(directory or self.path, f"segment-{number:06d}.bin")
+
+    def _finish_compaction(self) -> None:
+        staged = os.path.join(self.path, COMPACT_DIR)
+        if os.path.isdir(staged + ".tmp"):
+            shutil.rmtree(staged + ".tmp")
+        if not os.path.isdir(staged):
+            return
+        with open(os.path.join(staged, COMMIT_FILE), encoding="utf-8") as source:
+            first = json.load(source)["first_segment"]
+        for name in os.listdir(self.path):
+            if name.startswith("segment-") and name.endswith(".bin") and int(name[8:14]) < first:
+                os.remove(os.path.join(self.path, name))
+        for name in os.listdir(staged):
+            if name.endswith(".bin"):
+                os.replace(os.path.join(staged, name), os.path.join(self.path, name))
+        shutil.rmtree(staged)
+
+    def _load(self) -> None:
+        self._finish_compaction()
+        self.segments = sorted(
+            int(name[8:14]) for name in os.listdir(self.path) if name.startswith("segment-") and name.endswith(".bin")
+        )
+        self.sizes = []
+        for number in self.segments:
+            path = self._segment_path(number)
+            size, torn = divmod(os.path.getsize(path), RECORD_DTYPE.itemsize)
+            if torn:
+                with open(path, "r+b") as segment:
+                    segment.truncate(size * RECORD_DTYPE.itemsize)
+            self.sizes.append(size)
+        self.starts = [end - size for end, size in zip(accumulate(self.sizes), self.sizes)]
+        self._maps = {}
+        self._index: Dict[bytes, int] = {}
+        self._indexed = 0
+
+    def __len__(self) -> int:
+        return sum(self.sizes) + self._pending_rows
+
+    def __enter__(self) -> "DecisionStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def append(self, result: PipelineResult, key: Any, timestamp: Optional[float] = None) -> None:
+        self._pending.append(_row(result, encode_key(key), time.time() if timestamp is None else timestamp, self.policy))
+        self._pending_rows += 1
+        if self._pending_rows >= self.flush_rows:
+            self.flush()
+
+    def append_batch(self, batch: PipelineResultBatch, keys: Sequence[Any], timestamp: Optional[float] = None) -> None:
+        rows = np.zeros(len(batch), dtype=RECORD_DTYPE)
+        rows["key"] = encode_keys(keys)
+        rows["timestamp"] = time.time() if timestamp is None else timestamp
+        rows["policy"] = self.policy
+        rows["final_decision"] = batch.final_decision
+        rows["has_offer"] = batch.has_offer
+        for stage, columns in STAGE_COLUMNS:
+            data = batch.columns[stage]
+            for name, _ in columns:
+                if name in data:
+                    rows[name] = data[name]
+        reasons = batch.columns["compliance"]["compliance_reasons_mask"]
+        if reasons.ndim == 2:
+            if reasons[:, 1:].any():
+                raise ValueError("The decision store keeps at most 64 compliance reason bits per record.")
+            rows["compliance_reasons_mask"] = reasons[:, 0]
+
+        self._stage_pending()
+        self._blocks.append(rows)
+        self._pending_rows += len(rows)
+        if self._pending_rows >= self.flush_rows:
+            self.flush()
+
+    def _stage_pending(self) -> None:
+        if self._pending:
+            self._blocks.append(np.array(self._pending, dtype=RECORD_DTYPE))
+            self._pending = []
+
+    def flush(self) -> None:
+        self._stage_pending()
+        if not self._blocks:
+            return
+        rows = self._blocks[0] if len(self._blocks) == 1 else np.concatenate(self._blocks)
+        self._blocks = []
+        self._pending_rows = 0
+        self._write(rows)
+
+    def _write(self, rows: np.ndarray, directory: Optional[str] = None) -> None:
+        written = 0
+        while written < len(rows):
+            if not self.segments or self.sizes[-1] >= self.segment_rows:
+                self.segments.append(self.segments[-1] + 1 if self.segments else 1)
+                self.starts.append(self.starts[-1] + self.sizes[-1] if self.sizes else 0)
+                self.sizes.append(0)
+            take = min(len(rows) - written, self.segment_rows - self.sizes[-1])
+            chunk = rows[written:written + take]
+            with open(self._segment_path(self.segments[-1], directory), "ab") as segment:
+                chunk.tofile(segment)
+            self.sizes[-1] += take
+            self._maps.pop(len(self.segments) - 1, None)
+            written += take
+
+    @property
+    def index(self) -> Dict[bytes, int]:
+        self.flush()
+        total = sum(self.sizes)
+        if self._indexed < total:
+            first = bisect_right(self.starts, self._indexed) - 1
+            for i in range(first, len(self.segments)):
+                start = max(self._indexed, self.starts[i])
+                keys = self.segment(i)["key"][start - self.starts[i]:].tolist()
+                self._index.update(zip(keys, range(start, start + len(keys))))
+            self._indexed = total
+        return self._index
+
+    def segment(self, i: int) -> np.ndarray:
+        mapped = self._maps.get(i)
+        if mapped is None:
+            if self.sizes[i]:
+                mapped = np.memmap(self._segment_path(self.segments[i]), RECORD_DTYPE, mode="r", shape=(self.sizes[i],))
+            else:
+                mapped = np.zeros(0, dtype=RECORD_DTYPE)
+            self._maps[i] = mapped
+        return mapped
+
+    def scan(self) -> Iterator[np.ndarray]:
+        self.flush()
+        for i in range(len(self.segments)):
+            yield self.segment(i)
+
+    def row(self, position: int):
+        i = bisect_right(self.starts, position) - 1
+        return self.segment(i)[position - self.starts[i]]
+
+    def latest_row(self, key: Any):
+        position = self.index.get(encode_key(key))
+        return None if position is None else self.row(position)
+
+    def latest(self, key: Any) -> Optional[PipelineResult]:
+        row = self.latest_row(key)
+        return None if row is None else to_result(row)
+
+    def decision_counts(self) -> Dict[str, int]:
+        counts = np.zeros(len(Decision.LABELS), dtype=np.int64)
+        for segment in self.scan():
+            counts += np.bincount(segment["final_decision"], minlength=len(counts))
+        return dict(zip(Decision.LABELS, counts.tolist()))
+
+    def compact(self) -> int:
+        self.flush()
+        keep = np.sort(np.fromiter(self.index.values(), dtype=np.int64, count=len(self.index)))
+        removed = sum(self.sizes) - len(keep)
+        if not removed:
+            return 0
+
+        old = [self._segment_path(number) for number in self.segments]
+        bounds = np.searchsorted(keep, self.starts + [sum(self.sizes)])
+        starts = self.starts
+        first = self.segments[-1] + 1
+        staged = os.path.join(self.path, COMPACT_DIR)
+        pending = staged + ".tmp"
+        if os.path.isdir(pending):
+            shutil.rmtree(pending)
+        os.mkdir(pending)
+        self._maps = {}
+        self.segments, self.starts, self.sizes = [first], [0], [0]
+        self._index, self._indexed = {}, 0
+        for i, path in enumerate(old):
+            rows = np.fromfile(path, dtype=RECORD_DTYPE)
+            self._write(rows[keep[bounds[i]:bounds[i + 1]] - starts[i]], pending)
+        for number in self.segments:
+            with open(self._segment_path(number, pending), "r+b") as segment:
+                os.fsync(segment.fileno())
+        with open(os.path.join(pending, COMMIT_FILE), "w", encoding="utf-8") as sink:
+            json.dump({"first_segment": first}, sink)
+            sink.flush()
+            os.fsync(sink.fileno())
+        os.replace(pending, staged)
+        self._finish_compaction()
+        return removed
+
+def decision_store_from_env(policy: str = "") -> Optional[DecisionStore]:
+    path = os.environ.get("LOAN_DECISION_STORE")
+    if not path:
+        return None
+    return DecisionStore(path, policy=policy)
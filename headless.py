@@ -0,0 +1,73 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from models import ApplicationData, to_application
+from orchestrator import EXPLAIN_LEVELS, Orchestrator, default_orchestrator
+
+OPTIONAL_ATTRIBUTES = {
+    "ApplicationBatch": "application_batch",
+    "CachedOrchestrator": "result_cache",
+    "CutoffAnalysis": "cutoff_analysis",
+    "DecisionStore": "decision_store",
+    "ExplanationAgent": "agents.explanation",
+    "PipelineMetrics": "metrics",
+    "PipelineResult": "pipeline_result",
+    "PipelineResultBatch": "pipeline_result",
+    "ScoringServer": "scoring_server",
+    "ShadowScorer": "shadow",
+    "score_file": "scoring_cli",
+    "validate_batch": "validation",
+    "validate_record": "validation",
+}
+
+_orchestrators: Dict[str, Orchestrator] = {}
+
+def __getattr__(name: str) -> Any:
+    module = OPTIONAL_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+def get_orchestrator(explain_level: str = "full") -> Orchestrator:
+    orchestrator = _orchestrators.get(explain_level)
+    if orchestrator is None:
+        orchestrator = _orchestrators[explain_level] = default_orchestrator(explain_level)
+    return orchestrator
+
+def score(
+    application: Union[ApplicationData, Dict[str, Any]],
+    explain_level: str = "full",
+    orchestrator: Optional[Orchestrator] = None
+) -> Dict[str, Any]:
+    if not isinstance(application, ApplicationData):
+        application = to_application(application)
+    return (orchestrator or get_orchestrator(explain_level)).run_full_pipeline(application)
+
+def score_many(
+    applications: Iterable[Union[ApplicationData, Dict[str, Any]]],
+    explain_level: str = "full",
+    orchestrator: Optional[Orchestrator] = None
+) -> Iterator[Dict[str, Any]]:
+    orchestrator = orchestrator or get_orchestrator(explain_level)
+    for application in applications:
+        yield score(application, orchestrator=orchestrator)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="python -m headless", description="Score JSON lines from stdin.")
+    parser.add_argument("--explain", choices=EXPLAIN_LEVELS, default="none")
+    args = parser.parse_args(argv)
+    records = (json.loads(line) for line in sys.stdin if line.strip())
+    for response in score_many(records, args.explain):
+        sys.stdout.write(json.dumps(response, ensure_ascii=False))
+        sys.stdout.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+from dataclasses import fields, replace
+from typing import Any, Dict, Iterable, List, Optional
+
+from orchestrator import ApplicationData, Orchestrator
+
+FIELD_NAMES = tuple(f.name for f in fields(ApplicationData))
+BROADCAST_STAGES = ("document", "credit", "risk", "affordability")
+
+def changed_fields(before: ApplicationData, after: ApplicationData) -> List[str]:
+    return [name for name in FIELD_NAMES if getattr(before, name) != getattr(after, name)]
+
+def _broadcast(data: Dict[str, Any], count: int) -> Dict[str, Any]:
+    import numpy as np
+
+    return {name: np.full(count, value) for name, value in data.items()}
+
+class IncrementalSession:
+    def __init__(self, orchestrator: Orchestrator):
+        self.orchestrator = orchestrator
+        self.last_app: Optional[ApplicationData] = None
+        self.last_outputs: Dict[str, Any] = {}
+        self.last_recomputed: List[str] = []
+
+    def reset(self) -> None:
+        self.last_app = None
+        self.last_outputs = {}
+        self.last_recomputed = []
+
+    def _clean_outputs(self, changed: Iterable[str]) -> Dict[str, Any]:
+        dirty = set(self.orchestrator.graph.affected_stages(changed))
+        return {name: result for name, result in self.last_outputs.items() if name not in dirty}
+
+    def run(self, app_data: ApplicationData) -> Dict[str, Any]:
+        precomputed = None
+        if self.last_app is not None:
+            precomputed = self._clean_outputs(changed_fields(self.last_app, app_data))
+
+        response, outputs = self.orchestrator.run_from(app_data, precomputed)
+        self.last_recomputed = [
+            stage.name
+            for stage in self.orchestrator.graph.order
+            if stage.name in outputs and (not precomputed or stage.name not in precomputed)
+        ]
+        self.last_app = app_data
+        self.last_outputs = outputs
+        return response
+
+    def update(self, **changes: Any) -> Dict[str, Any]:
+        if self.last_app is None:
+            raise ValueError("IncrementalSession.update() needs a previous run() to start from.")
+        return self.run(replace(self.last_app, **changes))
+
+    def sweep(self, field_name: str, values: Iterable[Any]) -> List[Dict[str, Any]]:
+        if self.last_app is None:
+            raise ValueError("IncrementalSession.sweep() needs a previous run() to start from.")
+        base = self.last_app
+        precomputed = self._clean_outputs([field_name])
+        orchestrator = self.orchestrator
+        return [
+            orchestrator.run_from(replace(base, **{field_name: value}), precomputed)[0]
+            for value in values
+        ]
+
+    def sweep_batch(self, field_name: str, values: Iterable[Any]) -> Dict[str, Any]:
+        if self.last_app is None:
+            raise ValueError("IncrementalSession.sweep_batch() needs a previous run() to start from.")
+        base = self.last_app
+        apps = [replace(base, **{field_name: value}) for value in values]
+        clean = self._clean_outputs([field_name])
+        precomputed = {
+            name: _broadcast(clean[name].data, len(apps))
+            for name in BROADCAST_STAGES
+            if name in clean
+        }
+        return self.orchestrator.run_batch(apps, precomputed)
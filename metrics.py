@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+DECISIONS = ("approve", "approve_with_caution", "review", "reject")
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _labels(**labels: str) -> str:
+    text = ",".join(
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    )
+    return "{" + text + "}" if text else ""
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, **labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _number(bound)
+            lines.append(f"{name}_bucket{_labels(**labels, le=le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(**labels)} {_number(self.sum)}")
+        lines.append(f"{name}_count{_labels(**labels)} {self.count}")
+        return lines
+
+class Series:
+    __slots__ = ("histogram", "rows", "errors")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.histogram = Histogram(buckets)
+        self.rows = 0
+        self.errors = 0
+
+class PipelineMetrics:
+    def __init__(self, namespace: str = "loan", buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.series: Dict[Tuple[str, str], Series] = {}
+        self.pipeline: Dict[str, Histogram] = {}
+        self.decisions: Dict[str, int] = dict.fromkeys(DECISIONS, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            for key in self.series:
+                self.series[key].__init__(self.buckets)
+            for histogram in self.pipeline.values():
+                histogram.__init__(self.buckets)
+            self.decisions = dict.fromkeys(DECISIONS, 0)
+
+    def _series(self, stage: str, mode: str) -> Series:
+        key = (stage, mode)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = Series(self.buckets)
+        return series
+
+    def observe(self, stage: str, mode: str, seconds: float, rows: int = 1, error: bool = False) -> None:
+        series = self._series(stage, mode)
+        with self._lock:
+            series.histogram.observe(seconds)
+            series.rows += rows
+            series.errors += error
+
+    def observe_pipeline(self, mode: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.pipeline.get(mode)
+            if histogram is None:
+                histogram = self.pipeline[mode] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def record_decision(self, decision: str, count: int = 1) -> None:
+        with self._lock:
+            self.decisions[decision] = self.decisions.get(decision, 0) + count
+
+    def record_decisions(self, decisions) -> None:
+        import numpy as np
+
+        values, counts = np.unique(decisions, return_counts=True)
+        with self._lock:
+            for decision, count in zip(values.tolist(), counts.tolist()):
+                self.decisions[decision] = self.decisions.get(decision, 0) + count
+
+    def timed(self, stage: str, call: Callable[..., Any], mode: str = "scalar", rows: int = 1) -> Callable[..., Any]:
+        clock = time.perf_counter
+        lock = self._lock
+        series = self._series(stage, mode)
+        observe = series.histogram.observe
+
+        def timed_call(*args, **kwargs):
+            started = clock()
+            try:
+                result = call(*args, **kwargs)
+            except Exception:
+                with lock:
+                    observe(clock() - started)
+                    series.rows += rows
+                    series.errors += 1
+                raise
+            elapsed = clock() - started
+            with lock:
+                observe(elapsed)
+                series.rows += rows
+            return result
+
+        return timed_call
+
+    def render(self) -> str:
+        ns = self.namespace
+        with self._lock:
+            lines = [
+                f"# HELP {ns}_agent_latency_seconds Agent call latency.",
+                f"# TYPE {ns}_agent_latency_seconds histogram",
+            ]
+            series = sorted(self.series.items())
+            for (stage, mode), item in series:
+                lines.extend(item.histogram.render(f"{ns}_agent_latency_seconds", agent=stage, mode=mode))
+
+            for name, value, help_text in (
+                ("agent_calls_total", lambda item: item.histogram.count, "Agent calls (one per batch in batch mode)."),
+                ("agent_errors_total", lambda item: item.errors, "Agent calls that raised."),
+                ("agent_rows_total", lambda item: item.rows, "Applications processed by each agent."),
+            ):
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} counter")
+                for (stage, mode), item in series:
+                    lines.append(f"{ns}_{name}{_labels(agent=stage, mode=mode)} {value(item)}")
+
+            lines.append(f"# HELP {ns}_pipeline_latency_seconds End-to-end pipeline latency.")
+            lines.append(f"# TYPE {ns}_pipeline_latency_seconds histogram")
+            for mode, histogram in sorted(self.pipeline.items()):
+                lines.extend(histogram.render(f"{ns}_pipeline_latency_seconds", mode=mode))
+
+            lines.append(f"# HELP {ns}_decisions_total Final decisions by outcome.")
+            lines.append(f"# TYPE {ns}_decisions_total counter")
+            for decision, value in self.decisions.items():
+                lines.append(f"{ns}_decisions_total{_labels(decision=decision)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as sink:
+            sink.write(self.render())
+        os.replace(temporary, path)
+
+    def serve(self, port: int = 9100, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+def metrics_from_env(namespace: str = "loan") -> Optional[PipelineMetrics]:
+    port = os.environ.get("LOAN_METRICS_PORT")
+    if not port:
+        return None
+    metrics = PipelineMetrics(namespace)
+    metrics.serve(int(port), os.environ.get("LOAN_METRICS_HOST", "127.0.0.1"))
+    return metrics
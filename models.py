@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Optional
+
+@dataclass
+class ApplicationData:
+    full_name: str = ""
+    age: int = 0
+    employment_type: str = ""
+    monthly_income: float = 0.0
+    existing_emi: float = 0.0
+    loan_amount: float = 0.0
+    loan_tenure_months: int = 0
+    credit_score: int = 0
+    purpose: str = ""
+    kyc_uploaded: bool = False
+    bank_statement_uploaded: bool = False
+    residence_type: str = ""
+    city_tier: str = ""
+    years_in_current_job: float = 0.0
+    has_previous_default: bool = False
+
+@dataclass
+class AgentResponse:
+    status: str
+    message: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+class LazyAgentResponse(AgentResponse):
+    def __init__(self, status: str, data: Dict[str, Any], render: Callable[[Dict[str, Any]], str]):
+        self.status = status
+        self.data = data
+        self._render = render
+        self._message: Optional[str] = None
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self._render(self.data)
+        return self._message
+
+    @message.setter
+    def message(self, value: str) -> None:
+        self._message = value
+
+FIELD_TYPES = {f.name: f.type for f in fields(ApplicationData)}
+TRUE_STRINGS = ("1", "true", "yes", "y")
+
+def _coerce(kind: type, value: Any) -> Any:
+    if kind is bool:
+        if isinstance(value, str):
+            return value.strip().lower() in TRUE_STRINGS
+        return bool(value)
+    if value is None or value == "":
+        return kind()
+    if kind is int:
+        return int(float(value))
+    return kind(value)
+
+def to_application(record: Dict[str, Any]) -> ApplicationData:
+    values = {}
+    for name, value in record.items():
+        kind = FIELD_TYPES.get(name)
+        if kind is not None:
+            values[name] = value if type(value) is kind else _coerce(kind, value)
+    return ApplicationData(**values)
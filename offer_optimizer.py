@@ -0,0 +1,140 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from annuity import monthly_payments
+from orchestrator import ApplicationData, Orchestrator, default_orchestrator
+
+MIN_TENURE = 6
+MAX_TENURE = 120
+OBJECTIVES = ("lowest_emi", "largest_amount", "shortest_tenure")
+
+def _leading(groups: np.ndarray, top: int, order: np.ndarray) -> np.ndarray:
+    starts = np.ones(len(groups), dtype=bool)
+    starts[1:] = groups[1:] != groups[:-1]
+    start_positions = np.flatnonzero(starts)
+    rank = np.arange(len(groups)) - np.repeat(start_positions, np.diff(np.append(start_positions, len(groups))))
+    return order[rank < top]
+
+class OfferOptimizer:
+    def __init__(
+        self,
+        orchestrator: Optional[Orchestrator] = None,
+        amount_step: float = 10000.0,
+        max_amounts: int = 200,
+        tenures: Iterable[int] = range(MIN_TENURE, MAX_TENURE + 1)
+    ):
+        self.orchestrator = orchestrator or default_orchestrator()
+        self.amount_step = amount_step
+        self.max_amounts = max_amounts
+        self.tenures = np.asarray(list(tenures), dtype=np.int64)
+
+    def candidate_amounts(self, requested: float) -> np.ndarray:
+        if requested <= 0:
+            return np.zeros(0)
+        step = max(self.amount_step, np.ceil(requested / self.max_amounts / self.amount_step) * self.amount_step)
+        amounts = np.arange(step, requested, step)
+        return np.append(amounts, requested)
+
+    def candidate_rows(self, requested: np.ndarray):
+        requested = np.asarray(requested, dtype=np.float64)
+        step = np.maximum(self.amount_step, np.ceil(requested / self.max_amounts / self.amount_step) * self.amount_step)
+        steps = np.maximum(np.ceil((requested - step) / step), 0).astype(np.int64)
+        counts = np.where(requested > 0, steps + 1, 0)
+        app_index = np.repeat(np.arange(len(requested)), counts)
+        offset = np.arange(len(app_index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        amounts = np.where(offset < steps[app_index], step[app_index] + offset * step[app_index], requested[app_index])
+        return app_index, amounts
+
+    def _grid(self, apps: List[ApplicationData]) -> Dict[str, np.ndarray]:
+        from application_batch import ApplicationBatch
+
+        orchestrator = self.orchestrator
+        batch = ApplicationBatch.from_applications(apps, int_dtype=np.int64)
+        app_index, amounts = self.candidate_rows(batch["loan_amount"])
+        rows = batch[app_index]
+        rows.columns["loan_amount"] = amounts
+
+        credit = orchestrator.credit_agent.evaluate_batch(rows)
+        risk = orchestrator.risk_agent.assess_batch(rows, credit)
+        rates = orchestrator.offer_agent.price_batch(credit["credit_score"], risk["risk_level"])
+        max_allowed_emi = orchestrator.affordability_agent.evaluate_batch(batch)["max_allowed_emi"][app_index]
+
+        tenures = self.tenures[None, :]
+        emi = monthly_payments(amounts[:, None], rates[:, None], tenures)
+        assessed_emi = monthly_payments(amounts[:, None], orchestrator.affordability_agent.assessment_rate, tenures)
+        limit = max_allowed_emi[:, None]
+        return {
+            "application": app_index,
+            "loan_amount": amounts,
+            "rate": rates,
+            "emi": emi,
+            "feasible": (emi <= limit) & (assessed_emi <= limit),
+            "existing_emi": batch["existing_emi"][app_index],
+            "monthly_income": batch["monthly_income"][app_index],
+        }
+
+    def _candidates(self, grid: Dict[str, np.ndarray], row: np.ndarray, column: np.ndarray) -> Dict[str, np.ndarray]:
+        income = grid["monthly_income"][row]
+        emi = grid["emi"][row, column]
+        foir = np.divide(grid["existing_emi"][row] + emi, income, out=np.ones_like(emi), where=income > 0)
+        return {
+            "loan_amount": grid["loan_amount"][row],
+            "tenure_months": self.tenures[column],
+            "interest_rate_percent": np.round(grid["rate"][row] * 100, 2),
+            "emi": emi,
+            "foir": foir,
+        }
+
+    def evaluate(self, app: ApplicationData) -> Dict[str, np.ndarray]:
+        grid = self._grid([app])
+        return self._candidates(grid, *np.nonzero(grid["feasible"]))
+
+    def optimize(self, app: ApplicationData, top: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        return self.optimize_batch([app], top=top)[0]
+
+    def optimize_batch(
+        self,
+        apps: Iterable[ApplicationData],
+        top: int = 1,
+        chunk_size: int = 64
+    ) -> List[Dict[str, List[Dict[str, Any]]]]:
+        apps = list(apps)
+        ranked: List[Dict[str, List[Dict[str, Any]]]] = []
+        for start in range(0, len(apps), chunk_size):
+            chunk = apps[start:start + chunk_size]
+            ranked.extend(self._rank(self._grid(chunk), len(chunk), top))
+        return ranked
+
+    def _rank(self, grid: Dict[str, np.ndarray], count: int, top: int) -> List[Dict[str, List[Dict[str, Any]]]]:
+        owner = grid["application"]
+        amount = grid["loan_amount"]
+        feasible = grid["feasible"]
+        tenures = np.broadcast_to(self.tenures, feasible.shape)
+        emi = np.where(feasible, grid["emi"], np.inf)
+        open_rows = np.flatnonzero(feasible.any(axis=1))
+
+        best = np.lexsort((tenures[open_rows], emi[open_rows]), axis=-1)[:, 0]
+        by_amount = np.lexsort((-amount[open_rows], owner[open_rows]))
+        chosen = _leading(owner[open_rows][by_amount], top, by_amount)
+        picks = {"largest_amount": (open_rows[chosen], best[chosen])}
+
+        last = np.ones(len(open_rows), dtype=bool)
+        last[:-1] = owner[open_rows][1:] != owner[open_rows][:-1]
+        target = open_rows[last]
+        target_tenures = np.where(feasible[target], tenures[target], np.iinfo(np.int64).max)
+        for name, keys in (
+            ("lowest_emi", (target_tenures, emi[target])),
+            ("shortest_tenure", (emi[target], target_tenures)),
+        ):
+            columns = np.lexsort(keys, axis=-1)[:, :top]
+            rows = np.broadcast_to(target[:, None], columns.shape)
+            keep = feasible[rows, columns]
+            picks[name] = (rows[keep], columns[keep])
+
+        ranked: List[Dict[str, List[Dict[str, Any]]]] = [{name: [] for name in OBJECTIVES} for _ in range(count)]
+        for name, (rows, columns) in picks.items():
+            values = {key: column.tolist() for key, column in self._candidates(grid, rows, columns).items()}
+            for position, i in enumerate(owner[rows].tolist()):
+                ranked[i][name].append({key: column[position] for key, column in values.items()})
+        return ranked
@@ -1,29 +1,24 @@
-from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional
-
-@dataclass
-class ApplicationData:
-    full_name: str = ""
-    age: int = 0
-    employment_type: str = ""
-    monthly_income: float = 0.0
-    existing_emi: float = 0.0
-    loan_amount: float = 0.0
-    loan_tenure_months: int = 0
-    credit_score: int = 0
-    purpose: str = ""
-    kyc_uploaded: bool = False
-    bank_statement_uploaded: bool = False
-    residence_type: str = ""
-    city_tier: str = ""
-    years_in_current_job: float = 0.0
-    has_previous_default: bool = False
-
-@dataclass
-class AgentResponse:
-    status: str
-    message: str
-    data: Dict[str, Any] = field(default_factory=dict)
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
+
+from models import AgentResponse, ApplicationData
+from pipeline_graph import PipelineGraph
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+OFFER_DECISIONS = ("approve", "approve_with_caution", "review")
+REPORTED_STAGES = ("document", "credit", "risk", "affordability", "compliance")
+EXPLAIN_LEVELS = ("none", "codes", "full")
+SUMMARY_FIELDS = (
+    ("credit", ("credit_score",)),
+    ("risk", ("risk_score", "risk_level")),
+    ("affordability", ("affordability_flag", "requested_emi")),
+)
+KNOCKOUT_PREFIX = "A knock-out rule already fixed the decision: "
+
+def _offer_guard(results: Dict[str, Any]) -> bool:
+    return results["compliance"].data.get("final_decision", "review") in OFFER_DECISIONS
 
 class Orchestrator:
     def __init__(
@@ -33,54 +28,284 @@ class Orchestrator:
         risk_agent,
         affordability_agent,
         compliance_agent,
-        offer_agent
+        offer_agent,
+        executor: Optional["Executor"] = None,
+        short_circuit: bool = False,
+        metrics: Optional[Any] = None,
+        explain_level: str = "full",
+        shadow: Optional[Any] = None
     ):
+        if explain_level not in EXPLAIN_LEVELS:
+            raise ValueError(f"explain_level must be one of {EXPLAIN_LEVELS}, got '{explain_level}'.")
         self.document_agent = document_agent
         self.credit_agent = credit_agent
         self.risk_agent = risk_agent
         self.affordability_agent = affordability_agent
         self.compliance_agent = compliance_agent
         self.offer_agent = offer_agent
+        self.executor = executor
+        self.short_circuit = short_circuit
+        self.explain_level = explain_level
+        self.graph = PipelineGraph([
+            document_agent,
+            credit_agent,
+            risk_agent,
+            affordability_agent,
+            compliance_agent,
+            offer_agent,
+        ])
+        self.set_metrics(metrics)
+        self.set_shadow(shadow)
 
-    def run_full_pipeline(self, app_data: ApplicationData) -> Dict[str, Any]:
-        results: List[AgentResponse] = []
+    def set_metrics(self, metrics: Optional[Any]) -> None:
+        self.metrics = metrics
+        self.graph.instrument(metrics)
+
+    def set_shadow(self, shadow: Optional[Any]) -> None:
+        self.shadow = shadow
+        if shadow is not None:
+            shadow.bind(self)
 
-        doc_res = self.document_agent.verify(app_data)
-        results.append(doc_res)
+    def _knockout(self, app_data: ApplicationData) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+        precomputed: Dict[str, Any] = {}
+        knockout = self.compliance_agent.knockout
+        if self.metrics is not None:
+            knockout = self.metrics.timed("compliance_knockout", knockout)
+        comp_res = knockout(app_data)
+        if comp_res is None:
+            afford_res = self.graph.stages["affordability"].call(app_data)
+            precomputed["affordability"] = afford_res
+            comp_res = knockout(app_data, afford_res.data)
+        if comp_res is None:
+            return precomputed, None
+
+        skipped = [name for name in self.graph.stages if name not in precomputed and name != "compliance"]
+        precomputed["compliance"] = comp_res
+        return precomputed, skipped
+
+    def run_stages(
+        self,
+        app_data: ApplicationData,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        return self.graph.run(app_data, self.executor, {"offer": _offer_guard}, precomputed)
+
+    def build_response(self, outputs: Dict[str, Any], skipped: Optional[List[str]] = None) -> Dict[str, Any]:
+        final_decision = outputs["compliance"].data.get("final_decision", "review")
+        offer_data: Optional[Dict[str, Any]] = outputs.get("offer")
+        level = self.explain_level
+
+        if level == "full":
+            return self._full_response(
+                final_decision,
+                {name: outputs[name].data for name in REPORTED_STAGES if name in outputs},
+                {name: outputs[name].message for name in REPORTED_STAGES if name in outputs},
+                offer_data,
+                skipped,
+            )
 
-        credit_res = self.credit_agent.evaluate(app_data)
-        results.append(credit_res)
+        response: Dict[str, Any] = {"final_decision": final_decision}
+        if level == "none":
+            for name, keys in SUMMARY_FIELDS:
+                result = outputs.get(name)
+                for key in keys:
+                    response[key] = result.data[key] if result is not None else None
+        else:
+            response["agent_data"] = [outputs[name].data if name in outputs else {} for name in REPORTED_STAGES]
+        response["offer"] = offer_data
+        if self.short_circuit:
+            response["skipped_agents"] = list(skipped or ())
+        return response
+
+    def _full_response(
+        self,
+        final_decision: str,
+        data: Dict[str, Dict[str, Any]],
+        messages: Dict[str, str],
+        offer_data: Optional[Dict[str, Any]],
+        skipped: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        stages = self.graph.stages
+        expanded = {}
+        for name, values in data.items():
+            expand = getattr(stages[name].agent, "expand", None)
+            expanded[name] = expand(values) if expand is not None else values
+
+        skip_reason = ""
+        if skipped:
+            skip_reason = KNOCKOUT_PREFIX + " ".join(expanded["compliance"]["compliance_reasons"])
+        response = {
+            "final_decision": final_decision,
+            "agent_messages": [
+                messages[name] if name in messages else f"{name.capitalize()} agent skipped. {skip_reason}"
+                for name in REPORTED_STAGES
+            ],
+            "agent_data": [expanded.get(name, {}) for name in REPORTED_STAGES],
+            "offer": offer_data,
+        }
+        if self.short_circuit:
+            response["skipped_agents"] = list(skipped or ())
+        return response
+
+    def explain(self, response: Any) -> Dict[str, Any]:
+        if not isinstance(response, dict):
+            response = response.to_dict()
+        if "agent_messages" in response:
+            return response
+        if "agent_data" not in response:
+            raise ValueError("Responses built with explain_level='none' carry no reason codes to explain.")
+
+        stages = self.graph.stages
+        data = {name: values for name, values in zip(REPORTED_STAGES, response["agent_data"]) if values}
+        messages = {name: stages[name].agent.describe(values) for name, values in data.items()}
+        return self._full_response(
+            response["final_decision"],
+            data,
+            messages,
+            response["offer"],
+            response.get("skipped_agents"),
+        )
+
+    def run_full_pipeline(self, app_data: ApplicationData) -> Dict[str, Any]:
+        return self._run(app_data, self.build_response)
 
-        risk_res = self.risk_agent.assess(app_data, credit_res.data)
-        results.append(risk_res)
+    def run_result(self, app_data: ApplicationData) -> "PipelineResult":
+        from pipeline_result import PipelineResult
 
-        afford_res = self.affordability_agent.evaluate(app_data)
-        results.append(afford_res)
+        return self._run(app_data, PipelineResult.from_outputs)
 
-        comp_res = self.compliance_agent.check(
+    def run_from(
+        self,
+        app_data: ApplicationData,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        return self._run(
             app_data,
-            credit_res.data,
-            risk_res.data,
-            doc_res.data,
-            afford_res.data
+            lambda outputs, skipped: (self.build_response(outputs, skipped), outputs),
+            precomputed,
         )
-        results.append(comp_res)
-
-        final_decision = comp_res.data.get("final_decision", "review")
-
-        offer_data: Optional[Dict[str, Any]] = None
-        if final_decision in ["approve", "approve_with_caution", "review"]:
-            offer_data = self.offer_agent.propose_offer(
-                app_data,
-                credit_res.data,
-                risk_res.data,
-                afford_res.data,
-                comp_res.data
-            )
 
-        return {
+    def _run(
+        self,
+        app_data: ApplicationData,
+        build: Callable[..., Any],
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        metrics, shadow = self.metrics, self.shadow
+        if metrics is None and shadow is None:
+            return build(*self._outputs(app_data, precomputed))
+        started = time.perf_counter()
+        if shadow is not None:
+            shadow.hold(started)
+        outputs, skipped = self._outputs(app_data, precomputed)
+        result = build(outputs, skipped)
+        if metrics is not None:
+            metrics.observe_pipeline("scalar", time.perf_counter() - started)
+            metrics.record_decision(outputs["compliance"].data.get("final_decision", "review"))
+        if shadow is not None:
+            shadow.submit(app_data, outputs)
+        return result
+
+    def _outputs(
+        self,
+        app_data: ApplicationData,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Optional[List[str]]]:
+        if not self.short_circuit or (precomputed and "compliance" in precomputed):
+            return self.run_stages(app_data, precomputed), None
+        knocked_out, skipped = self._knockout(app_data)
+        if skipped is not None:
+            return knocked_out, skipped
+        return self.run_stages(app_data, {**(precomputed or {}), **knocked_out}), []
+
+    def run_batch(self, apps, precomputed: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Score every row through every stage, column-wise.
+
+        short_circuit is a scalar-path setting and is not applied here: knocked-out rows still get
+        credit, risk and document columns, and nothing is reported as skipped. Decisions and offers
+        are the same either way, because knock-out rules only fire on rejections that the full rule
+        table also produces. Reasons are not: a knocked-out scalar response lists only the knock-out
+        reasons found before it stopped, while this path lists every rule that fired (high risk,
+        missing documents, not affordable, ...).
+        """
+        import numpy as np
+
+        if isinstance(apps, (list, tuple)):
+            from application_batch import ApplicationBatch
+
+            apps = ApplicationBatch.from_applications(apps)
+        cols = apps
+        metrics = self.metrics
+        precomputed = precomputed or {}
+        started = time.perf_counter()
+        if self.shadow is not None:
+            self.shadow.hold(started)
+
+        def timed(stage: str, call):
+            if stage in precomputed:
+                return lambda *args: precomputed[stage]
+            return call if metrics is None else metrics.timed(stage, call, "batch", len(cols))
+
+        doc_res = timed("document", self.document_agent.verify_batch)(cols)
+        credit_res = timed("credit", self.credit_agent.evaluate_batch)(cols)
+        risk_res = timed("risk", self.risk_agent.assess_batch)(cols, credit_res)
+        afford_res = timed("affordability", self.affordability_agent.evaluate_batch)(cols)
+        comp_res = timed("compliance", self.compliance_agent.check_batch)(
+            cols,
+            credit_res,
+            risk_res,
+            doc_res,
+            afford_res
+        )
+
+        final_decision = comp_res["final_decision"]
+        offer_data = timed("offer", self.offer_agent.propose_offer_batch)(
+            cols,
+            credit_res,
+            risk_res,
+            afford_res,
+            comp_res
+        )
+        if metrics is not None:
+            metrics.observe_pipeline("batch", time.perf_counter() - started)
+            metrics.record_decisions(final_decision)
+
+        result = {
             "final_decision": final_decision,
-            "agent_messages": [r.message for r in results],
-            "agent_data": [r.data for r in results],
+            "agent_data": [doc_res, credit_res, risk_res, afford_res, comp_res],
             "offer": offer_data,
+            "has_offer": np.isin(final_decision, OFFER_DECISIONS),
         }
+        if self.shadow is not None:
+            self.shadow.submit_batch(cols, result)
+        return result
+
+    def run_batch_result(self, apps) -> "PipelineResultBatch":
+        from pipeline_result import PipelineResultBatch
+
+        return PipelineResultBatch.from_batch(self.run_batch(apps))
+
+def default_orchestrator(explain_level: str = "full") -> Orchestrator:
+    from agents.affordability import AffordabilityAgent
+    from agents.compliance import ComplianceAgent
+    from agents.credit_scoring import CreditScoringAgent
+    from agents.document_verification import DocumentVerificationAgent
+    from agents.offer_generation import OfferGenerationAgent
+    from agents.risk_assessment import RiskAssessmentAgent
+
+    return Orchestrator(
+        document_agent=DocumentVerificationAgent(),
+        credit_agent=CreditScoringAgent(),
+        risk_agent=RiskAssessmentAgent(),
+        affordability_agent=AffordabilityAgent(),
+        compliance_agent=ComplianceAgent(),
+        offer_agent=OfferGenerationAgent(),
+        explain_level=explain_level,
+    )
+
+if __name__ == "__main__":
+    import sys
+
+    from scoring_cli import main
+
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from orchestrator import ApplicationData, Orchestrator, default_orchestrator
+
+_worker_orchestrator: Optional[Orchestrator] = None
+
+def _init_worker(orchestrator_factory: Callable[[], Orchestrator]) -> None:
+    global _worker_orchestrator
+    _worker_orchestrator = orchestrator_factory()
+
+def _score_chunk(chunk: List[ApplicationData]) -> Dict[str, Any]:
+    import numpy as np
+
+    from application_batch import ApplicationBatch, ColumnRangeError
+
+    try:
+        batch = ApplicationBatch.from_applications(chunk)
+    except ColumnRangeError:
+        batch = ApplicationBatch.from_applications(chunk, int_dtype=np.int64)
+    return _worker_orchestrator.run_batch(batch)
+
+class ParallelScorer:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = 10000,
+        orchestrator_factory: Callable[[], Orchestrator] = default_orchestrator,
+        max_pending: Optional[int] = None
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.workers * 2
+        self.compliance_agent = orchestrator_factory().compliance_agent
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(orchestrator_factory,),
+        )
+
+    def __enter__(self) -> "ParallelScorer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    def map_batches(self, applications: Iterable[ApplicationData]) -> Iterator[Dict[str, Any]]:
+        pending = deque()
+        applications = iter(applications)
+        while True:
+            while len(pending) < self.max_pending:
+                chunk = list(islice(applications, self.chunk_size))
+                if not chunk:
+                    break
+                pending.append(self.executor.submit(_score_chunk, chunk))
+            if not pending:
+                return
+            yield pending.popleft().result()
+
+    def score(self, applications: Iterable[Tuple[Any, ApplicationData]]) -> Iterator[Dict[str, Any]]:
+        from scoring_cli import iter_batch_records
+
+        keys: deque = deque()
+
+        def apps():
+            for key, app in applications:
+                keys.append(key)
+                yield app
+
+        for result in self.map_batches(apps()):
+            size = len(result["final_decision"])
+            yield from iter_batch_records([keys.popleft() for _ in range(size)], result, self.compliance_agent)
+
+def scaling_curve(
+    applications: Sequence[ApplicationData],
+    worker_counts: Iterable[int],
+    chunk_size: int = 10000
+) -> List[Dict[str, float]]:
+    curve = []
+    for workers in worker_counts:
+        with ParallelScorer(workers=workers, chunk_size=chunk_size) as scorer:
+            list(scorer.map_batches(applications[:chunk_size * workers]))
+            started = time.perf_counter()
+            rows = sum(len(result["final_decision"]) for result in scorer.map_batches(applications))
+            elapsed = time.perf_counter() - started
+        curve.append({"workers": workers, "rows": rows, "seconds": elapsed, "rows_per_sec": rows / elapsed})
+
+    baseline = curve[0]["rows_per_sec"] if curve else 0.0
+    for point in curve:
+        point["speedup"] = point["rows_per_sec"] / baseline if baseline else 0.0
+    return curve
@@ -0,0 +1,158 @@
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+Guard = Callable[[Dict[str, Any]], bool]
+
+def result_data(result: Any) -> Any:
+    return getattr(result, "data", result)
+
+class Stage:
+    __slots__ = ("name", "agent", "call", "requires", "reads")
+
+    def __init__(self, agent: Any):
+        self.name: str = agent.stage_name
+        self.agent = agent
+        self.call: Callable[..., Any] = getattr(agent, agent.entry_point)
+        self.requires: Tuple[str, ...] = tuple(agent.requires)
+        reads = getattr(agent, "reads", None)
+        self.reads: Optional[frozenset] = frozenset(reads) if reads is not None else None
+
+    def run(self, app: Any, results: Dict[str, Any]) -> Any:
+        return self.call(app, *[result_data(results[name]) for name in self.requires])
+
+class PipelineGraph:
+    def __init__(self, agents: Iterable[Any]):
+        stages = {}
+        for agent in agents:
+            stage = Stage(agent)
+            if stage.name in stages:
+                raise ValueError(f"Duplicate pipeline stage '{stage.name}'.")
+            stages[stage.name] = stage
+
+        for stage in stages.values():
+            unknown = [name for name in stage.requires if name not in stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' requires unknown stage(s): {', '.join(unknown)}.")
+
+        self.stages = stages
+        self.order = self._topological_order()
+        self.dependents = {name: [s.name for s in self.order if name in s.requires] for name in stages}
+
+    def _topological_order(self) -> List[Stage]:
+        order: List[Stage] = []
+        done = set()
+        remaining = list(self.stages.values())
+        while remaining:
+            ready = [stage for stage in remaining if all(name in done for name in stage.requires)]
+            if not ready:
+                raise ValueError("Pipeline stages contain a dependency cycle: " + ", ".join(s.name for s in remaining))
+            for stage in ready:
+                order.append(stage)
+                done.add(stage.name)
+            remaining = [stage for stage in remaining if stage.name not in done]
+        return order
+
+    def instrument(self, metrics: Optional[Any] = None) -> None:
+        for stage in self.order:
+            call = getattr(stage.agent, stage.agent.entry_point)
+            stage.call = call if metrics is None else metrics.timed(stage.name, call)
+
+    def affected_stages(self, changed_fields: Iterable[str]) -> List[str]:
+        changed = set(changed_fields)
+        dirty = set()
+        for stage in self.order:
+            if (
+                stage.reads is None
+                or stage.reads & changed
+                or any(name in dirty for name in stage.requires)
+            ):
+                dirty.add(stage.name)
+        return [stage.name for stage in self.order if stage.name in dirty]
+
+    def levels(self) -> List[List[str]]:
+        depth: Dict[str, int] = {}
+        for stage in self.order:
+            depth[stage.name] = 1 + max((depth[name] for name in stage.requires), default=-1)
+        levels: List[List[str]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for name, level in depth.items():
+            levels[level].append(name)
+        return levels
+
+    def run(
+        self,
+        app: Any,
+        executor: Optional["Executor"] = None,
+        guards: Optional[Dict[str, Guard]] = None,
+        precomputed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        guards = guards or {}
+        results: Dict[str, Any] = dict(precomputed or {})
+        if executor is None:
+            for stage in self.order:
+                if stage.name in results:
+                    continue
+                guard = guards.get(stage.name)
+                results[stage.name] = stage.run(app, results) if guard is None or guard(results) else None
+            return results
+        return self._run_concurrent(app, executor, guards, results)
+
+    def _run_concurrent(
+        self,
+        app: Any,
+        executor: "Executor",
+        guards: Dict[str, Guard],
+        results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        waiting = {
+            stage.name: sum(name not in results for name in stage.requires)
+            for stage in self.order
+            if stage.name not in results
+        }
+        running = {}
+
+        def launch(name: str) -> None:
+            stage = self.stages[name]
+            guard = guards.get(name)
+            if guard is not None and not guard(results):
+                finish(name, None)
+            else:
+                running[executor.submit(stage.run, app, dict(results))] = name
+
+        def finish(name: str, result: Any) -> None:
+            results[name] = result
+            for dependent in self.dependents[name]:
+                if dependent not in waiting:
+                    continue
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    launch(dependent)
+
+        for name, count in list(waiting.items()):
+            if count == 0:
+                launch(name)
+        while running:
+            completed, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in completed:
+                finish(running.pop(future), future.result())
+        return results
+
+class SimulatedLatencyAgent:
+    def __init__(self, agent: Any, seconds: float):
+        self._agent = agent
+        self._seconds = seconds
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._agent, name)
+        if name != self._agent.entry_point:
+            return attr
+
+        def delayed(*args, **kwargs):
+            time.sleep(self._seconds)
+            return attr(*args, **kwargs)
+
+        return delayed
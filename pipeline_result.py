@@ -0,0 +1,347 @@
+from enum import IntEnum
+from typing import Any, ClassVar, Dict, Iterator, Optional, Tuple
+
+from agents.affordability import AFFORDABILITY_FLAGS
+from agents.compliance_rules import SEVERITIES, WORD_BITS
+from agents.credit_scoring import CREDIT_BANDS
+from agents.offer_generation import ADJUSTED_NOTE, WITHIN_LIMITS_NOTE
+from agents.risk_assessment import RISK_LEVELS
+from orchestrator import OFFER_DECISIONS, REPORTED_STAGES
+
+class LabelledEnum(IntEnum):
+    @property
+    def label(self) -> str:
+        return type(self).LABELS[self]
+
+    @classmethod
+    def parse(cls, label: str) -> "LabelledEnum":
+        return cls.MEMBERS[label]
+
+    @classmethod
+    def encode(cls, labels):
+        import numpy as np
+
+        labels = np.asarray(labels)
+        codes = np.full(labels.shape, -1, dtype=np.int8)
+        for code, label in enumerate(cls.LABELS):
+            codes[labels == label] = code
+        if (codes < 0).any():
+            raise ValueError(f"Unknown {cls.__name__} labels: {sorted(set(labels[codes < 0].tolist()))}.")
+        return codes
+
+    @classmethod
+    def decode(cls, codes):
+        import numpy as np
+
+        return np.array(cls.LABELS)[codes]
+
+def _labelled(name: str, labels: Tuple[str, ...]):
+    members = [(label.upper().replace(" ", "_"), code) for code, label in enumerate(labels)]
+    enum = LabelledEnum(name, members, module=__name__)
+    enum.LABELS = labels
+    enum.MEMBERS = {label: enum(code) for code, label in enumerate(labels)}
+    return enum
+
+Decision = _labelled("Decision", SEVERITIES)
+CreditBand = _labelled("CreditBand", tuple(band for band, _ in CREDIT_BANDS))
+RiskLevel = _labelled("RiskLevel", RISK_LEVELS)
+AffordabilityFlag = _labelled("AffordabilityFlag", AFFORDABILITY_FLAGS)
+
+class _Slotted:
+    __slots__ = ()
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+class _Record(_Slotted):
+    __slots__ = ()
+    ENUMS: ClassVar[Dict[str, Any]] = {}
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "_Record":
+        values = dict(data)
+        for name, enum in cls.ENUMS.items():
+            values[name] = enum.MEMBERS[values[name]]
+        return cls(**values)
+
+    def to_data(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        for name in self.ENUMS:
+            data[name] = data[name].label
+        return data
+
+class DocumentResult(_Record):
+    __slots__ = ("kyc_uploaded", "bank_statement_uploaded", "document_quality_score", "missing_documents_mask")
+
+    def __init__(
+        self,
+        kyc_uploaded: bool,
+        bank_statement_uploaded: bool,
+        document_quality_score: float,
+        missing_documents_mask: int
+    ):
+        self.kyc_uploaded = kyc_uploaded
+        self.bank_statement_uploaded = bank_statement_uploaded
+        self.document_quality_score = document_quality_score
+        self.missing_documents_mask = missing_documents_mask
+
+class CreditResult(_Record):
+    __slots__ = ("credit_score", "credit_decision", "credit_band")
+    ENUMS: ClassVar[Dict[str, Any]] = {"credit_decision": Decision, "credit_band": CreditBand}
+
+    def __init__(self, credit_score: int, credit_decision: Decision, credit_band: CreditBand):
+        self.credit_score = credit_score
+        self.credit_decision = credit_decision
+        self.credit_band = credit_band
+
+class RiskResult(_Record):
+    __slots__ = ("risk_score", "risk_level", "risk_flag_mask")
+    ENUMS: ClassVar[Dict[str, Any]] = {"risk_level": RiskLevel}
+
+    def __init__(self, risk_score: float, risk_level: RiskLevel, risk_flag_mask: int):
+        self.risk_score = risk_score
+        self.risk_level = risk_level
+        self.risk_flag_mask = risk_flag_mask
+
+class AffordabilityResult(_Record):
+    __slots__ = (
+        "max_foir",
+        "current_foir",
+        "max_allowed_emi",
+        "max_eligible_loan",
+        "requested_emi",
+        "affordability_flag",
+    )
+    ENUMS: ClassVar[Dict[str, Any]] = {"affordability_flag": AffordabilityFlag}
+
+    def __init__(
+        self,
+        max_foir: float,
+        current_foir: float,
+        max_allowed_emi: float,
+        max_eligible_loan: float,
+        requested_emi: float,
+        affordability_flag: AffordabilityFlag
+    ):
+        self.max_foir = max_foir
+        self.current_foir = current_foir
+        self.max_allowed_emi = max_allowed_emi
+        self.max_eligible_loan = max_eligible_loan
+        self.requested_emi = requested_emi
+        self.affordability_flag = affordability_flag
+
+class ComplianceResult(_Record):
+    __slots__ = ("final_decision", "compliance_reasons_mask", "knockout")
+    ENUMS: ClassVar[Dict[str, Any]] = {"final_decision": Decision}
+
+    def __init__(self, final_decision: Decision, compliance_reasons_mask: int, knockout: bool = False):
+        self.final_decision = final_decision
+        self.compliance_reasons_mask = compliance_reasons_mask
+        self.knockout = knockout
+
+    def to_data(self) -> Dict[str, Any]:
+        data = {"final_decision": self.final_decision.label, "compliance_reasons_mask": self.compliance_reasons_mask}
+        if self.knockout:
+            data["knockout"] = True
+        return data
+
+class OfferResult(_Record):
+    __slots__ = (
+        "suggested_interest_rate_percent",
+        "recommended_loan_amount",
+        "recommended_emi",
+        "max_eligible_loan_amount",
+        "max_affordable_emi",
+        "decision_from_compliance",
+        "within_affordability_limits",
+    )
+    ENUMS: ClassVar[Dict[str, Any]] = {"decision_from_compliance": Decision}
+
+    def __init__(
+        self,
+        suggested_interest_rate_percent: float,
+        recommended_loan_amount: float,
+        recommended_emi: float,
+        max_eligible_loan_amount: float,
+        max_affordable_emi: float,
+        decision_from_compliance: Decision,
+        within_affordability_limits: bool
+    ):
+        self.suggested_interest_rate_percent = suggested_interest_rate_percent
+        self.recommended_loan_amount = recommended_loan_amount
+        self.recommended_emi = recommended_emi
+        self.max_eligible_loan_amount = max_eligible_loan_amount
+        self.max_affordable_emi = max_affordable_emi
+        self.decision_from_compliance = decision_from_compliance
+        self.within_affordability_limits = within_affordability_limits
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "OfferResult":
+        values = dict(data)
+        values["decision_from_compliance"] = Decision.MEMBERS[values["decision_from_compliance"]]
+        if "adjustment_note" in values:
+            values["within_affordability_limits"] = values.pop("adjustment_note") == WITHIN_LIMITS_NOTE
+        return cls(**values)
+
+    def to_data(self) -> Dict[str, Any]:
+        data = super().to_data()
+        data["adjustment_note"] = WITHIN_LIMITS_NOTE if data.pop("within_affordability_limits") else ADJUSTED_NOTE
+        return data
+
+STAGE_RECORDS = {
+    "document": DocumentResult,
+    "credit": CreditResult,
+    "risk": RiskResult,
+    "affordability": AffordabilityResult,
+    "compliance": ComplianceResult,
+}
+
+class PipelineResult(_Slotted):
+    __slots__ = ("final_decision", "document", "credit", "risk", "affordability", "compliance", "offer", "skipped")
+
+    def __init__(
+        self,
+        final_decision: Decision,
+        document: Optional[DocumentResult] = None,
+        credit: Optional[CreditResult] = None,
+        risk: Optional[RiskResult] = None,
+        affordability: Optional[AffordabilityResult] = None,
+        compliance: Optional[ComplianceResult] = None,
+        offer: Optional[OfferResult] = None,
+        skipped: Optional[Tuple[str, ...]] = None
+    ):
+        self.final_decision = final_decision
+        self.document = document
+        self.credit = credit
+        self.risk = risk
+        self.affordability = affordability
+        self.compliance = compliance
+        self.offer = offer
+        self.skipped = skipped
+
+    @classmethod
+    def from_outputs(cls, outputs: Dict[str, Any], skipped=None) -> "PipelineResult":
+        records = {
+            name: record.from_data(outputs[name].data)
+            for name, record in STAGE_RECORDS.items()
+            if name in outputs
+        }
+        offer = outputs.get("offer")
+        return cls(
+            final_decision=records["compliance"].final_decision,
+            offer=OfferResult.from_data(offer) if offer is not None else None,
+            skipped=tuple(skipped) if skipped is not None else None,
+            **records,
+        )
+
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "PipelineResult":
+        records = {
+            name: STAGE_RECORDS[name].from_data(data)
+            for name, data in zip(REPORTED_STAGES, response["agent_data"])
+            if data
+        }
+        offer = response["offer"]
+        skipped = response.get("skipped_agents")
+        return cls(
+            final_decision=Decision.MEMBERS[response["final_decision"]],
+            offer=OfferResult.from_data(offer) if offer is not None else None,
+            skipped=tuple(skipped) if skipped is not None else None,
+            **records,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        response = {
+            "final_decision": self.final_decision.label,
+            "agent_data": [
+                record.to_data() if record is not None else {}
+                for record in (self.document, self.credit, self.risk, self.affordability, self.compliance)
+            ],
+            "offer": self.offer.to_data() if self.offer is not None else None,
+        }
+        if self.skipped is not None:
+            response["skipped_agents"] = list(self.skipped)
+        return response
+
+BATCH_STAGES = REPORTED_STAGES + ("offer",)
+STAGE_ENUMS = {name: record.ENUMS for name, record in STAGE_RECORDS.items()}
+STAGE_ENUMS["offer"] = OfferResult.ENUMS
+
+class PipelineResultBatch:
+    __slots__ = ("final_decision", "columns", "has_offer")
+
+    def __init__(self, final_decision, columns: Dict[str, Dict[str, Any]], has_offer):
+        self.final_decision = final_decision
+        self.columns = columns
+        self.has_offer = has_offer
+
+    @classmethod
+    def from_batch(cls, result: Dict[str, Any]) -> "PipelineResultBatch":
+        import numpy as np
+
+        encoded: Dict[Tuple[Any, int], Any] = {}
+
+        def encode(enum, values):
+            key = (enum, id(values))
+            if key not in encoded:
+                encoded[key] = enum.encode(values)
+            return encoded[key]
+
+        columns = {}
+        for name, data in zip(BATCH_STAGES, result["agent_data"] + [result["offer"]]):
+            enums = STAGE_ENUMS[name]
+            columns[name] = {key: encode(enums[key], values) if key in enums else np.asarray(values) for key, values in data.items()}
+        return cls(encode(Decision, result["final_decision"]), columns, np.asarray(result["has_offer"], dtype=bool))
+
+    def __len__(self) -> int:
+        return len(self.final_decision)
+
+    def __iter__(self) -> Iterator[PipelineResult]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def _record(self, name: str, i: int, record):
+        values = {}
+        for key, column in self.columns[name].items():
+            value = column[i]
+            if key in record.ENUMS:
+                value = record.ENUMS[key](value)
+            elif value.ndim:
+                value = sum(int(word) << (WORD_BITS * bit) for bit, word in enumerate(value))
+            else:
+                value = value.item()
+            values[key] = value
+        return record(**values)
+
+    def __getitem__(self, i: int) -> PipelineResult:
+        records = {name: self._record(name, i, record) for name, record in STAGE_RECORDS.items()}
+        offer = self._record("offer", i, OfferResult) if self.has_offer[i] else None
+        return PipelineResult(final_decision=Decision(self.final_decision[i]), offer=offer, **records)
+
+    def counts(self) -> Dict[str, int]:
+        import numpy as np
+
+        return dict(zip(Decision.LABELS, np.bincount(self.final_decision, minlength=len(Decision.LABELS)).tolist()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        import numpy as np
+
+        data = []
+        for name in BATCH_STAGES:
+            enums = STAGE_ENUMS[name]
+            data.append({key: enums[key].decode(values) if key in enums else values for key, values in self.columns[name].items()})
+        final_decision = Decision.decode(self.final_decision)
+        return {
+            "final_decision": final_decision,
+            "agent_data": data[:-1],
+            "offer": data[-1],
+            "has_offer": np.isin(final_decision, OFFER_DECISIONS),
+        }
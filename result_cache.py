@@ -0,0 +1,120 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional
+
+from orchestrator import ApplicationData, Orchestrator
+
+NON_DECISION_FIELDS = ("full_name", "purpose")
+DECISION_FIELDS = tuple(f.name for f in fields(ApplicationData) if f.name not in NON_DECISION_FIELDS)
+POLICY_AGENTS = (
+    "document_agent",
+    "credit_agent",
+    "risk_agent",
+    "affordability_agent",
+    "compliance_agent",
+    "offer_agent",
+)
+
+decision_key = attrgetter(*DECISION_FIELDS)
+
+def application_fingerprint(app: ApplicationData) -> str:
+    canonical = "\x1f".join(repr(getattr(app, name)) for name in DECISION_FIELDS)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+def agent_state(agent: Any) -> tuple:
+    return type(agent), tuple(item for item in vars(agent).items() if not item[0].startswith("_"))
+
+def policy_state(orchestrator: Orchestrator) -> tuple:
+    return tuple(agent_state(getattr(orchestrator, name)) for name in POLICY_AGENTS) + (
+        orchestrator.short_circuit,
+        orchestrator.explain_level,
+    )
+
+def policy_fingerprint(orchestrator: Orchestrator) -> str:
+    parts = []
+    for agent_type, params in policy_state(orchestrator)[:-2]:
+        parts.append(f"{agent_type.__module__}.{agent_type.__qualname__}:{sorted(params)!r}")
+    parts.append(f"short_circuit={orchestrator.short_circuit!r}")
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+class CachedOrchestrator:
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.orchestrator = orchestrator
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._policy = policy_state(orchestrator)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.orchestrator, name)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def _check_policy(self) -> None:
+        policy = policy_state(self.orchestrator)
+        if policy != self._policy:
+            self._policy = policy
+            self.clear()
+
+    def run_full_pipeline(self, app_data: ApplicationData) -> Dict[str, Any]:
+        return self._cached(decision_key(app_data), self.orchestrator.run_full_pipeline, app_data)
+
+    def run_result(self, app_data: ApplicationData) -> Any:
+        return self._cached(("result", decision_key(app_data)), self.orchestrator.run_result, app_data)
+
+    def _cached(self, key: tuple, run: Callable[[ApplicationData], Any], app_data: ApplicationData) -> Any:
+        self._check_policy()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        result = run(app_data)
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,433 @@
+import argparse
+import csv
+import gzip
+import io
+import json
+import sys
+import time
+from contextlib import ExitStack
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import to_application
+from orchestrator import ApplicationData, Orchestrator, default_orchestrator
+
+ID_KEY = "application_id"
+
+OFFER_FIELDS = (
+    "suggested_interest_rate_percent",
+    "recommended_loan_amount",
+    "recommended_emi",
+    "max_eligible_loan_amount",
+    "max_affordable_emi",
+    "decision_from_compliance",
+)
+CSV_FIELDS = [
+    ID_KEY,
+    "final_decision",
+    "credit_score",
+    "credit_band",
+    "risk_score",
+    "risk_level",
+    "risk_flags",
+    "affordability_flag",
+    "requested_emi",
+    "compliance_reasons",
+] + ["offer_" + name for name in OFFER_FIELDS + ("adjustment_note",)]
+
+def _data_format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.endswith(".csv") else "jsonl"
+
+def open_input(path: str):
+    raw = sys.stdin.buffer if path == "-" else open(path, "rb")
+    if raw.peek(2)[:2] == b"\x1f\x8b":
+        raw = gzip.GzipFile(fileobj=raw, mode="rb")
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+def open_output(path: str):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="", write_through=False)
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+def read_records(stream, data_format: str = "jsonl") -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    if data_format == "csv":
+        records: Iterable[Dict[str, Any]] = csv.DictReader(stream)
+    else:
+        records = (json.loads(line) for line in stream if line.strip())
+    for row, record in enumerate(records):
+        yield record.get(ID_KEY, row), record
+
+def read_applications(stream, data_format: str = "jsonl") -> Iterator[Tuple[Any, ApplicationData]]:
+    for key, record in read_records(stream, data_format):
+        yield key, to_application(record)
+
+def iter_batch_records(
+    keys: List[Any],
+    result: Dict[str, Any],
+    compliance: Optional[Any] = None
+) -> Iterator[Dict[str, Any]]:
+    from agents.compliance import decode_compliance_reasons
+    from agents.offer_generation import ADJUSTED_NOTE, WITHIN_LIMITS_NOTE
+    from agents.risk_assessment import decode_risk_flags
+
+    _, credit, risk, afford, comp = result["agent_data"]
+    offer = result["offer"]
+    columns = {
+        "final_decision": result["final_decision"].tolist(),
+        "credit_score": credit["credit_score"].tolist(),
+        "credit_band": credit["credit_band"].tolist(),
+        "risk_score": risk["risk_score"].tolist(),
+        "risk_level": risk["risk_level"].tolist(),
+        "affordability_flag": afford["affordability_flag"].tolist(),
+        "requested_emi": afford["requested_emi"].tolist(),
+    }
+    flag_masks = risk["risk_flag_mask"].tolist()
+    reason_masks = comp["compliance_reasons_mask"].tolist()
+    if comp["compliance_reasons_mask"].ndim == 2:
+        reason_masks = [tuple(words) for words in reason_masks]
+    has_offer = result["has_offer"].tolist()
+    offer_columns = {name: offer[name].tolist() for name in OFFER_FIELDS}
+    within_limits = offer["within_affordability_limits"].tolist()
+    decode_reasons = compliance.decode if compliance is not None else decode_compliance_reasons
+    risk_flags: Dict[int, List[str]] = {}
+    reasons: Dict[int, List[str]] = {}
+
+    for i, key in enumerate(keys):
+        flag_mask = flag_masks[i]
+        if flag_mask not in risk_flags:
+            risk_flags[flag_mask] = decode_risk_flags(flag_mask)
+        reason_mask = reason_masks[i]
+        if reason_mask not in reasons:
+            reasons[reason_mask] = decode_reasons(reason_mask)
+
+        record = {ID_KEY: key}
+        for name, values in columns.items():
+            record[name] = values[i]
+        record["risk_flags"] = risk_flags[flag_mask]
+        record["compliance_reasons"] = reasons[reason_mask]
+
+        offer_record = None
+        if has_offer[i]:
+            offer_record = {name: values[i] for name, values in offer_columns.items()}
+            offer_record["adjustment_note"] = WITHIN_LIMITS_NOTE if within_limits[i] else ADJUSTED_NOTE
+        record["offer"] = offer_record
+        yield record
+
+def outputs_record(key: Any, outputs: Dict[str, Any], compliance: Optional[Any] = None) -> Dict[str, Any]:
+    from agents.compliance import decode_compliance_reasons
+    from agents.risk_assessment import decode_risk_flags
+
+    data = {name: result.data for name, result in outputs.items() if name != "offer" and result is not None}
+    credit, risk, afford, comp = (data.get(name, {}) for name in ("credit", "risk", "affordability", "compliance"))
+    decode_reasons = compliance.decode if compliance is not None else decode_compliance_reasons
+    offer = outputs.get("offer")
+    return {
+        ID_KEY: key,
+        "final_decision": comp.get("final_decision", "review"),
+        "credit_score": credit.get("credit_score"),
+        "credit_band": credit.get("credit_band"),
+        "risk_score": risk.get("risk_score"),
+        "risk_level": risk.get("risk_level"),
+        "affordability_flag": afford.get("affordability_flag"),
+        "requested_emi": afford.get("requested_emi"),
+        "risk_flags": decode_risk_flags(risk["risk_flag_mask"]) if risk else [],
+        "compliance_reasons": decode_reasons(comp.get("compliance_reasons_mask", 0)),
+        "offer": {name: offer[name] for name in OFFER_FIELDS + ("adjustment_note",)} if offer is not None else None,
+    }
+
+def _flatten(record: Dict[str, Any]) -> Dict[str, Any]:
+    row = {name: value for name, value in record.items() if name != "offer"}
+    row["risk_flags"] = "; ".join(record["risk_flags"])
+    row["compliance_reasons"] = " ".join(record["compliance_reasons"])
+    for name, value in (record["offer"] or {}).items():
+        row["offer_" + name] = value
+    return row
+
+def score_stream(
+    applications: Iterable[Tuple[Any, ApplicationData]],
+    orchestrator: Optional[Orchestrator] = None,
+    chunk_size: int = 10000,
+    store: Optional[Any] = None,
+    rejects: Optional[Any] = None
+) -> Iterator[Dict[str, Any]]:
+    import numpy as np
+
+    from application_batch import ApplicationBatch, ColumnRangeError
+    from pipeline_result import PipelineResultBatch
+
+    orchestrator = orchestrator or default_orchestrator()
+    applications = iter(applications)
+    while True:
+        chunk = list(islice(applications, chunk_size))
+        if not chunk:
+            return
+        keys = [key for key, _ in chunk]
+        apps = [app for _, app in chunk]
+        if rejects is not None:
+            from validation import validate_applications
+
+            valid, issues = validate_applications(apps)
+            if issues:
+                rejects.reject_batch(keys, apps, issues)
+                passed = valid.tolist()
+                keys = [key for key, ok in zip(keys, passed) if ok]
+                apps = [app for app, ok in zip(apps, passed) if ok]
+                if not keys:
+                    continue
+        try:
+            batch = ApplicationBatch.from_applications(apps)
+        except ColumnRangeError:
+            batch = ApplicationBatch.from_applications(apps, int_dtype=np.int64)
+        result = orchestrator.run_batch(batch)
+        if store is not None:
+            store.append_batch(PipelineResultBatch.from_batch(result), keys)
+        yield from iter_batch_records(keys, result, orchestrator.compliance_agent)
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = 10000,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    progress_every: int = 0,
+    workers: int = 1,
+    metrics_file: Optional[str] = None,
+    store_path: Optional[str] = None,
+    reject_path: Optional[str] = None,
+    log=sys.stderr
+) -> int:
+    if metrics_file and workers > 1:
+        raise ValueError("Metrics are collected in-process; use --workers 1 with --metrics-file.")
+    if store_path and workers > 1:
+        raise ValueError("Decisions are stored in-process; use --workers 1 with --store.")
+    if reject_path and workers > 1:
+        raise ValueError("Rows are validated in-process; use --workers 1 with --reject-file.")
+    output_format = _data_format(output_path, output_format)
+    orchestrator = None
+    if metrics_file or store_path:
+        orchestrator = default_orchestrator()
+    if metrics_file:
+        from metrics import PipelineMetrics
+
+        orchestrator.set_metrics(PipelineMetrics())
+    started = time.perf_counter()
+    count = 0
+
+    with ExitStack() as stack:
+        store = None
+        if store_path:
+            from decision_store import DecisionStore
+            from result_cache import policy_fingerprint
+
+            store = stack.enter_context(DecisionStore(store_path, policy=policy_fingerprint(orchestrator)))
+        source = stack.enter_context(open_input(input_path))
+        sink = stack.enter_context(open_output(output_path))
+        rejects = None
+        if reject_path:
+            from validation import RejectWriter, coerce_records
+
+            rejects = RejectWriter(stack.enter_context(open_output(reject_path)))
+            applications = coerce_records(read_records(source, _data_format(input_path, input_format)), rejects)
+        else:
+            applications = read_applications(source, _data_format(input_path, input_format))
+        if workers > 1:
+            from parallel_scoring import ParallelScorer
+
+            scorer = stack.enter_context(ParallelScorer(workers=workers, chunk_size=chunk_size))
+            records = scorer.score(applications)
+        else:
+            records = score_stream(applications, orchestrator, chunk_size=chunk_size, store=store, rejects=rejects)
+
+        writer = None
+        if output_format == "csv":
+            writer = csv.DictWriter(sink, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+
+        for record in records:
+            if writer is not None:
+                writer.writerow(_flatten(record))
+            else:
+                sink.write(json.dumps(record, ensure_ascii=False))
+                sink.write("\n")
+            count += 1
+            if progress_every and count % progress_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"{count:,} rows scored, {count / elapsed:,.0f} rows/sec", file=log)
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Scored {count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec).", file=log)
+    if rejects is not None:
+        print(f"Rejected {rejects.count:,} invalid rows to {reject_path}.", file=log)
+    if metrics_file:
+        orchestrator.metrics.write(metrics_file)
+    return count
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m orchestrator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser("score", help="Score a JSONL/CSV file of applications (gzip supported).")
+    score.add_argument("input", help="Input file, or - for stdin.")
+    score.add_argument("output", help="Output file, or - for stdout. A .gz suffix compresses the output.")
+    score.add_argument("--chunk-size", type=int, default=10000)
+    score.add_argument("--input-format", choices=["jsonl", "csv"])
+    score.add_argument("--output-format", choices=["jsonl", "csv"])
+    score.add_argument("--progress-every", type=int, default=100000, help="Report throughput every N rows (0 disables).")
+    score.add_argument("--workers", type=int, default=1, help="Score chunks in N worker processes.")
+    score.add_argument("--metrics-file", help="Write agent timings and decision counts here in Prometheus text format.")
+    score.add_argument("--store", help="Append every decision to the decision store in this directory.")
+    score.add_argument("--reject-file", help="Validate rows first and write invalid ones with their errors here.")
+
+    store = commands.add_parser("store", help="Summarise, query or compact a decision store.")
+    store.add_argument("path", help="Decision store directory.")
+    store.add_argument("--key", action="append", default=[], help="Print the latest decision for this application key.")
+    store.add_argument("--compact", action="store_true", help="Keep only the latest decision per key.")
+
+    cutoffs = commands.add_parser("cutoffs", help="Decision counts under moved policy cutoffs for a population file.")
+    cutoffs.add_argument("input", help="Input file of applications; it is streamed once to build the index.")
+    cutoffs.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="Report decisions with this cutoff moved.")
+    cutoffs.add_argument("--chunk-size", type=int, default=100000)
+    cutoffs.add_argument("--input-format", choices=["jsonl", "csv"])
+
+    scale = commands.add_parser("scale", help="Measure parallel scoring throughput from 1 to N workers.")
+    scale.add_argument("input", help="Input file of applications; it is loaded into memory.")
+    scale.add_argument("--workers", default=None, help="Comma-separated worker counts (default 1..cpu_count).")
+    scale.add_argument("--chunk-size", type=int, default=10000)
+    scale.add_argument("--input-format", choices=["jsonl", "csv"])
+
+    serve = commands.add_parser("serve", help="Run the HTTP scoring service with request micro-batching.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--max-batch-size", type=int, default=64)
+    serve.add_argument(
+        "--min-batch-size",
+        type=int,
+        default=16,
+        help="Smaller batches are scored row by row on the scalar path.",
+    )
+    serve.add_argument("--max-wait-ms", type=float, default=2.0, help="Longest a request waits for its batch to fill.")
+    serve.add_argument("--max-queue", type=int, default=1024, help="Queued requests beyond this get HTTP 429.")
+    serve.add_argument("--stats-every", type=float, default=0.0, help="Log latency and throughput every N seconds.")
+    serve.add_argument("--metrics", action="store_true", help="Instrument the pipeline and expose GET /metrics.")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "score":
+        if args.metrics_file and args.workers > 1:
+            parser.error("--metrics-file collects metrics in-process; use it with --workers 1.")
+        if args.store and args.workers > 1:
+            parser.error("--store writes decisions in-process; use it with --workers 1.")
+        if args.reject_file and args.workers > 1:
+            parser.error("--reject-file validates rows in-process; use it with --workers 1.")
+        score_file(
+            args.input,
+            args.output,
+            chunk_size=args.chunk_size,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            progress_every=args.progress_every,
+            workers=args.workers,
+            metrics_file=args.metrics_file,
+            store_path=args.store,
+            reject_path=args.reject_file,
+        )
+    elif args.command == "store":
+        from decision_store import DecisionStore
+
+        store = DecisionStore(args.path)
+        if args.compact:
+            print(f"Compacted away {store.compact():,} superseded decisions.", file=sys.stderr)
+        summary: Dict[str, Any] = {
+            "rows": len(store),
+            "keys": len(store.index),
+            "segments": len(store.segments),
+            "decisions": store.decision_counts(),
+        }
+        if args.key:
+            orchestrator = default_orchestrator()
+            latest = {}
+            for key in args.key:
+                result = store.latest(key)
+                latest[key] = orchestrator.explain(result) if result is not None else None
+            summary["latest"] = latest
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    elif args.command == "cutoffs":
+        from application_batch import ApplicationBatch
+        from cutoff_analysis import CutoffAnalysis
+
+        moves = []
+        for setting in args.set:
+            name, _, value = setting.partition("=")
+            try:
+                moves.append((name, float(value)))
+            except ValueError:
+                parser.error(f"--set expects NAME=VALUE, got {setting!r}.")
+        with open_input(args.input) as source:
+            applications = read_applications(source, _data_format(args.input, args.input_format))
+            chunks = iter(lambda: [app for _, app in islice(applications, args.chunk_size)], [])
+            analysis = CutoffAnalysis.build(ApplicationBatch.from_applications(chunk) for chunk in chunks)
+        for name, _ in moves:
+            if name not in analysis.curves:
+                parser.error(f"Unknown cutoff {name!r}; choose from {', '.join(analysis.names)}.")
+        report: Dict[str, Any] = {
+            "rows": sum(analysis.baseline.values()),
+            "baseline": analysis.baseline,
+            "cutoffs": {name: curve.current for name, curve in analysis.curves.items()},
+        }
+        if moves:
+            report["what_if"] = [
+                {
+                    "cutoff": name,
+                    "value": value,
+                    "decisions": analysis.decision_counts(name, value),
+                    "approval_rate": float(analysis.curves[name].approval_rates([value])[0]),
+                }
+                for name, value in moves
+            ]
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    elif args.command == "scale":
+        import os
+
+        from parallel_scoring import scaling_curve
+
+        with open_input(args.input) as source:
+            apps = [app for _, app in read_applications(source, _data_format(args.input, args.input_format))]
+        if args.workers:
+            counts = [int(count) for count in args.workers.split(",")]
+        else:
+            counts = list(range(1, (os.cpu_count() or 1) + 1))
+        print(f"{'workers':>8} {'rows/sec':>12} {'speedup':>8}")
+        for point in scaling_curve(apps, counts, chunk_size=args.chunk_size):
+            print(f"{point['workers']:>8} {point['rows_per_sec']:>12,.0f} {point['speedup']:>7.2f}x")
+    elif args.command == "serve":
+        import asyncio
+
+        from scoring_server import serve
+
+        orchestrator = default_orchestrator()
+        if args.metrics:
+            from metrics import PipelineMetrics
+
+            orchestrator.set_metrics(PipelineMetrics())
+        try:
+            asyncio.run(serve(
+                orchestrator,
+                host=args.host,
+                port=args.port,
+                max_batch_size=args.max_batch_size,
+                min_batch_size=args.min_batch_size,
+                max_wait_ms=args.max_wait_ms,
+                max_queue=args.max_queue,
+                stats_every=args.stats_every,
+            ))
+        except KeyboardInterrupt:
+            pass
+    return 0
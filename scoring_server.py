@@ -0,0 +1,343 @@
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.explanation import ExplanationAgent
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from orchestrator import ApplicationData, Orchestrator, default_orchestrator
+from validation import validate_application
+
+PERCENTILES = (50, 90, 99, 99.9)
+MAX_BODY_BYTES = 1 << 20
+
+class QueueFull(Exception):
+    pass
+
+class ServerStats:
+    def __init__(self, window: int = 10000):
+        self.latencies: deque = deque(maxlen=window)
+        self.batch_sizes: deque = deque(maxlen=window)
+        self.started = time.monotonic()
+        self.requests = 0
+        self.scored = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def record_batch(self, size: int) -> None:
+        self.batch_sizes.append(size)
+        self.scored += size
+
+    def snapshot(self, queue_depth: int = 0) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+        percentiles = {}
+        for p in PERCENTILES:
+            value = latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] if latencies else 0.0
+            percentiles[f"p{p:g}_ms"] = round(value * 1000, 3)
+        batches = len(self.batch_sizes)
+        return {
+            "uptime_seconds": round(elapsed, 3),
+            "requests": self.requests,
+            "scored": self.scored,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "queue_depth": queue_depth,
+            "throughput_rows_per_sec": round(self.scored / elapsed, 1) if elapsed > 0 else 0.0,
+            "mean_batch_size": round(sum(self.batch_sizes) / batches, 2) if batches else 0.0,
+            "latency": percentiles,
+        }
+
+class MicroBatcher:
+    def __init__(
+        self,
+        orchestrator: Orchestrator,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 1024,
+        stats: Optional[ServerStats] = None,
+        min_batch_size: int = 16
+    ):
+        self.orchestrator = orchestrator
+        self.max_batch_size = max_batch_size
+        self.min_batch_size = min_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue = max_queue
+        self.stats = stats or ServerStats()
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self.queue = asyncio.Queue(self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(cancel_futures=True)
+
+    def submit(self, key: Any, app: ApplicationData) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((key, app, future))
+        except asyncio.QueueFull:
+            raise QueueFull() from None
+        return future
+
+    async def _collect(self) -> List[Tuple[Any, ApplicationData, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _score_rows(self, keys: List[Any], apps: List[ApplicationData]) -> List[Dict[str, Any]]:
+        from application_batch import ApplicationBatch
+        from scoring_cli import iter_batch_records, outputs_record
+
+        orchestrator = self.orchestrator
+        if len(apps) < self.min_batch_size:
+            return [
+                orchestrator._run(app, lambda outputs, _, key=key: outputs_record(key, outputs, orchestrator.compliance_agent))
+                for key, app in zip(keys, apps)
+            ]
+        result = orchestrator.run_batch(ApplicationBatch.from_applications(apps))
+        return list(iter_batch_records(keys, result, orchestrator.compliance_agent))
+
+    def _score(self, keys: List[Any], apps: List[ApplicationData]) -> List[Any]:
+        try:
+            return self._score_rows(keys, apps)
+        except Exception:
+            if len(apps) == 1:
+                raise
+        records: List[Any] = []
+        for key, app in zip(keys, apps):
+            try:
+                records.extend(self._score_rows([key], [app]))
+            except Exception as exc:
+                records.append(exc)
+        return records
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            live = [item for item in batch if not item[2].done()]
+            if not live:
+                continue
+            try:
+                records = await loop.run_in_executor(
+                    self.executor, self._score, [key for key, _, _ in live], [app for _, app, _ in live]
+                )
+            except Exception as exc:
+                self.stats.errors += len(live)
+                for _, _, future in live:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            failed = sum(isinstance(record, Exception) for record in records)
+            self.stats.errors += failed
+            self.stats.record_batch(len(live) - failed)
+            for (_, _, future), record in zip(live, records):
+                if future.done():
+                    continue
+                if isinstance(record, Exception):
+                    future.set_exception(record)
+                else:
+                    future.set_result(record)
+
+class ScoringServer:
+    def __init__(
+        self,
+        orchestrator: Optional[Orchestrator] = None,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_queue: int = 1024,
+        explainer: Optional[ExplanationAgent] = None,
+        min_batch_size: int = 16
+    ):
+        self.host = host
+        self.port = port
+        orchestrator = orchestrator or default_orchestrator()
+        self.stats = ServerStats()
+        self.explainer = explainer or ExplanationAgent(compliance=orchestrator.compliance_agent)
+        self.batcher = MicroBatcher(
+            orchestrator,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            max_queue=max_queue,
+            stats=self.stats,
+            min_batch_size=min_batch_size,
+        )
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        await self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await self.batcher.stop()
+
+    def stats_snapshot(self) -> Dict[str, Any]:
+        snapshot = self.stats.snapshot(self.batcher.queue.qsize() if self.batcher.queue else 0)
+        snapshot["explanations"] = self.explainer.stats()
+        shadow = self.batcher.orchestrator.shadow
+        if shadow is not None:
+            snapshot["shadow"] = shadow.stats()
+        return snapshot
+
+    async def _score(self, body: bytes) -> Tuple[int, Any]:
+        from scoring_cli import ID_KEY, to_application
+
+        started = time.monotonic()
+        self.stats.requests += 1
+        try:
+            record = json.loads(body)
+            if not isinstance(record, dict):
+                raise ValueError("Request body must be a JSON object.")
+            app = to_application(record)
+        except (TypeError, ValueError) as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+        issues = validate_application(app)
+        if issues:
+            return HTTPStatus.BAD_REQUEST, {"error": "Application failed validation.", "errors": issues}
+
+        try:
+            future = self.batcher.submit(record.get(ID_KEY), app)
+        except QueueFull:
+            self.stats.rejected += 1
+            return HTTPStatus.TOO_MANY_REQUESTS, {"error": "Scoring queue is full; retry later."}
+        try:
+            result = await future
+        except Exception as exc:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)}
+        self.stats.latencies.append(time.monotonic() - started)
+        return HTTPStatus.OK, result
+
+    async def _explain(self, body: bytes) -> Tuple[int, Any]:
+        from scoring_cli import ID_KEY
+
+        status, record = await self._score(body)
+        if status != HTTPStatus.OK:
+            return status, record
+        try:
+            explanation = await self.explainer.explain(record)
+        except Exception as exc:
+            return HTTPStatus.BAD_GATEWAY, {"error": f"Explanation backend failed: {exc}"}
+        return HTTPStatus.OK, {
+            ID_KEY: record[ID_KEY],
+            "final_decision": record["final_decision"],
+            "explanation": explanation,
+        }
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path in ("/score", "/explain"):
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST."}
+            return await (self._score(body) if path == "/score" else self._explain(body))
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, self.stats_snapshot()
+        if path == "/metrics" and method == "GET":
+            metrics = self.batcher.orchestrator.metrics
+            if metrics is None:
+                return HTTPStatus.NOT_FOUND, {"error": "Metrics are disabled; start the server with --metrics."}
+            return HTTPStatus.OK, metrics.render()
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}."}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split(None, 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body is too large."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._route(method, path.split("?", 1)[0], body)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection != "close" and (version.strip() == "HTTP/1.1" or connection == "keep-alive")
+
+                if isinstance(payload, str):
+                    data, content_type = payload.encode("utf-8"), METRICS_CONTENT_TYPE
+                else:
+                    data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+                head = [
+                    f"HTTP/1.1 {status.value} {status.phrase}",
+                    f"Content-Type: {content_type}",
+                    f"Content-Length: {len(data)}",
+                    "Connection: " + ("keep-alive" if keep_alive else "close"),
+                ]
+                if status == HTTPStatus.TOO_MANY_REQUESTS:
+                    head.append("Retry-After: 1")
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(
+    orchestrator: Optional[Orchestrator] = None,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    max_batch_size: int = 64,
+    max_wait_ms: float = 2.0,
+    max_queue: int = 1024,
+    stats_every: float = 0.0,
+    log=sys.stderr,
+    min_batch_size: int = 16
+) -> None:
+    server = ScoringServer(orchestrator, host, port, max_batch_size, max_wait_ms, max_queue, min_batch_size=min_batch_size)
+    await server.start()
+    print(f"Scoring service listening on http://{server.host}:{server.port}", file=log)
+    try:
+        if stats_every > 0:
+            while True:
+                await asyncio.sleep(stats_every)
+                print(json.dumps(server.stats_snapshot()), file=log)
+        else:
+            await server.server.serve_forever()
+    finally:
+        print(json.dumps(server.stats_snapshot()), file=log)
+        await server.close()
@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.compliance_rules import SEVERITIES
+from orchestrator import REPORTED_STAGES, ApplicationData, Orchestrator
+from pipeline_graph import result_data
+from result_cache import agent_state
+
+BATCH_STAGES = REPORTED_STAGES + ("offer",)
+DECISION_CODES = {decision: code for code, decision in enumerate(SEVERITIES)}
+
+Diff = Tuple[str, int, int, int]
+
+def shared_stages(champion: Orchestrator, challenger: Orchestrator) -> Tuple[str, ...]:
+    stages = champion.graph.stages
+    shared: List[str] = []
+    for stage in challenger.graph.order:
+        other = stages.get(stage.name)
+        if (
+            other is not None
+            and other.requires == stage.requires
+            and (other.agent is stage.agent or agent_state(other.agent) == agent_state(stage.agent))
+            and all(name in shared for name in stage.requires)
+        ):
+            shared.append(stage.name)
+    return tuple(shared)
+
+def _changed_rows(before: Dict[str, Any], after: Dict[str, Any]):
+    import numpy as np
+
+    changed = None
+    for name, values in before.items():
+        left, right = np.asarray(values), np.asarray(after[name])
+        differs = left != right
+        if left.dtype.kind == "f":
+            differs &= ~(np.isnan(left) & np.isnan(right))
+        if differs.ndim > 1:
+            differs = differs.reshape(len(differs), -1).any(axis=1)
+        changed = differs if changed is None else changed | differs
+    return changed
+
+class ShadowScorer:
+    def __init__(
+        self,
+        challenger: Orchestrator,
+        max_pending: int = 1024,
+        max_diffs: int = 10000,
+        max_hold: float = 0.05
+    ):
+        self.challenger = challenger
+        self.champion: Optional[Orchestrator] = None
+        self.max_pending = max_pending
+        self.max_hold = max_hold
+        self.queue: deque = deque()
+        self.diffs: deque = deque(maxlen=max_diffs)
+        self.transitions = [[0] * len(SEVERITIES) for _ in SEVERITIES]
+        self.shared: Tuple[str, ...] = ()
+        self.stage_names: Tuple[str, ...] = tuple(stage.name for stage in challenger.graph.order)
+        self.submitted = 0
+        self.processed = 0
+        self.compared = 0
+        self.changed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._held = 0.0
+        self._closed = False
+        self._policy: Optional[tuple] = None
+        self._ready = threading.Event()
+        self._done = threading.Condition()
+        self._worker = threading.Thread(target=self._drain, name="shadow", daemon=True)
+        self._worker.start()
+
+    def bind(self, champion: Orchestrator) -> None:
+        self.champion = champion
+        self._policy = None
+        self._shared()
+
+    def _shared(self) -> Tuple[str, ...]:
+        if self.champion is not None:
+            policy = tuple(
+                agent_state(stage.agent) for orchestrator in (self.champion, self.challenger) for stage in orchestrator.graph.order
+            )
+            if policy != self._policy:
+                self.shared = shared_stages(self.champion, self.challenger)
+                self._policy = policy
+        return self.shared
+
+    def hold(self, started: float) -> None:
+        self._held = started
+        self._ready.clear()
+
+    def submit(self, app_data: ApplicationData, outputs: Dict[str, Any]) -> None:
+        self._held = 0.0
+        if len(self.queue) < self.max_pending:
+            self.submitted += 1
+            self.queue.append((self._compare, app_data, outputs))
+            self._ready.set()
+        else:
+            self.dropped += 1
+
+    def submit_batch(self, cols: Any, result: Dict[str, Any]) -> None:
+        self._held = 0.0
+        if len(self.queue) < self.max_pending:
+            self.submitted += 1
+            self.queue.append((self._compare_batch, cols, result))
+            self._ready.set()
+        else:
+            self.dropped += len(result["final_decision"])
+
+    def _drain(self) -> None:
+        queue, ready, done = self.queue, self._ready, self._done
+        while True:
+            if not ready.wait(self.max_hold) and not self._held:
+                ready.set()
+            held = self._held
+            if held and time.perf_counter() - held < self.max_hold:
+                continue
+            try:
+                compare, application, outputs = queue.popleft()
+            except IndexError:
+                if self._closed:
+                    return
+                ready.clear()
+                if queue or self._closed:
+                    ready.set()
+                continue
+            try:
+                compare(application, outputs)
+            except Exception as exc:
+                self.errors += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+            finally:
+                with done:
+                    self.processed += 1
+                    done.notify_all()
+            time.sleep(0)
+
+    def _compare(self, app_data: ApplicationData, outputs: Dict[str, Any]) -> None:
+        shared = {name: outputs[name] for name in self._shared() if name in outputs}
+        challenged, _ = self.challenger._outputs(app_data, shared)
+        champion = DECISION_CODES[outputs["compliance"].data.get("final_decision", "review")]
+        challenger = DECISION_CODES[challenged["compliance"].data.get("final_decision", "review")]
+        mask = 0
+        for bit, name in enumerate(self.stage_names):
+            if name in shared or name not in outputs or name not in challenged:
+                continue
+            if result_data(outputs[name]) != result_data(challenged[name]):
+                mask |= 1 << bit
+        self.transitions[champion][challenger] += 1
+        self.compared += 1
+        if mask:
+            self._remember(app_data, champion, challenger, mask)
+
+    def _compare_batch(self, cols: Any, result: Dict[str, Any]) -> None:
+        import numpy as np
+        from application_batch import ApplicationBatch
+        from pipeline_result import Decision
+
+        if not isinstance(cols, ApplicationBatch):
+            cols = ApplicationBatch.from_columns(cols)
+        outputs = dict(zip(BATCH_STAGES, result["agent_data"] + [result["offer"]]))
+        shared = {name: outputs[name] for name in self._shared()}
+        challenged = self.challenger.run_batch(cols, shared)
+        challenged = dict(zip(BATCH_STAGES, challenged["agent_data"] + [challenged["offer"]]))
+        champion = Decision.encode(outputs["compliance"]["final_decision"]).astype(np.intp)
+        challenger = Decision.encode(challenged["compliance"]["final_decision"]).astype(np.intp)
+        masks = np.zeros(len(cols), dtype=np.int64)
+        for bit, name in enumerate(self.stage_names):
+            if name not in shared:
+                masks |= _changed_rows(outputs[name], challenged[name]).astype(np.int64) << bit
+        size = len(SEVERITIES)
+        counts = np.bincount(champion * size + challenger, minlength=size * size).reshape(size, size)
+        for row, values in zip(self.transitions, counts.tolist()):
+            row[:] = [total + count for total, count in zip(row, values)]
+        self.compared += len(cols)
+        for row in np.flatnonzero(masks).tolist():
+            self._remember(cols[row], int(champion[row]), int(challenger[row]), int(masks[row]))
+
+    def _remember(self, app_data: ApplicationData, champion: int, challenger: int, mask: int) -> None:
+        from result_cache import application_fingerprint
+
+        self.changed += 1
+        self.diffs.append((application_fingerprint(app_data), champion, challenger, mask))
+
+    def flush(self) -> None:
+        self._ready.set()
+        with self._done:
+            self._done.wait_for(lambda: self.processed >= self.submitted)
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+        self._worker.join()
+
+    def decode(self, diff: Diff) -> Dict[str, Any]:
+        key, champion, challenger, mask = diff
+        return {
+            "application": key,
+            "champion": SEVERITIES[champion],
+            "challenger": SEVERITIES[challenger],
+            "changed_stages": [name for bit, name in enumerate(self.stage_names) if mask >> bit & 1],
+        }
+
+    def diff_records(self) -> List[Dict[str, Any]]:
+        return [self.decode(diff) for diff in list(self.diffs)]
+
+    def stats(self) -> Dict[str, Any]:
+        transitions = [row[:] for row in self.transitions]
+        compared = self.compared
+        agreed = sum(transitions[code][code] for code in range(len(SEVERITIES)))
+        return {
+            "compared": compared,
+            "agreement_rate": agreed / compared if compared else 1.0,
+            "changed": self.changed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "pending": len(self.queue),
+            "shared_stages": list(self.shared),
+            "transitions": {
+                champion: {challenger: count for challenger, count in zip(SEVERITIES, row) if count}
+                for champion, row in zip(SEVERITIES, transitions)
+                if any(row)
+            },
+        }
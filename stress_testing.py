@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from application_batch import ApplicationBatch
+from agents.affordability import AffordabilityAgent
+from agents.compliance import ComplianceAgent
+from agents.credit_scoring import CreditScoringAgent
+from agents.document_verification import DocumentVerificationAgent
+from agents.offer_generation import OfferGenerationAgent
+from agents.risk_assessment import RiskAssessmentAgent
+from orchestrator import Orchestrator
+
+SCENARIO_DTYPE = np.dtype([
+    ("rate_shock", np.float64),
+    ("income_shock", np.float64),
+    ("income_noise", np.float64),
+    ("foir_shift", np.float64),
+    ("seed", np.int64),
+])
+DECISIONS = ("approve", "approve_with_caution", "review", "reject")
+AFFORDABILITY_FLAGS = ("Comfortable", "Stretched", "Not affordable")
+METRICS = (
+    tuple(f"{name}_rate" for name in DECISIONS)
+    + tuple(f"{name.lower().replace(' ', '_')}_rate" for name in AFFORDABILITY_FLAGS)
+    + ("mean_offer_rate_percent", "offered_loan_amount")
+)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+_worker_population: Optional[ApplicationBatch] = None
+
+def generate_scenarios(
+    count: int,
+    seed: int = 0,
+    rate_shock_sd: float = 0.01,
+    income_shock_sd: float = 0.05,
+    income_noise: float = 0.1,
+    foir_shift_sd: float = 0.02
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    scenarios = np.zeros(count, dtype=SCENARIO_DTYPE)
+    scenarios["rate_shock"] = rng.normal(0.0, rate_shock_sd, count)
+    scenarios["income_shock"] = rng.lognormal(0.0, income_shock_sd, count)
+    scenarios["income_noise"] = income_noise
+    scenarios["foir_shift"] = rng.normal(0.0, foir_shift_sd, count)
+    scenarios["seed"] = rng.integers(0, 2 ** 63 - 1, count)
+    return scenarios
+
+def scenario_orchestrator(scenario) -> Orchestrator:
+    rate_shock = float(scenario["rate_shock"])
+    foir_shift = float(scenario["foir_shift"])
+    return Orchestrator(
+        document_agent=DocumentVerificationAgent(),
+        credit_agent=CreditScoringAgent(),
+        risk_agent=RiskAssessmentAgent(),
+        affordability_agent=AffordabilityAgent(
+            assessment_rate=0.14 + rate_shock,
+            salaried_max_foir=0.5 + foir_shift,
+            self_employed_max_foir=0.45 + foir_shift,
+        ),
+        compliance_agent=ComplianceAgent(),
+        offer_agent=OfferGenerationAgent(base_rate=0.16 + rate_shock),
+    )
+
+def _shocked(batch: ApplicationBatch, scenario, rng: np.random.Generator) -> ApplicationBatch:
+    income = np.asarray(batch["monthly_income"], dtype=np.float64) * float(scenario["income_shock"])
+    noise = float(scenario["income_noise"])
+    if noise > 0:
+        income = income * rng.lognormal(0.0, noise, len(income))
+    columns = dict(batch.columns)
+    columns["monthly_income"] = income
+    return ApplicationBatch(columns, batch.flags, batch.text)
+
+def run_scenario(population: ApplicationBatch, scenario, chunk_size: int = 100000) -> np.ndarray:
+    orchestrator = scenario_orchestrator(scenario)
+    rng = np.random.default_rng(int(scenario["seed"]))
+    decisions = np.zeros(len(DECISIONS))
+    flags = np.zeros(len(AFFORDABILITY_FLAGS))
+    offered_rate_total = 0.0
+    offered_amount = 0.0
+    offers = 0
+
+    for start in range(0, len(population), chunk_size):
+        result = orchestrator.run_batch(_shocked(population[start:start + chunk_size], scenario, rng))
+        final_decision = result["final_decision"]
+        affordability_flag = result["agent_data"][3]["affordability_flag"]
+        for i, name in enumerate(DECISIONS):
+            decisions[i] += np.count_nonzero(final_decision == name)
+        for i, name in enumerate(AFFORDABILITY_FLAGS):
+            flags[i] += np.count_nonzero(affordability_flag == name)
+
+        approved = final_decision != "reject"
+        offer = result["offer"]
+        offers += np.count_nonzero(approved)
+        offered_rate_total += offer["suggested_interest_rate_percent"][approved].sum()
+        offered_amount += offer["recommended_loan_amount"][approved].sum()
+
+    total = max(len(population), 1)
+    return np.concatenate([
+        decisions / total,
+        flags / total,
+        [offered_rate_total / offers if offers else 0.0, offered_amount],
+    ])
+
+def _init_worker(population: ApplicationBatch) -> None:
+    global _worker_population
+    _worker_population = population
+
+def _run_worker_scenario(scenario, chunk_size: int) -> np.ndarray:
+    return run_scenario(_worker_population, scenario, chunk_size)
+
+def stress_test(
+    population: ApplicationBatch,
+    scenarios: np.ndarray,
+    workers: Optional[int] = None,
+    chunk_size: int = 100000
+) -> Dict[str, Any]:
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(population,)) as executor:
+            rows = list(executor.map(_run_worker_scenario, scenarios, [chunk_size] * len(scenarios)))
+    else:
+        rows = [run_scenario(population, scenario, chunk_size) for scenario in scenarios]
+
+    values = np.vstack(rows) if rows else np.zeros((0, len(METRICS)))
+    metrics = {name: values[:, i] for i, name in enumerate(METRICS)}
+    summary = {}
+    for name, column in metrics.items():
+        if not len(column):
+            continue
+        quantiles = np.percentile(column, PERCENTILES)
+        summary[name] = {"mean": float(column.mean()), "std": float(column.std())}
+        summary[name].update({f"p{p}": float(q) for p, q in zip(PERCENTILES, quantiles)})
+
+    return {
+        "scenarios": scenarios,
+        "metrics": metrics,
+        "summary": summary,
+    }
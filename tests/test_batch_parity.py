@@ -0,0 +1,143 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from application_batch import KNOWN_CATEGORIES, ApplicationBatch
+from orchestrator import ApplicationData, default_orchestrator
+from scoring_cli import iter_batch_records, outputs_record
+
+BASES = (
+    ApplicationData(
+        full_name="Asha",
+        age=34,
+        employment_type="Salaried",
+        monthly_income=90000.0,
+        existing_emi=8000.0,
+        loan_amount=900000.0,
+        loan_tenure_months=48,
+        credit_score=0,
+        kyc_uploaded=True,
+        bank_statement_uploaded=True,
+        residence_type="Owned",
+        city_tier="Tier 1",
+        years_in_current_job=4.0,
+    ),
+    ApplicationData(
+        full_name="Ravi",
+        age=58,
+        employment_type="Self-employed",
+        monthly_income=60000.0,
+        existing_emi=21000.0,
+        loan_amount=2400000.0,
+        loan_tenure_months=60,
+        credit_score=700,
+        kyc_uploaded=True,
+        bank_statement_uploaded=False,
+        residence_type="Rented",
+        city_tier="Tier 3/Other",
+        years_in_current_job=1.5,
+        has_previous_default=True,
+    ),
+)
+BOUNDARIES = {
+    "age": (17, 18, 20, 21, 22, 59, 60, 61, 64, 65, 66, 80),
+    "credit_score": (0, 300, 649, 650, 651, 679, 680, 729, 730, 779, 780, 900),
+    "existing_emi": (0.0, 18000.0, 17999.99, 18000.01, 36000.0, 54000.0, 90000.0),
+    "monthly_income": (0.0, 1.0, 45000.0, 90000.0),
+    "loan_amount": (0.0, 1.0, 3600000.0, 3600000.01, 10000000.0),
+    "loan_tenure_months": (0, 1, 6, 12, 120),
+    "years_in_current_job": (
+        0.0, 0.99999999, 1.0, 1.00000001, 2.99999999, 3.0, 3.00000001, 0.9999999999999999, 2.9999999999999996,
+    ),
+    "kyc_uploaded": (False, True),
+    "bank_statement_uploaded": (False, True),
+    "has_previous_default": (False, True),
+}
+
+def boundary_applications():
+    apps = []
+    for base in BASES:
+        apps.append(base)
+        for name, values in BOUNDARIES.items():
+            apps.extend(replace(base, **{name: value}) for value in values)
+        for name, known in KNOWN_CATEGORIES.items():
+            apps.extend(replace(base, **{name: value}) for value in known + ("Unknown",))
+    return apps
+
+def random_applications(count, seed):
+    rng = random.Random(seed)
+    apps = []
+    for _ in range(count):
+        income = rng.choice((0.0, rng.uniform(5000, 300000)))
+        apps.append(ApplicationData(
+            full_name="Applicant",
+            age=rng.randint(17, 80),
+            employment_type=rng.choice(KNOWN_CATEGORIES["employment_type"]),
+            monthly_income=income,
+            existing_emi=rng.choice((0.0, rng.uniform(0, 0.8) * income)),
+            loan_amount=round(rng.uniform(0, 6000000), rng.choice((-3, 2))),
+            loan_tenure_months=rng.choice((0, rng.randint(6, 120))),
+            credit_score=rng.choice((0, rng.randint(300, 900))),
+            kyc_uploaded=rng.random() < 0.9,
+            bank_statement_uploaded=rng.random() < 0.85,
+            residence_type=rng.choice(KNOWN_CATEGORIES["residence_type"]),
+            city_tier=rng.choice(KNOWN_CATEGORIES["city_tier"]),
+            years_in_current_job=rng.choice((
+                rng.uniform(0, 10),
+                rng.choice((1.0, 3.0)) + rng.choice((-1, 1)) * 10 ** -rng.randint(6, 15),
+            )),
+            has_previous_default=rng.random() < 0.1,
+        ))
+    return apps
+
+APPLICATIONS = boundary_applications() + random_applications(3000, seed=7)
+
+@pytest.fixture(scope="module")
+def orchestrator():
+    return default_orchestrator()
+
+def test_batch_records_match_scalar_results(orchestrator):
+    batch = orchestrator.run_batch_result(ApplicationBatch.from_applications(APPLICATIONS))
+    for app, result in zip(APPLICATIONS, batch):
+        assert orchestrator.run_result(app) == result, app
+
+def test_batch_responses_match_scalar_responses(orchestrator):
+    result = orchestrator.run_batch(APPLICATIONS)
+    for app, record in zip(APPLICATIONS, iter_batch_records(list(range(len(APPLICATIONS))), result)):
+        response = orchestrator.run_full_pipeline(app)
+        _, credit, risk, affordability, compliance = response["agent_data"]
+        assert record["final_decision"] == response["final_decision"], app
+        assert record["compliance_reasons"] == compliance["compliance_reasons"], app
+        assert record["risk_flags"] == risk["risk_flags"], app
+        assert (record["credit_score"], record["credit_band"]) == (credit["credit_score"], credit["credit_band"]), app
+        assert (record["risk_score"], record["risk_level"]) == (risk["risk_score"], risk["risk_level"]), app
+        assert record["affordability_flag"] == affordability["affordability_flag"], app
+        assert record["requested_emi"] == affordability["requested_emi"], app
+        assert record["offer"] == response["offer"], app
+
+def test_batch_decisions_match_short_circuit_scalar_path():
+    short_circuit = default_orchestrator()
+    short_circuit.short_circuit = True
+    decisions = short_circuit.run_batch(APPLICATIONS)["final_decision"].tolist()
+    assert decisions == [short_circuit.run_result(app).final_decision.label for app in APPLICATIONS]
+
+def test_short_circuit_reasons_are_truncated_to_knockout_rules(orchestrator):
+    short_circuit = default_orchestrator()
+    short_circuit.short_circuit = True
+    knockout_reasons = set(short_circuit.compliance_agent.decode(short_circuit.compliance_agent._tables.knockout_bits))
+    result = orchestrator.run_batch(APPLICATIONS)
+    for app, record in zip(APPLICATIONS, iter_batch_records(list(range(len(APPLICATIONS))), result)):
+        response = short_circuit.run_full_pipeline(app)
+        reasons = response["agent_data"][4]["compliance_reasons"]
+        if response["skipped_agents"]:
+            assert reasons and knockout_reasons.issuperset(reasons), app
+            assert reasons == [reason for reason in record["compliance_reasons"] if reason in reasons], app
+        else:
+            assert reasons == record["compliance_reasons"], app
+
+def test_scalar_records_match_batch_records(orchestrator):
+    keys = list(range(len(APPLICATIONS)))
+    records = iter_batch_records(keys, orchestrator.run_batch(APPLICATIONS), orchestrator.compliance_agent)
+    for key, app, record in zip(keys, APPLICATIONS, records):
+        assert outputs_record(key, orchestrator.run_stages(app), orchestrator.compliance_agent) == record, app
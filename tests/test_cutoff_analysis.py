@@ -0,0 +1,60 @@
+import random
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from agents.compliance_rules import SEVERITIES
+from application_batch import ApplicationBatch
+from cutoff_analysis import CutoffAnalysis
+from orchestrator import default_orchestrator
+from tests.test_batch_parity import random_applications
+
+APPLICATIONS = random_applications(3000, seed=11)
+
+@pytest.fixture(scope="module")
+def analysis():
+    return CutoffAnalysis.from_population(ApplicationBatch.from_applications(APPLICATIONS), chunk_size=1000)
+
+def _counts(orchestrator):
+    decisions = orchestrator.run_batch(APPLICATIONS)["final_decision"]
+    return {name: int((decisions == name).sum()) for name in SEVERITIES}
+
+def _brute_force(name, value):
+    orchestrator = default_orchestrator()
+    agent_name, field = name.split(".", 1)
+    if agent_name == "compliance":
+        agent = orchestrator.compliance_agent
+        rules = list(agent.rules)
+        index = next(i for i, rule in enumerate(rules) if rule.name == field)
+        rule = rules[index]
+        rules[index] = replace(rule, when=tuple(
+            (fact, op, value if fact == "credit_score" else bound) for fact, op, bound in rule.when
+        ))
+        agent.rules = tuple(rules)
+    elif agent_name in ("credit", "risk"):
+        agent = orchestrator.credit_agent if agent_name == "credit" else orchestrator.risk_agent
+        attribute, _, position = field.rpartition(".")
+        cutoffs = list(getattr(agent, attribute))
+        cutoffs[int(position)] = value
+        setattr(agent, attribute, tuple(cutoffs))
+    else:
+        setattr(orchestrator.affordability_agent, field, value)
+    return _counts(orchestrator)
+
+def test_fractional_cutoffs_match_brute_force(analysis):
+    rng = random.Random(5)
+    for name, curve in analysis.curves.items():
+        if name.startswith("affordability."):
+            values = [round(rng.uniform(0.3, 0.7), 3) for _ in range(4)]
+        else:
+            values = [curve.current + rng.uniform(-60, 60) for _ in range(4)]
+            values += [np.floor(value) + 0.5 for value in values[:2]] + [curve.current]
+        for value in values:
+            assert analysis.decision_counts(name, value) == _brute_force(name, value), (name, value)
+
+def test_foir_cutoffs_off_the_grid_are_rejected(analysis):
+    for value in (0.4234, 0.4555, 1.2):
+        with pytest.raises(ValueError):
+            analysis.decision_counts("affordability.salaried_max_foir", value)
+    assert analysis.sweep("affordability.salaried_max_foir", [0.45, 0.5]).shape == (2, len(SEVERITIES))
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+import decision_store
+from decision_store import COMPACT_DIR, DecisionStore
+from orchestrator import default_orchestrator
+from tests.test_batch_parity import random_applications
+
+@pytest.fixture(scope="module")
+def results():
+    orchestrator = default_orchestrator()
+    return [orchestrator.run_result(app) for app in random_applications(600, seed=3)]
+
+def _fill(path, results):
+    store = DecisionStore(str(path), segment_bytes=20000, flush_rows=50)
+    for i, result in enumerate(results):
+        store.append(result, f"app-{i % 400}")
+    store.flush()
+    return store
+
+def _latest(results):
+    return {f"app-{i % 400}": result for i, result in enumerate(results)}
+
+def _assert_latest(path, results):
+    store = DecisionStore(str(path))
+    assert not os.path.exists(os.path.join(path, COMPACT_DIR))
+    assert not os.path.exists(os.path.join(path, COMPACT_DIR + ".tmp"))
+    for key, result in _latest(results).items():
+        assert store.latest(key) == result
+    return store
+
+def test_compact_keeps_latest_decisions(tmp_path, results):
+    store = _fill(tmp_path, results)
+    assert store.compact() == 200
+    assert len(store) == 400
+    assert _assert_latest(tmp_path, results).segments == store.segments
+
+def test_crash_before_commit_rolls_back(tmp_path, results, monkeypatch):
+    store = _fill(tmp_path, results)
+    before = sorted(os.listdir(tmp_path))
+    monkeypatch.setattr(decision_store.os, "replace", lambda *args: (_ for _ in ()).throw(OSError("crash")))
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+    assert len(_assert_latest(tmp_path, results)) == 600
+    assert sorted(os.listdir(tmp_path)) == before
+
+@pytest.mark.parametrize("moved", [0, 1, 2])
+def test_crash_after_commit_rolls_forward(tmp_path, results, monkeypatch, moved):
+    store = _fill(tmp_path, results)
+    replace = os.replace
+    calls = []
+
+    def crash_after(source, target):
+        if len(calls) > moved:
+            raise OSError("crash")
+        calls.append(target)
+        replace(source, target)
+
+    monkeypatch.setattr(decision_store.os, "replace", crash_after)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+    assert len(_assert_latest(tmp_path, results)) == 400
@@ -0,0 +1,18 @@
+from dataclasses import replace
+
+import pytest
+
+from orchestrator import EXPLAIN_LEVELS, default_orchestrator
+from tests.test_batch_parity import BASES
+
+@pytest.mark.parametrize("app", [BASES[0], replace(BASES[1], age=85)])
+def test_skipped_agents_has_one_shape_for_every_level(app):
+    shapes = []
+    for level in EXPLAIN_LEVELS:
+        orchestrator = default_orchestrator(level)
+        orchestrator.short_circuit = True
+        response = orchestrator.run_full_pipeline(app)
+        shapes.append(response["skipped_agents"])
+        assert orchestrator.explain(orchestrator.run_result(app))["skipped_agents"] == response["skipped_agents"]
+    assert all(isinstance(skipped, list) for skipped in shapes)
+    assert shapes.count(shapes[0]) == len(shapes)
@@ -0,0 +1,38 @@
+import asyncio
+
+from agents.compliance import ComplianceAgent
+from agents.compliance_rules import COMPLIANCE_RULES, ComplianceRule
+from agents.explanation import ExplanationAgent
+from orchestrator import default_orchestrator
+from scoring_cli import iter_batch_records
+from tests.test_batch_parity import random_applications
+
+CUSTOM_RULES = (
+    ComplianceRule("large_loan", (("loan_amount", ">", 1500000),), "review", "Loan amount needs a manual review.", -1),
+) + COMPLIANCE_RULES
+
+def test_explanations_use_the_orchestrator_compliance_rules():
+    orchestrator = default_orchestrator()
+    orchestrator.compliance_agent.rules = CUSTOM_RULES
+    compliance = orchestrator.compliance_agent
+    explainer = ExplanationAgent(compliance=compliance)
+    apps = random_applications(300, seed=5)
+    results = orchestrator.run_batch_result(apps)
+    records = iter_batch_records(list(range(len(apps))), orchestrator.run_batch(apps), compliance)
+
+    seen = set()
+    for result, record in zip(results, records):
+        reasons = compliance.expand(result.compliance.to_data())["compliance_reasons"]
+        assert record["compliance_reasons"] == reasons
+        assert list(explainer.request(result).codes.compliance_reasons) == reasons
+        assert list(explainer.request(record).codes.compliance_reasons) == reasons
+        seen.update(reasons)
+    assert "Loan amount needs a manual review." in seen
+
+    text = asyncio.run(explainer.explain(results[0]))
+    assert all(reason in text for reason in compliance.expand(results[0].compliance.to_data())["compliance_reasons"])
+
+def test_explanation_agent_defaults_to_standard_rules():
+    record = next(iter_batch_records([0], default_orchestrator().run_batch(random_applications(1, seed=1))))
+    assert list(ExplanationAgent().request(record).codes.compliance_reasons) == record["compliance_reasons"]
+    assert ComplianceAgent().encode(record["compliance_reasons"]) >= 0
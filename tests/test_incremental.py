@@ -0,0 +1,49 @@
+from dataclasses import replace
+
+import numpy as np
+
+from incremental import IncrementalSession
+from orchestrator import default_orchestrator
+from tests.test_batch_parity import BASES
+
+def _columns(result):
+    return result["agent_data"] + [result["offer"]]
+
+def test_sweep_batch_matches_plain_batch():
+    orchestrator = default_orchestrator()
+    for base in BASES:
+        session = IncrementalSession(orchestrator)
+        session.run(base)
+        for field, values in (
+            ("loan_amount", [50000.0, 400000.0, 1500000.0, 4000000.0]),
+            ("loan_tenure_months", [6, 12, 36, 84]),
+            ("credit_score", [600, 650, 700, 790]),
+        ):
+            swept = session.sweep_batch(field, values)
+            plain = orchestrator.run_batch([replace(base, **{field: value}) for value in values])
+            for left, right in zip(_columns(swept), _columns(plain)):
+                for key in right:
+                    assert np.array_equal(left[key], right[key]), (field, key)
+
+def test_sweep_batch_reuses_clean_stages():
+    orchestrator = default_orchestrator()
+    session = IncrementalSession(orchestrator)
+    session.run(BASES[0])
+    calls = []
+    evaluate_batch = orchestrator.credit_agent.evaluate_batch
+    orchestrator.credit_agent.evaluate_batch = lambda cols: calls.append(len(cols)) or evaluate_batch(cols)
+    try:
+        session.sweep_batch("loan_amount", [100000.0, 200000.0])
+        assert calls == []
+        session.sweep_batch("credit_score", [640, 720])
+        assert calls == [2]
+    finally:
+        del orchestrator.credit_agent.evaluate_batch
+
+def test_session_applies_short_circuit():
+    orchestrator = default_orchestrator()
+    orchestrator.short_circuit = True
+    session = IncrementalSession(orchestrator)
+    response = session.run(BASES[1])
+    assert response == orchestrator.run_full_pipeline(BASES[1])
+    assert "skipped_agents" in response
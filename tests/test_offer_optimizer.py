@@ -0,0 +1,41 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from offer_optimizer import OBJECTIVES, OfferOptimizer
+from tests.test_batch_parity import BASES, random_applications
+
+def reference_optimize(optimizer, app, top):
+    candidates = optimizer.evaluate(app)
+    amount = candidates["loan_amount"]
+    emi = candidates["emi"]
+    tenure = candidates["tenure_months"]
+    ranked = {name: [] for name in OBJECTIVES}
+    if not len(amount):
+        return ranked
+
+    by_amount = np.lexsort((tenure, emi, -amount))
+    _, first = np.unique(amount[by_amount], return_index=True)
+    target = amount == amount.max()
+    orders = {
+        "largest_amount": by_amount[np.sort(first)],
+        "lowest_emi": np.flatnonzero(target)[np.lexsort((tenure[target], emi[target]))],
+        "shortest_tenure": np.flatnonzero(target)[np.lexsort((emi[target], tenure[target]))],
+    }
+    for name, order in orders.items():
+        ranked[name] = [{key: values[i].item() for key, values in candidates.items()} for i in order[:top]]
+    return ranked
+
+@pytest.mark.parametrize("top", [1, 5])
+def test_optimize_batch_matches_per_application_ranking(top):
+    apps = random_applications(150, seed=11) + [
+        replace(BASES[0], loan_amount=0.0),
+        replace(BASES[0], monthly_income=0.0),
+        replace(BASES[1], loan_amount=5000.0),
+        replace(BASES[1], loan_amount=10000.0),
+    ]
+    optimizer = OfferOptimizer()
+    ranked = optimizer.optimize_batch(apps, top=top, chunk_size=16)
+    assert ranked == [reference_optimize(optimizer, app, top) for app in apps]
+    assert any(result["lowest_emi"] for result in ranked)
@@ -0,0 +1,32 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from orchestrator import Orchestrator, default_orchestrator
+from pipeline_graph import SimulatedLatencyAgent
+from tests.test_batch_parity import BASES
+
+DELAY = 0.05
+AGENTS = ("document_agent", "credit_agent", "risk_agent", "affordability_agent", "compliance_agent", "offer_agent")
+
+def _delayed(executor=None):
+    plain = default_orchestrator()
+    return Orchestrator(
+        **{name: SimulatedLatencyAgent(getattr(plain, name), DELAY) for name in AGENTS},
+        executor=executor,
+    )
+
+def _timed(orchestrator, app):
+    started = time.perf_counter()
+    response = orchestrator.run_full_pipeline(app)
+    return response, time.perf_counter() - started
+
+def test_concurrent_schedule_matches_sequential_and_follows_critical_path():
+    app = BASES[0]
+    sequential, sequential_seconds = _timed(_delayed(), app)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        concurrent, concurrent_seconds = _timed(_delayed(executor), app)
+
+    assert sequential["offer"] is not None
+    assert concurrent == sequential == default_orchestrator().run_full_pipeline(app)
+    assert sequential_seconds >= len(AGENTS) * DELAY
+    assert concurrent_seconds < 5 * DELAY
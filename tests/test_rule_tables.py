@@ -0,0 +1,211 @@
+from dataclasses import replace
+from itertools import product
+
+import numpy as np
+import pytest
+
+from agents.compliance_rules import SEVERITIES, CompiledRules, ComplianceRule
+from agents.credit_scoring import CreditScoringAgent
+from agents.risk_assessment import RiskAssessmentAgent, decode_risk_flags
+from agents.rule_tables import CompiledAgent
+from application_batch import KNOWN_CATEGORIES, ApplicationBatch
+from models import ApplicationData
+
+BASE = ApplicationData(
+    full_name="Meera",
+    age=35,
+    employment_type="Salaried",
+    monthly_income=90000.0,
+    existing_emi=0.0,
+    loan_amount=500000.0,
+    loan_tenure_months=36,
+    credit_score=0,
+    purpose="Home renovation",
+    kyc_uploaded=True,
+    bank_statement_uploaded=True,
+    residence_type="Owned",
+    city_tier="Tier 1",
+    years_in_current_job=2.0,
+    has_previous_default=False,
+)
+
+def reference_credit(agent: CreditScoringAgent, app: ApplicationData):
+    if app.credit_score > 0:
+        score = app.credit_score
+    else:
+        dti = app.existing_emi / app.monthly_income if app.monthly_income > 0 else 1.0
+        score = agent.dti_scores[-1]
+        for cutoff, value in zip(agent.dti_cutoffs, agent.dti_scores):
+            if dti < cutoff:
+                score = value
+                break
+    score += dict(agent.employment_adjustments).get(app.employment_type, agent.other_employment_adjustment)
+    low, high = agent.tenure_cutoffs
+    if app.years_in_current_job >= high:
+        score += agent.tenure_adjustments[2]
+    elif app.years_in_current_job < low:
+        score += agent.tenure_adjustments[0]
+    else:
+        score += agent.tenure_adjustments[1]
+    if app.has_previous_default:
+        score -= agent.default_penalty
+    score = max(agent.min_score, min(agent.max_score, score))
+
+    excellent, good, fair = agent.band_cutoffs
+    if score >= excellent:
+        band, decision = "Excellent", "approve"
+    elif score >= good:
+        band, decision = "Good", "approve_with_caution"
+    elif score >= fair:
+        band, decision = "Fair", "review"
+    else:
+        band, decision = "Weak", "review"
+    return {"credit_score": score, "credit_decision": decision, "credit_band": band}
+
+def reference_risk(agent: RiskAssessmentAgent, app: ApplicationData, credit_decision: str):
+    weights = agent.weights
+    score = 0.0
+    flags = []
+    if app.loan_amount > app.monthly_income * agent.loan_to_income_limit:
+        score += weights[0]
+        flags.append("High loan-to-income ratio")
+    if app.age < 21:
+        score += weights[1]
+        flags.append("Age below 21")
+    elif app.age > 60:
+        score += weights[2]
+        flags.append("Age above 60")
+    if app.has_previous_default:
+        score += weights[3]
+        flags.append("History of previous default or settlement")
+    if app.city_tier == "Tier 3/Other":
+        score += weights[4]
+        flags.append("Higher geographic risk (Tier 3/Other)")
+    if credit_decision == "review":
+        score += weights[5]
+        flags.append("Borderline credit profile from credit scoring agent")
+    elif credit_decision == "approve_with_caution":
+        score += weights[6]
+        flags.append("Moderate credit risk")
+
+    low, medium = agent.level_cutoffs
+    level = "Low" if score <= low else "Medium" if score <= medium else "High"
+    return {"risk_score": score, "risk_level": level, "risk_flags": flags}
+
+def credit_applications(agent: CreditScoringAgent):
+    cutoffs = sorted({*agent.band_cutoffs, *agent.dti_scores})
+    scores = [0] + [score + delta for score in cutoffs for delta in (-11, -10, -1, 0, 1, 10)]
+    income = BASE.monthly_income
+    emis = [0.0] + [income * cutoff + delta for cutoff in agent.dti_cutoffs for delta in (-0.01, 0.0, 0.01)]
+    years = [0.0] + [cutoff + delta for cutoff in agent.tenure_cutoffs for delta in (-1e-9, 0.0, 1e-9)]
+    employment = KNOWN_CATEGORIES["employment_type"] + ("Unknown",)
+    apps = []
+    for score, emi, year, kind, default in product(scores, emis, years, employment, (False, True)):
+        if score and emi:
+            continue
+        apps.append(replace(
+            BASE,
+            credit_score=score,
+            existing_emi=emi,
+            years_in_current_job=year,
+            employment_type=kind,
+            has_previous_default=default,
+        ))
+    apps.append(replace(BASE, monthly_income=0.0))
+    return apps
+
+def risk_applications(agent: RiskAssessmentAgent):
+    limit = BASE.monthly_income * agent.loan_to_income_limit
+    apps = []
+    for loan, age, default, tier in product(
+        (limit - 1, limit, limit + 1),
+        (18, 20, 21, 22, 59, 60, 61, 80),
+        (False, True),
+        KNOWN_CATEGORIES["city_tier"],
+    ):
+        apps.append(replace(BASE, loan_amount=loan, age=age, has_previous_default=default, city_tier=tier))
+    return apps
+
+def assert_credit_matches(agent: CreditScoringAgent):
+    apps = credit_applications(agent)
+    batch = agent.evaluate_batch(ApplicationBatch.from_applications(apps))
+    for row, app in enumerate(apps):
+        expected = reference_credit(agent, app)
+        assert agent.evaluate(app).data == expected, app
+        assert {name: batch[name][row].item() for name in expected} == expected, app
+
+def assert_risk_matches(agent: RiskAssessmentAgent):
+    apps = risk_applications(agent)
+    cols = ApplicationBatch.from_applications(apps)
+    for decision in ("approve", "approve_with_caution", "review"):
+        batch = agent.assess_batch(cols, {"credit_decision": np.full(len(apps), decision)})
+        for row, app in enumerate(apps):
+            expected = reference_risk(agent, app, decision)
+            data = agent.assess(app, {"credit_decision": decision}).data
+            assert agent.expand(data) == expected, (app, decision)
+            assert batch["risk_score"][row] == expected["risk_score"]
+            assert batch["risk_level"][row] == expected["risk_level"]
+            assert decode_risk_flags(int(batch["risk_flag_mask"][row])) == expected["risk_flags"]
+
+def test_credit_tables_match_branching_rules():
+    assert_credit_matches(CreditScoringAgent())
+
+def test_risk_tables_match_branching_rules():
+    assert_risk_matches(RiskAssessmentAgent())
+
+@pytest.mark.parametrize("changes", [
+    {"band_cutoffs": (800, 700, 600)},
+    {"dti_cutoffs": (0.1, 0.3, 0.5), "dti_scores": (800, 720, 660, 600)},
+    {"employment_adjustments": (("Salaried", 25), ("Retired", 5)), "other_employment_adjustment": -30},
+    {"tenure_cutoffs": (2, 5), "tenure_adjustments": (-20, 5, 15)},
+    {"default_penalty": 90, "min_score": 500, "max_score": 850},
+])
+def test_credit_tables_recompile_on_rule_changes(changes):
+    agent = CreditScoringAgent()
+    tables = agent._tables
+    for name, value in changes.items():
+        setattr(agent, name, value)
+    assert agent._tables is not tables
+    assert_credit_matches(agent)
+
+@pytest.mark.parametrize("changes", [
+    {"level_cutoffs": (10, 30)},
+    {"weights": (5, 10, 15, 20, 25, 30, 35)},
+    {"loan_to_income_limit": 20},
+])
+def test_risk_tables_recompile_on_rule_changes(changes):
+    agent = RiskAssessmentAgent()
+    tables = agent._tables
+    for name, value in changes.items():
+        setattr(agent, name, value)
+    assert agent._tables is not tables
+    assert_risk_matches(agent)
+
+def test_compiled_agent_requires_build_tables():
+    class Incomplete(CompiledAgent):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_chained_suppressions_match_scalar_rules():
+    rng = np.random.default_rng(3)
+    rules = []
+    for i in range(150):
+        earlier = [rule.name for rule in rules]
+        unless = tuple(rng.choice(earlier, size=min(len(earlier), rng.integers(0, 4)), replace=False)) if earlier else ()
+        rules.append(ComplianceRule(
+            f"rule_{i}",
+            (("credit_score", rng.choice(["<", ">="]), int(rng.integers(300, 900))),),
+            SEVERITIES[rng.integers(len(SEVERITIES))],
+            f"Reason {i}.",
+            precedence=i,
+            unless=unless,
+        ))
+    compiled = CompiledRules(rules)
+    scores = rng.integers(250, 950, size=500)
+    fired, decisions = compiled.evaluate_batch({"credit_score": scores}, len(scores))
+    for row, score in enumerate(scores.tolist()):
+        expected = compiled.evaluate({"credit_score": score})
+        assert compiled.decode(fired[row]) == compiled.decode(expected), score
+        assert decisions[row] == compiled.decision(expected), score
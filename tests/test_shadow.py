@@ -0,0 +1,57 @@
+from dataclasses import fields
+
+from orchestrator import default_orchestrator
+from shadow import ShadowScorer
+from tests.test_batch_parity import random_applications
+
+def _scorer(champion):
+    challenger = default_orchestrator()
+    challenger.affordability_agent.salaried_max_foir -= 0.02
+    shadow = ShadowScorer(challenger)
+    champion.set_shadow(shadow)
+    return shadow
+
+def test_batch_compare_accepts_column_dicts():
+    champion = default_orchestrator()
+    shadow = _scorer(champion)
+    apps = random_applications(500, 3)
+    cols = {field.name: [getattr(app, field.name) for app in apps] for field in fields(apps[0])}
+    champion.run_batch(cols)
+    shadow.flush()
+    shadow.close()
+    stats = shadow.stats()
+    assert stats["errors"] == 0
+    assert stats["compared"] == len(apps)
+
+def test_shared_stages_follow_champion_params():
+    champion = default_orchestrator()
+    shadow = _scorer(champion)
+    apps = random_applications(200, 5)
+    assert "credit" in shadow.shared
+    champion.credit_agent.default_penalty = 80
+    for app in apps:
+        champion.run_full_pipeline(app)
+    shadow.flush()
+    shadow.close()
+    assert "credit" not in shadow.shared
+    changed = {stage for record in shadow.diff_records() for stage in record["changed_stages"]}
+    assert "credit" in changed
+
+def test_shared_stages_are_cached_until_a_policy_changes(monkeypatch):
+    import shadow as shadow_module
+
+    calls = []
+    analyse = shadow_module.shared_stages
+    monkeypatch.setattr(shadow_module, "shared_stages", lambda *args: calls.append(1) or analyse(*args))
+    champion = default_orchestrator()
+    shadow = _scorer(champion)
+    for app in random_applications(50, 9):
+        champion.run_full_pipeline(app)
+    shadow.flush()
+    assert len(calls) == 1
+    champion.risk_agent.level_cutoffs = (10, 30)
+    champion.run_full_pipeline(random_applications(1, 9)[0])
+    shadow.flush()
+    shadow.close()
+    assert len(calls) == 2
+    assert "risk" not in shadow.shared
@@ -9,6 +9,27 @@ from agents.customer_interaction import CustomerInteractionAgent
 from agents.data_collection import DataCollectionAgent
 from agents.affordability import AffordabilityAgent
 from agents.offer_generation import OfferGenerationAgent
+from decision_store import decision_store_from_env
+from metrics import metrics_from_env
+from result_cache import CachedOrchestrator, application_fingerprint, policy_fingerprint
+from validation import field_label, validate_application
+
+@st.cache_resource
+def get_orchestrator() -> CachedOrchestrator:
+    orchestrator = Orchestrator(
+        document_agent=DocumentVerificationAgent(),
+        credit_agent=CreditScoringAgent(),
+        risk_agent=RiskAssessmentAgent(),
+        affordability_agent=AffordabilityAgent(),
+        compliance_agent=ComplianceAgent(),
+        offer_agent=OfferGenerationAgent(),
+        metrics=metrics_from_env(),
+    )
+    return CachedOrchestrator(orchestrator, max_entries=1024, ttl_seconds=900)
+
+@st.cache_resource
+def get_decision_store():
+    return decision_store_from_env(policy_fingerprint(get_orchestrator().orchestrator))
 
 def inject_custom_css():
     st.markdown(
@@ -209,21 +230,7 @@ def main():
 
     customer_agent = CustomerInteractionAgent()
     data_agent = DataCollectionAgent()
-    document_agent = DocumentVerificationAgent()
-    credit_agent = CreditScoringAgent()
-    risk_agent = RiskAssessmentAgent()
-    affordability_agent = AffordabilityAgent()
-    compliance_agent = ComplianceAgent()
-    offer_agent = OfferGenerationAgent()
-
-    orchestrator = Orchestrator(
-        document_agent=document_agent,
-        credit_agent=credit_agent,
-        risk_agent=risk_agent,
-        affordability_agent=affordability_agent,
-        compliance_agent=compliance_agent,
-        offer_agent=offer_agent,
-    )
+    orchestrator = get_orchestrator()
 
     st.markdown(
         """
@@ -324,15 +331,27 @@ def main():
     st.markdown("</div>", unsafe_allow_html=True)
 
     if submitted:
-        required_issues = []
-        if not full_name.strip():
-            required_issues.append("Full Name is required.")
-        if monthly_income <= 0:
-            required_issues.append("Monthly income must be greater than zero.")
-        if loan_amount <= 0:
-            required_issues.append("Requested loan amount must be greater than zero.")
-        if loan_tenure_months <= 0:
-            required_issues.append("Loan tenure must be greater than zero months.")
+        app_data = ApplicationData(
+            full_name=full_name.strip(),
+            age=int(age),
+            employment_type=employment_type,
+            monthly_income=float(monthly_income),
+            existing_emi=float(existing_emi),
+            loan_amount=float(loan_amount),
+            loan_tenure_months=int(loan_tenure_months),
+            credit_score=int(credit_score),
+            purpose=purpose,
+            kyc_uploaded=kyc_uploaded,
+            bank_statement_uploaded=bank_uploaded,
+            residence_type=residence_type,
+            city_tier=city_tier,
+            years_in_current_job=float(years_in_current_job),
+            has_previous_default=bool(has_previous_default),
+        )
+        required_issues = [
+            f"{field_label(issue['field'])}: {issue['message']}"
+            for issue in validate_application(app_data, require_name=True)
+        ]
 
         if required_issues:
             st.markdown("")
@@ -357,24 +376,6 @@ def main():
         )
         st.write(data_agent.collect())
 
-        app_data = ApplicationData(
-            full_name=full_name.strip(),
-            age=int(age),
-            employment_type=employment_type,
-            monthly_income=float(monthly_income),
-            existing_emi=float(existing_emi),
-            loan_amount=float(loan_amount),
-            loan_tenure_months=int(loan_tenure_months),
-            credit_score=int(credit_score),
-            purpose=purpose,
-            kyc_uploaded=kyc_uploaded,
-            bank_statement_uploaded=bank_uploaded,
-            residence_type=residence_type,
-            city_tier=city_tier,
-            years_in_current_job=float(years_in_current_job),
-            has_previous_default=bool(has_previous_default),
-        )
-
         with st.expander("Structured Application Payload (for architects and reviewers)", expanded=False):
             st.json(
                 {
@@ -405,22 +406,25 @@ def main():
             unsafe_allow_html=True,
         )
 
-        result = orchestrator.run_full_pipeline(app_data)
-        decision = result["final_decision"]
+        pipeline_result = orchestrator.run_result(app_data)
+        store = get_decision_store()
+        if store is not None:
+            store.append(pipeline_result, application_fingerprint(app_data))
+            store.flush()
+        result = orchestrator.explain(pipeline_result)
+        decision = pipeline_result.final_decision.label
 
         offer = result.get("offer") or {}
-        agent_data = result.get("agent_data") or []
-
-        credit_data = agent_data[1] if len(agent_data) > 1 else {}
-        risk_data = agent_data[2] if len(agent_data) > 2 else {}
-        affordability_data = agent_data[3] if len(agent_data) > 3 else {}
-
-        credit_score_val = credit_data.get("credit_score", 0)
-        credit_band = credit_data.get("credit_band", "N/A")
-        risk_level = risk_data.get("risk_level", "Unknown")
-        risk_score = risk_data.get("risk_score", 0.0)
-        max_aff_emi = affordability_data.get("max_allowed_emi", 0.0)
-        max_loan = affordability_data.get("max_eligible_loan", 0.0)
+        credit = pipeline_result.credit
+        risk = pipeline_result.risk
+        affordability = pipeline_result.affordability
+
+        credit_score_val = credit.credit_score if credit else 0
+        credit_band = credit.credit_band.label if credit else "N/A"
+        risk_level = risk.risk_level.label if risk else "Unknown"
+        risk_score = risk.risk_score if risk else 0.0
+        max_aff_emi = affordability.max_allowed_emi if affordability else 0.0
+        max_loan = affordability.max_eligible_loan if affordability else 0.0
 
         c1, c2, c3 = st.columns([1.4, 1.4, 1.2])
 
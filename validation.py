@@ -0,0 +1,168 @@
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+import numpy as np
+from annotated_types import Ge, Gt, Le, Lt
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, ValidationInfo, field_validator
+from pydantic_core import PydanticCustomError
+
+from application_batch import FLAG_FIELDS, INT_FIELDS, KNOWN_CATEGORIES, MONEY_FIELDS, ApplicationBatch
+from models import TRUE_STRINGS, ApplicationData, to_application
+
+Issue = Dict[str, str]
+
+class ApplicationModel(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    full_name: str = Field("", validate_default=True)
+    age: int = Field(ge=18, le=80)
+    employment_type: Literal[KNOWN_CATEGORIES["employment_type"]]
+    monthly_income: float = Field(gt=0)
+    existing_emi: float = Field(0.0, ge=0)
+    loan_amount: float = Field(gt=0)
+    loan_tenure_months: int = Field(ge=6, le=120)
+    credit_score: int = Field(0, ge=0, le=900)
+    purpose: str = ""
+    kyc_uploaded: bool = False
+    bank_statement_uploaded: bool = False
+    residence_type: Literal[KNOWN_CATEGORIES["residence_type"]]
+    city_tier: Literal[KNOWN_CATEGORIES["city_tier"]]
+    years_in_current_job: float = Field(0.0, ge=0)
+    has_previous_default: bool = False
+
+    @field_validator(*FLAG_FIELDS, mode="before")
+    @classmethod
+    def _flag(cls, value: Any) -> bool:
+        if isinstance(value, str):
+            return value.strip().lower() in TRUE_STRINGS
+        return bool(value)
+
+    @field_validator("full_name")
+    @classmethod
+    def _name(cls, value: str, info: ValidationInfo) -> str:
+        if not value and (info.context or {}).get("require_name"):
+            raise PydanticCustomError("missing", "Field required")
+        return value
+
+RANGE_FIELDS = MONEY_FIELDS + INT_FIELDS + ("years_in_current_job",)
+BOUND_TESTS = (
+    (Gt, "gt", np.greater, "greater than"),
+    (Ge, "ge", np.greater_equal, "greater than or equal to"),
+    (Lt, "lt", np.less, "less than"),
+    (Le, "le", np.less_equal, "less than or equal to"),
+)
+
+def _range_checks(name: str) -> Tuple[Tuple[Any, Any, str], ...]:
+    checks = []
+    for constraint in ApplicationModel.model_fields[name].metadata:
+        for kind, attribute, passes, text in BOUND_TESTS:
+            if isinstance(constraint, kind):
+                bound = getattr(constraint, attribute)
+                checks.append((bound, passes, f"Input should be {text} {bound}"))
+    return tuple(checks)
+
+def _choices_message(choices: Tuple[str, ...]) -> str:
+    quoted = [repr(choice) for choice in choices]
+    if len(quoted) == 1:
+        return f"Input should be {quoted[0]}"
+    return f"Input should be {', '.join(quoted[:-1])} or {quoted[-1]}"
+
+RANGE_CHECKS = {name: _range_checks(name) for name in RANGE_FIELDS}
+CATEGORY_MESSAGES = {name: _choices_message(known) for name, known in KNOWN_CATEGORIES.items()}
+
+def field_label(name: str) -> str:
+    return name.replace("_", " ").capitalize()
+
+def _issues(error: ValidationError) -> List[Issue]:
+    return [
+        {"field": ".".join(str(part) for part in item["loc"]), "message": item["msg"]}
+        for item in error.errors(include_url=False)
+    ]
+
+def validate_record(record: Dict[str, Any], require_name: bool = False) -> Tuple[Optional[ApplicationData], List[Issue]]:
+    try:
+        model = ApplicationModel.model_validate(record, context={"require_name": require_name})
+    except ValidationError as error:
+        return None, _issues(error)
+    return ApplicationData(**model.model_dump()), []
+
+def validate_application(app: ApplicationData, require_name: bool = False) -> List[Issue]:
+    try:
+        ApplicationModel.model_validate(app, from_attributes=True, context={"require_name": require_name})
+    except ValidationError as error:
+        return _issues(error)
+    return []
+
+def _collect(checks: List[Tuple[str, str, np.ndarray]], count: int) -> Tuple[np.ndarray, Dict[int, List[Issue]]]:
+    valid = np.ones(count, dtype=bool)
+    for _, _, passed in checks:
+        valid &= passed
+    issues: Dict[int, List[Issue]] = {}
+    if not valid.all():
+        for name, message, passed in checks:
+            for row in np.flatnonzero(~passed).tolist():
+                issues.setdefault(row, []).append({"field": name, "message": message})
+    return valid, issues
+
+def validate_batch(batch: ApplicationBatch, require_name: bool = False) -> Tuple[np.ndarray, Dict[int, List[Issue]]]:
+    checks: List[Tuple[str, str, np.ndarray]] = []
+    if require_name:
+        if batch.text is None:
+            raise ValueError("Name checks need a batch built with include_text=True.")
+        named = np.array([bool(name.strip()) for name in batch.text["full_name"].tolist()], dtype=bool)
+        checks.append(("full_name", "Field required", named))
+    for name in ApplicationModel.model_fields:
+        if name in RANGE_CHECKS:
+            column = batch[name]
+            for bound, passes, message in RANGE_CHECKS[name]:
+                checks.append((name, message, passes(column, bound)))
+        elif name in KNOWN_CATEGORIES:
+            checks.append((name, CATEGORY_MESSAGES[name], batch[name].codes < len(KNOWN_CATEGORIES[name])))
+    return _collect(checks, len(batch))
+
+def validate_applications(
+    apps: List[ApplicationData],
+    require_name: bool = False
+) -> Tuple[np.ndarray, Dict[int, List[Issue]]]:
+    checks: List[Tuple[str, str, np.ndarray]] = []
+    if require_name:
+        named = np.array([bool(app.full_name.strip()) for app in apps], dtype=bool)
+        checks.append(("full_name", "Field required", named))
+    for name in ApplicationModel.model_fields:
+        if name in RANGE_CHECKS:
+            column = np.array([getattr(app, name) for app in apps], dtype=np.float64)
+            for bound, passes, message in RANGE_CHECKS[name]:
+                checks.append((name, message, passes(column, bound)))
+        elif name in KNOWN_CATEGORIES:
+            known = KNOWN_CATEGORIES[name]
+            passed = np.array([getattr(app, name) in known for app in apps], dtype=bool)
+            checks.append((name, CATEGORY_MESSAGES[name], passed))
+    return _collect(checks, len(apps))
+
+class RejectWriter:
+    def __init__(self, sink):
+        self.sink = sink
+        self.count = 0
+
+    def write(self, key: Any, issues: List[Issue], record: Dict[str, Any]) -> None:
+        self.sink.write(json.dumps({"application_id": key, "errors": issues, "record": record}, ensure_ascii=False))
+        self.sink.write("\n")
+        self.count += 1
+
+    def reject_batch(self, keys: List[Any], apps: List[ApplicationData], issues: Dict[int, List[Issue]]) -> None:
+        for row in sorted(issues):
+            self.write(keys[row], issues[row], asdict(apps[row]))
+
+def coerce_records(
+    records: Iterable[Tuple[Any, Dict[str, Any]]],
+    rejects: RejectWriter
+) -> Iterator[Tuple[Any, ApplicationData]]:
+    for key, record in records:
+        try:
+            app = to_application(record)
+        except (TypeError, ValueError) as error:
+            _, issues = validate_record(record)
+            rejects.write(key, issues or [{"field": "", "message": str(error)}], record)
+            continue
+        yield key, app